@@ -0,0 +1,113 @@
+# backtester/bars.py
+import numpy as np
+
+# Price fields are float64, volume is int64, timestamps are int64 nanoseconds since epoch
+PRICE_FIELDS = ("open", "high", "low", "close", "adj_close")
+BAR_FIELDS = PRICE_FIELDS + ("volume",)
+
+
+class BarStore:
+    """
+    Columnar storage for one symbol's bars.
+    Each field is a contiguous NumPy array; row i across all arrays is one bar.
+    """
+
+    __slots__ = ("timestamps", "index") + BAR_FIELDS
+
+    def __init__(self, timestamps, open, high, low, close, adj_close, volume):
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        # datetime64 view over the same memory, used for event timestamps
+        self.index = self.timestamps.view("datetime64[ns]")
+        self.open = np.ascontiguousarray(open, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.adj_close = np.ascontiguousarray(adj_close, dtype=np.float64)
+        self.volume = np.ascontiguousarray(volume, dtype=np.int64)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Builds a store from a DataFrame with a DatetimeIndex and Yahoo-style columns."""
+        close = df["Close"].to_numpy(dtype=np.float64)
+        adj_close = (
+            df["Adj Close"].to_numpy(dtype=np.float64) if "Adj Close" in df else close
+        )
+        return cls(
+            timestamps=df.index.values.astype("datetime64[ns]").view(np.int64),
+            open=df["Open"].to_numpy(dtype=np.float64),
+            high=df["High"].to_numpy(dtype=np.float64),
+            low=df["Low"].to_numpy(dtype=np.float64),
+            close=close,
+            adj_close=adj_close,
+            volume=df["Volume"].fillna(0).to_numpy(dtype=np.int64),
+        )
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def slice(self, start: int, stop: int):
+        """Returns a store over rows [start, stop) sharing memory with this one."""
+        return BarStore(
+            self.timestamps[start:stop],
+            *(getattr(self, f)[start:stop] for f in BAR_FIELDS),
+        )
+
+    def date_range(self, start_date=None, end_date=None):
+        """Returns a zero-copy slice restricted to start_date <= t <= end_date."""
+        start, stop = 0, len(self)
+        if start_date is not None:
+            start = np.searchsorted(self.index, np.datetime64(start_date, "ns"), "left")
+        if end_date is not None:
+            stop = np.searchsorted(self.index, np.datetime64(end_date, "ns"), "right")
+        return self.slice(start, stop)
+
+
+class BarView:
+    """
+    Lightweight read-only view of one row of a BarStore.
+    Supports the dict-style access (bar['close'], bar.get('open')) of the old per-bar dicts.
+    """
+
+    __slots__ = ("store", "i")
+
+    def __init__(self, store: BarStore, i: int):
+        self.store = store
+        self.i = i
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self.store, key)[self.i]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return BAR_FIELDS
+
+    @property
+    def timestamp(self):
+        return self.store.index[self.i]
+
+    def to_dict(self) -> dict:
+        return {f: self[f] for f in BAR_FIELDS}
+
+    def __repr__(self):
+        return f"BarView({self.timestamp}, {self.to_dict()})"
+
+
+def slice_stores(bar_stores: dict, start_ns=None, stop_ns=None) -> dict:
+    """Zero-copy views of every store restricted to start_ns <= t < stop_ns."""
+    sliced = {}
+    for symbol, store in bar_stores.items():
+        start, stop = 0, len(store)
+        if start_ns is not None:
+            start = int(np.searchsorted(store.timestamps, start_ns, "left"))
+        if stop_ns is not None:
+            stop = int(np.searchsorted(store.timestamps, stop_ns, "left"))
+        sliced[symbol] = store.slice(start, stop)
+    return sliced
@@ -0,0 +1,115 @@
+# backtester/cache.py
+"""
+On-disk binary cache for parsed market data.
+
+Each source file gets a directory of .npy files (one per BarStore column) plus a
+meta.json recording the source's size, mtime and SHA-1. Cached columns are opened
+with np.load(mmap_mode="r"), so loading is a page-table operation and parallel
+workers reading the same cache share pages through the OS page cache.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .bars import BAR_FIELDS, BarStore
+
+CACHE_VERSION = 1
+COLUMNS = ("timestamps",) + BAR_FIELDS
+
+
+def file_sha1(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_meta(path: str) -> dict:
+    st = os.stat(path)
+    return {"version": CACHE_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_meta(entry_dir: str):
+    try:
+        with open(os.path.join(entry_dir, "meta.json")) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _is_valid(entry_dir: str, source_path: str) -> bool:
+    """
+    A cache entry is valid if size and mtime match the source. If only the mtime
+    differs (file touched or copied), the SHA-1 decides and the entry is refreshed.
+    """
+    meta = _read_meta(entry_dir)
+    if meta is None:
+        return False
+    current = _source_meta(source_path)
+    if meta.get("version") != current["version"] or meta.get("size") != current["size"]:
+        return False
+    if meta.get("mtime_ns") == current["mtime_ns"]:
+        return True
+    if meta.get("sha1") != file_sha1(source_path):
+        return False
+    meta["mtime_ns"] = current["mtime_ns"]
+    _write_meta(entry_dir, meta)
+    return True
+
+
+def _write_meta(entry_dir: str, meta: dict):
+    tmp_path = os.path.join(entry_dir, f"meta.json.{os.getpid()}")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(entry_dir, "meta.json"))
+
+
+def _write_entry(entry_dir: str, source_path: str, store: BarStore):
+    """Writes the entry into a temp dir and renames it into place, so concurrent
+    readers never see a half-written cache."""
+    parent = os.path.dirname(entry_dir)
+    os.makedirs(parent, exist_ok=True)
+    meta = _source_meta(source_path)
+    meta["sha1"] = file_sha1(source_path)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        for column in COLUMNS:
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), getattr(store, column))
+        _write_meta(tmp_dir, meta)
+        if os.path.isdir(entry_dir):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            pass  # Another process published the same entry first
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _open_entry(entry_dir: str) -> BarStore:
+    columns = {
+        column: np.load(os.path.join(entry_dir, f"{column}.npy"), mmap_mode="r")
+        for column in COLUMNS
+    }
+    return BarStore(**columns)
+
+
+def load_bar_store(source_path: str, build, cache_dir: str) -> BarStore:
+    """
+    Returns a memory-mapped BarStore for source_path, calling build(source_path)
+    to parse the source and (re)populate the cache when the entry is missing or stale.
+    """
+    entry_dir = os.path.join(cache_dir, os.path.basename(source_path))
+    if _is_valid(entry_dir, source_path):
+        try:
+            return _open_entry(entry_dir)
+        except (OSError, ValueError):
+            pass  # A column file is missing or truncated: rebuild the entry
+    _write_entry(entry_dir, source_path, build(source_path))
+    return _open_entry(entry_dir)
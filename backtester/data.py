@@ -1,9 +1,38 @@
 # backtester/data.py
-import pandas as pd
+import heapq
+import io
+import os
+import numpy as np
 from collections import deque
+from .bars import BarStore, BarView
+from .cache import load_bar_store
 from .event import MarketEvent
 
 
+class CrossSection:
+    """
+    The latest bar of every symbol as arrays indexed by symbol id (symbol_list
+    order). Fields hold each symbol's most recent values (NaN / 0 before its first
+    bar); `updated` marks the symbols with a bar at `timestamp`.
+    """
+
+    FIELDS = ("open", "high", "low", "close", "volume")
+
+    def __init__(self, symbol_list: list):
+        self.symbols = list(symbol_list)
+        n = len(self.symbols)
+        self.timestamp = None
+        self.open = np.full(n, np.nan)
+        self.high = np.full(n, np.nan)
+        self.low = np.full(n, np.nan)
+        self.close = np.full(n, np.nan)
+        self.volume = np.zeros(n, dtype=np.int64)
+        self.updated = np.zeros(n, dtype=bool)
+
+    def __len__(self):
+        return len(self.symbols)
+
+
 class DataHandler:
     """Abstract base class for data handlers."""
 
@@ -25,61 +54,443 @@ class DataHandler:
         """
         raise NotImplementedError("Should implement update_bars()")
 
+    def get_state(self) -> dict:
+        """Replay position, for checkpoints (see backtester/checkpoint.py)."""
+        raise NotImplementedError(f"{type(self).__name__} does not support checkpoints")
+
+    def set_state(self, state: dict):
+        raise NotImplementedError(f"{type(self).__name__} does not support checkpoints")
+
+
+class ColumnarDataHandler(DataHandler):
+    """
+    Streams bars out of in-memory BarStores in strict timestamp order.
 
-class HistoricCSVDataHandler(DataHandler):
-    def __init__(self, events_queue: deque, csv_dir: str, symbol_list: list):
+    All symbols' timestamps are k-way merged once up front into a global index and
+    grouped into per-timestamp batches. Each update_bars() call emits one batch,
+    visiting only the symbols that have a bar at that timestamp. MarketEvents carry
+    the bar fields inline; get_latest_bar() returns a BarView indexed into the arrays.
+    """
+
+    def __init__(
+        self,
+        events_queue: deque,
+        bar_stores: dict,
+        symbol_list: list = None,
+        event_pool=None,
+    ):
+        if symbol_list is None:
+            symbol_list = list(bar_stores)
         super().__init__(events_queue, symbol_list)
+        self.bar_stores = bar_stores  # symbol -> BarStore
+        self.cursors = {s: 0 for s in symbol_list}  # Next row to emit per symbol
+        self.event_pool = event_pool  # Optional MarketEventPool to recycle events
+        # Batch boundary for downstream consumers: the last MarketEvent of each batch
+        # has last_in_batch=True, and these describe the most recent batch
+        self.batch_timestamp = None
+        self.batch_symbols = []
+        self._cross_section = None  # Built on first cross_section() call
+        self._build_merge_index()
+
+    def _build_merge_index(self):
+        """Merges all symbols' timestamps into (symbol id, row) pairs sorted by time."""
+        self._symbols = list(self.symbol_list)
+        self._stores = [self.bar_stores[s] for s in self._symbols]
+        lengths = np.array([len(store) for store in self._stores], dtype=np.int64)
+        timestamps = np.concatenate(
+            [store.timestamps for store in self._stores] + [np.empty(0, np.int64)]
+        )
+        # Stable sort keeps symbol_list order among bars sharing a timestamp
+        order = np.argsort(timestamps, kind="stable")
+        symbol_ids = np.repeat(np.arange(len(self._stores)), lengths)
+        row_offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        self._merge_symbol = symbol_ids[order]
+        self._merge_row = order - row_offsets[order]
+
+        sorted_ts = timestamps[order]
+        new_batch = np.flatnonzero(np.diff(sorted_ts)) + 1
+        self._batch_bounds = np.concatenate(([0], new_batch, [len(sorted_ts)]))
+        if len(sorted_ts) == 0:
+            self._batch_bounds = self._batch_bounds[:1]
+        self._batch = 0  # Next batch to emit
+
+    @property
+    def n_batches(self) -> int:
+        return len(self._batch_bounds) - 1
+
+    def get_latest_bar(self, symbol: str):
+        """Returns a BarView of the symbol's most recent bar, or None before its first."""
+        i = self.cursors.get(symbol, 0)
+        return BarView(self.bar_stores[symbol], i - 1) if i else None
+
+    def cross_section(self) -> CrossSection:
+        """
+        Returns a CrossSection that update_bars() keeps current with one vectorized
+        scatter per batch. The first call copies every field into merge order
+        (one extra copy of the data), so that a batch is a contiguous slice.
+        """
+        if self._cross_section is None:
+            cs = CrossSection(self._symbols)
+            self._merged = {}
+            for field in CrossSection.FIELDS:
+                column = np.concatenate(
+                    [getattr(store, field) for store in self._stores]
+                    + [np.empty(0, getattr(cs, field).dtype)]
+                )
+                offsets = np.cumsum([0] + [len(store) for store in self._stores])
+                self._merged[field] = column[
+                    offsets[self._merge_symbol] + self._merge_row
+                ]
+            self._cross_section = cs
+            self._sync_cross_section()
+        return self._cross_section
+
+    def _sync_cross_section(self):
+        """Rebuilds the cross-section from the cursors (after a restore or a late
+        cross_section() call)."""
+        cs = self._cross_section
+        for field in CrossSection.FIELDS:
+            getattr(cs, field)[:] = 0 if field == "volume" else np.nan
+        for sid, symbol in enumerate(self._symbols):
+            i = self.cursors[symbol]
+            if i:
+                for field in CrossSection.FIELDS:
+                    getattr(cs, field)[sid] = getattr(self._stores[sid], field)[i - 1]
+        batch = set(self.batch_symbols)
+        cs.updated[:] = [symbol in batch for symbol in self._symbols]
+        cs.timestamp = self.batch_timestamp
+
+    def get_state(self) -> dict:
+        # The bars themselves are reloaded from the source; only the position is saved
+        return {
+            "symbols": list(self._symbols),
+            "n_batches": self.n_batches,
+            "batch": self._batch,
+            "cursors": dict(self.cursors),
+            "batch_timestamp": self.batch_timestamp,
+            "batch_symbols": list(self.batch_symbols),
+        }
+
+    def set_state(self, state: dict):
+        if state["symbols"] != self._symbols or state["n_batches"] != self.n_batches:
+            raise ValueError("Checkpoint was taken on different market data")
+        self._batch = state["batch"]
+        self.cursors.update(state["cursors"])
+        self.batch_timestamp = state["batch_timestamp"]
+        self.batch_symbols = list(state["batch_symbols"])
+        if self._cross_section is not None:
+            self._sync_cross_section()
+
+    def update_bars(self) -> bool:
+        """
+        Pushes every bar sharing the next timestamp onto the events queue.
+        Returns False once all batches have been emitted.
+        """
+        if self._batch >= self.n_batches:
+            return False
+        start = self._batch_bounds[self._batch]
+        stop = self._batch_bounds[self._batch + 1]
+        self._batch += 1
+
+        symbols, stores, cursors = self._symbols, self._stores, self.cursors
+        make_event = self.event_pool.acquire if self.event_pool else MarketEvent
+        append = self.events_queue.append
+        batch_symbols = []
+        for sid, i in zip(
+            self._merge_symbol[start:stop].tolist(),
+            self._merge_row[start:stop].tolist(),
+        ):
+            symbol = symbols[sid]
+            store = stores[sid]
+            cursors[symbol] = i + 1
+            market_event = make_event(
+                store.index[i],
+                symbol,
+                store.open[i],
+                store.high[i],
+                store.low[i],
+                store.close[i],
+                store.volume[i],
+                store.adj_close[i],
+            )
+            append(market_event)
+            batch_symbols.append(symbol)
+        market_event.last_in_batch = True
+        self.batch_timestamp = market_event.timestamp
+        self.batch_symbols = batch_symbols
+
+        cs = self._cross_section
+        if cs is not None:
+            ids = self._merge_symbol[start:stop]
+            for field, column in self._merged.items():
+                getattr(cs, field)[ids] = column[start:stop]
+            cs.updated[:] = False
+            cs.updated[ids] = True
+            cs.timestamp = market_event.timestamp
+        return True
+
+
+class HistoricCSVDataHandler(ColumnarDataHandler):
+    def __init__(
+        self,
+        events_queue: deque,
+        csv_dir: str,
+        symbol_list: list,
+        start_date=None,
+        end_date=None,
+        use_cache: bool = True,
+        cache_dir: str = None,
+        event_pool=None,
+        timeframe: str = "1d",
+    ):
         self.csv_dir = csv_dir
-        self.symbol_data = {}  # Stores full DataFrame for each symbol
-        self.symbol_iterators = {}  # Iterators for each symbol's DataFrame
+        self.timeframe = timeframe  # Files are named {symbol}_{timeframe}.csv
+        self.start_date = start_date  # Optional inclusive date range filter
+        self.end_date = end_date
+        # Parsed CSVs are cached as memory-mapped .npy columns (see backtester/cache.py)
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir or os.path.join(csv_dir, ".cache")
+        super().__init__(
+            events_queue, self._load_csv_data(symbol_list), symbol_list, event_pool
+        )
 
-        self._load_csv_data()
+    def _load_csv_data(self, symbol_list: list) -> dict:
+        bar_stores = {}
+        for symbol in symbol_list:
+            file_path = f"{self.csv_dir}/{symbol}_{self.timeframe}.csv"
+            try:
+                if self.use_cache:
+                    store = load_bar_store(file_path, self._read_csv, self.cache_dir)
+                else:
+                    store = self._read_csv(file_path)
+            except FileNotFoundError:
+                print(f"Warning: Data file for {symbol} not found at {file_path}")
+                continue
+            bar_stores[symbol] = store.date_range(self.start_date, self.end_date)
+        # Drop missing symbols in place so callers sharing the list see the change
+        symbol_list[:] = [s for s in symbol_list if s in bar_stores]
+        return bar_stores
+
+    @staticmethod
+    def _read_csv(file_path: str) -> BarStore:
+        import pandas as pd  # Only needed to parse CSVs, not for cached data
+
+        # Assuming CSV has columns: Date,Open,High,Low,Close,Adj Close,Volume
+        # Make sure 'Date' is parsed as datetime
+        df = pd.read_csv(file_path, index_col="Date", parse_dates=True)
+        df.sort_index(inplace=True)  # Ensure chronological order
+        return BarStore.from_dataframe(df)
+
+
+class CSVChunkReader:
+    """
+    Reads one chronologically sorted CSV as a sequence of BarStore chunks of about
+    chunk_bytes each. start_date is found by bisecting byte offsets, so earlier rows
+    are never parsed; reading stops at the first chunk that passes end_date.
+    """
+
+    SCAN_WINDOW = 1 << 16  # Bisect down to this many bytes, then scan line by line
+
+    def __init__(
+        self, file_path: str, start_date=None, end_date=None, chunk_bytes=1 << 20
+    ):
+        self.file_path = file_path
+        self.chunk_bytes = chunk_bytes
+        self.file = open(file_path, "rb")
+        self.columns = self.file.readline().decode().strip().split(",")
+        self._date_col = self.columns.index("Date")
+        self._end_ns = (
+            None
+            if end_date is None
+            else int(np.datetime64(end_date, "ns").astype(np.int64))
+        )
+        self._last_ns = None  # Last timestamp returned, to check the file is sorted
+        if start_date is not None:
+            self._seek(int(np.datetime64(start_date, "ns").astype(np.int64)))
+
+    def _line_ns(self, line: bytes):
+        """Timestamp of a data line in ns, or None for a blank line."""
+        line = line.strip()
+        if not line:
+            return None
+        import pandas as pd
 
-    def _load_csv_data(self):
-        for symbol in self.symbol_list:
-            file_path = (
-                f"{self.csv_dir}/{symbol}_1d.csv"  # Assuming 'SYMBOL_1d.csv' format
+        return pd.Timestamp(line.split(b",")[self._date_col].decode()).value
+
+    def _seek(self, start_ns: int):
+        """Positions the file at the first line with timestamp >= start_ns."""
+        f = self.file
+        lo = f.tell()  # A line start; every line before it is earlier than start
+        hi = os.fstat(f.fileno()).st_size
+        while hi - lo > self.SCAN_WINDOW:
+            mid = (lo + hi) // 2
+            f.seek(mid)
+            f.readline()  # Skip to the next line start
+            ts = self._line_ns(f.readline())
+            if ts is not None and ts < start_ns:
+                lo = f.tell()
+            else:
+                hi = mid
+        f.seek(lo)
+        while True:
+            pos = f.tell()
+            ts = self._line_ns(f.readline())
+            if ts is None or ts >= start_ns:
+                f.seek(pos)
+                return
+
+    def read_chunk(self):
+        """Returns the next non-empty BarStore chunk, or None when the file is done."""
+        import pandas as pd
+
+        while self.file is not None:
+            data = self.file.read(self.chunk_bytes)
+            if data and not data.endswith(b"\n"):
+                data += self.file.readline()  # Finish the last line
+            if not data.strip():
+                self.close()
+                return None
+            df = pd.read_csv(
+                io.BytesIO(data),
+                header=None,
+                names=self.columns,
+                index_col="Date",
+                parse_dates=True,
             )
+            store = BarStore.from_dataframe(df)
+            if not len(store):
+                continue
+            ts = store.timestamps
+            if (self._last_ns is not None and ts[0] < self._last_ns) or np.any(
+                ts[1:] < ts[:-1]
+            ):
+                raise ValueError(
+                    f"{self.file_path} is not sorted by date; streaming needs "
+                    "chronological files"
+                )
+            if self._end_ns is not None and ts[-1] > self._end_ns:
+                store = store.slice(0, np.searchsorted(ts, self._end_ns, "right"))
+                self.close()
+                if not len(store):
+                    return None
+            self._last_ns = store.timestamps[-1]
+            return store
+        return None
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class StreamingCSVDataHandler(DataHandler):
+    """
+    Streams bars from CSV files too large to load up front.
+
+    Each symbol's file is read in chunks of about chunk_bytes, so memory stays flat
+    however long the history is. The date range is pushed down into the reader:
+    start_date is found by bisecting the file, and reading stops after end_date.
+    Symbols are merged with a heap of (next timestamp, symbol id). update_bars() and
+    get_latest_bar() behave like ColumnarDataHandler's: one batch per timestamp,
+    emitted in symbol_list order, with last_in_batch set on the last event. Files
+    must be sorted by date.
+    """
+
+    def __init__(
+        self,
+        events_queue: deque,
+        csv_dir: str,
+        symbol_list: list,
+        start_date=None,
+        end_date=None,
+        chunk_bytes: int = 1 << 20,
+        event_pool=None,
+        timeframe: str = "1d",
+    ):
+        self.csv_dir = csv_dir
+        self.readers = {}
+        for symbol in symbol_list:
+            file_path = f"{csv_dir}/{symbol}_{timeframe}.csv"
             try:
-                # Assuming CSV has columns: Date,Open,High,Low,Close,Adj Close,Volume
-                # Make sure 'Date' is parsed as datetime
-                df = pd.read_csv(file_path, index_col="Date", parse_dates=True)
-                df.sort_index(inplace=True)  # Ensure chronological order
-                self.symbol_data[symbol] = df
-                self.symbol_iterators[symbol] = self.symbol_data[symbol].iterrows()
+                self.readers[symbol] = CSVChunkReader(
+                    file_path, start_date, end_date, chunk_bytes
+                )
             except FileNotFoundError:
                 print(f"Warning: Data file for {symbol} not found at {file_path}")
-                self.symbol_list.remove(symbol)  # Or handle more gracefully
+        # Drop missing symbols in place, as HistoricCSVDataHandler does
+        symbol_list[:] = [s for s in symbol_list if s in self.readers]
+        super().__init__(events_queue, symbol_list)
+        self.event_pool = event_pool
+        self.batch_timestamp = None
+        self.batch_symbols = []
+
+        self._symbols = list(symbol_list)
+        self._readers = [self.readers[s] for s in self._symbols]
+        self._chunks = [None] * len(self._symbols)  # Current BarStore chunk per symbol
+        self._rows = [0] * len(self._symbols)  # Next row to emit within the chunk
+        self._latest = {}  # symbol -> (chunk, row) of its most recent bar
+        self._heap = []  # (next timestamp, symbol id)
+        for sid in range(len(self._symbols)):
+            self._next_chunk(sid)
+
+    def _next_chunk(self, sid: int):
+        chunk = self._readers[sid].read_chunk()
+        self._chunks[sid] = chunk
+        self._rows[sid] = 0
+        if chunk is not None:
+            heapq.heappush(self._heap, (int(chunk.timestamps[0]), sid))
+
+    def get_latest_bar(self, symbol: str):
+        """Returns a BarView of the symbol's most recent bar, or None before its first."""
+        latest = self._latest.get(symbol)
+        return BarView(*latest) if latest else None
 
     def update_bars(self) -> bool:
         """
-        Pushes the next bar for each symbol onto the events queue.
-        Returns True if any iterator still has data.
+        Pushes every bar sharing the next timestamp onto the events queue.
+        Returns False once all files are exhausted.
         """
-        more_data = False
-        for symbol in self.symbol_list:
-            try:
-                timestamp, row = next(self.symbol_iterators[symbol])
-                bar_data = {
-                    "open": row["Open"],
-                    "high": row["High"],
-                    "low": row["Low"],
-                    "close": row["Close"],
-                    "volume": row["Volume"],
-                    "adj_close": row.get("Adj Close", row["Close"]),
-                }
-                self.latest_symbol_data[symbol] = bar_data
-                market_event = MarketEvent(
-                    timestamp=timestamp, symbol=symbol, data=bar_data
-                )
-                self.events_queue.append(market_event)  # Use append for deque
-                more_data = True
-            except StopIteration:
-                # No more data for this symbol
-                pass
-            except KeyError as e:
-                print(
-                    f"Error accessing data for {symbol} at {timestamp}: {e}. Row: {row}"
-                )
-                # Potentially remove symbol or handle
-        return more_data
+        heap = self._heap
+        if not heap:
+            return False
+        timestamp, sid = heapq.heappop(heap)
+        batch = [sid]
+        while heap and heap[0][0] == timestamp:
+            batch.append(heapq.heappop(heap)[1])  # Ties pop in symbol id order
+
+        make_event = self.event_pool.acquire if self.event_pool else MarketEvent
+        append = self.events_queue.append
+        batch_symbols = []
+        for sid in batch:
+            symbol = self._symbols[sid]
+            store = self._chunks[sid]
+            i = self._rows[sid]
+            market_event = make_event(
+                store.index[i],
+                symbol,
+                store.open[i],
+                store.high[i],
+                store.low[i],
+                store.close[i],
+                store.volume[i],
+                store.adj_close[i],
+            )
+            append(market_event)
+            batch_symbols.append(symbol)
+            self._latest[symbol] = (store, i)
+
+            i += 1
+            if i < len(store):
+                self._rows[sid] = i
+                heapq.heappush(heap, (int(store.timestamps[i]), sid))
+            else:
+                self._next_chunk(sid)
+        market_event.last_in_batch = True
+        self.batch_timestamp = market_event.timestamp
+        self.batch_symbols = batch_symbols
+        return True
+
+    def close(self):
+        """Closes any files still open (they close on their own once exhausted)."""
+        for reader in self._readers:
+            reader.close()
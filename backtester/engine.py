@@ -0,0 +1,313 @@
+# backtester/engine.py
+import time
+from collections import deque
+from functools import partial
+from .event import EventType
+
+
+class BacktestEngine:
+    """
+    Drives the event loop: pulls one timestamp batch from the DataHandler, then drains
+    the event queue, dispatching each event to the handlers subscribed to its type.
+
+    The standard wiring is
+        MARKET -> execution_handler.on_market, strategy.calculate_signals,
+                  portfolio.update_timeindex
+        SIGNAL -> portfolio.update_signal
+        REBALANCE -> portfolio.rebalance
+        ORDER  -> execution_handler.execute_order
+        FILL   -> portfolio.update_fill
+    and further handlers can be added with subscribe(). With an aggregator
+    (backtester/resample.py) it also gets MARKET events, ahead of the other
+    handlers, and BAR -> strategy.on_bar.
+
+    Pass a backtester.instrumentation.Profiler to collect per-handler timings; without
+    one the uninstrumented loop runs. run(checkpoint_every=N, checkpoint_path=...)
+    saves a checkpoint every N batches, and resume(path) continues a run from one
+    (see backtester/checkpoint.py).
+    """
+
+    def __init__(
+        self,
+        data_handler,
+        strategy=None,
+        portfolio=None,
+        execution_handler=None,
+        events_queue: deque = None,
+        profiler=None,
+        aggregator=None,
+    ):
+        self.data_handler = data_handler
+        self.strategy = strategy
+        self.portfolio = portfolio
+        self.execution_handler = execution_handler
+        self.events_queue = (
+            events_queue if events_queue is not None else data_handler.events_queue
+        )
+        self.handlers = {event_type: [] for event_type in EventType}
+        self.events_processed = 0
+        self.profiler = profiler
+        self.aggregator = aggregator
+
+        if aggregator is not None:
+            self.subscribe(EventType.MARKET, aggregator.on_market)
+            if strategy is not None:
+                self.subscribe(EventType.BAR, strategy.on_bar)
+        if execution_handler is not None:
+            self.subscribe(EventType.MARKET, execution_handler.on_market)
+        if strategy is not None:
+            self.subscribe(EventType.MARKET, strategy.calculate_signals)
+        if portfolio is not None:
+            self.subscribe(EventType.MARKET, portfolio.update_timeindex)
+            self.subscribe(EventType.SIGNAL, portfolio.update_signal)
+            self.subscribe(EventType.REBALANCE, portfolio.rebalance)
+        if execution_handler is not None:
+            self.subscribe(
+                EventType.ORDER,
+                partial(execution_handler.execute_order, data_handler=data_handler),
+            )
+        if portfolio is not None:
+            self.subscribe(EventType.FILL, portfolio.update_fill)
+
+    def subscribe(self, event_type: EventType, handler):
+        """Adds handler(event) for event_type; handlers run in subscription order."""
+        self.handlers[event_type].append(handler)
+
+    def build_dispatch_table(self) -> dict:
+        """Freezes the subscriptions into {EventType: (handler, ...)} for the run loop."""
+        return {
+            event_type: tuple(handlers)
+            for event_type, handlers in self.handlers.items()
+        }
+
+    def run(self, checkpoint_every: int = None, checkpoint_path: str = None) -> int:
+        """Runs until the data is exhausted and the queue is empty.
+        Returns the number of events processed."""
+        if checkpoint_every:
+            return self._run_checkpointed(checkpoint_every, checkpoint_path)
+        dispatch = self.build_dispatch_table()
+        events_queue = self.events_queue
+        popleft = events_queue.popleft
+        update_bars = self.data_handler.update_bars
+        n_events = 0
+        event_pool = getattr(self.data_handler, "event_pool", None)
+
+        if self.profiler is not None:
+            n_events = self._run_profiled(dispatch, event_pool)
+        elif event_pool is None:
+            while update_bars() or events_queue:
+                # Drain everything the batch produced, including follow-on events
+                while events_queue:
+                    event = popleft()
+                    for handler in dispatch[event.type]:
+                        handler(event)
+                    n_events += 1
+        else:
+            # Same loop, but MarketEvents go back to the pool once handled
+            release = event_pool.release
+            market = EventType.MARKET
+            while update_bars() or events_queue:
+                while events_queue:
+                    event = popleft()
+                    event_type = event.type
+                    for handler in dispatch[event_type]:
+                        handler(event)
+                    if event_type is market:
+                        release(event)
+                    n_events += 1
+
+        self.events_processed += n_events
+        return n_events
+
+    def checkpoint(self, path: str) -> int:
+        """Saves the run's state to path; returns the checkpoint's size in bytes."""
+        from .checkpoint import save_checkpoint
+
+        return save_checkpoint(self, path)
+
+    def resume(self, path: str, **run_kwargs) -> int:
+        """Restores the checkpoint at path and runs to the end."""
+        from .checkpoint import load_checkpoint
+
+        load_checkpoint(self, path)
+        return self.run(**run_kwargs)
+
+    def _run_checkpointed(self, checkpoint_every: int, checkpoint_path: str) -> int:
+        """Run loop that checkpoints after every checkpoint_every-th batch, once the
+        batch's events have all been handled."""
+        if self.profiler is not None:
+            raise ValueError("Checkpointing and profiling cannot be combined")
+        dispatch = self.build_dispatch_table()
+        events_queue = self.events_queue
+        popleft = events_queue.popleft
+        update_bars = self.data_handler.update_bars
+        event_pool = getattr(self.data_handler, "event_pool", None)
+        market = EventType.MARKET
+        n_events = n_batches = 0
+        processed_before = self.events_processed
+
+        while update_bars() or events_queue:
+            while events_queue:
+                event = popleft()
+                event_type = event.type
+                for handler in dispatch[event_type]:
+                    handler(event)
+                if event_pool is not None and event_type is market:
+                    event_pool.release(event)
+                n_events += 1
+            n_batches += 1
+            if n_batches % checkpoint_every == 0:
+                self.events_processed = processed_before + n_events
+                self.checkpoint(checkpoint_path)
+
+        self.events_processed = processed_before + n_events
+        return n_events
+
+    def _run_profiled(self, dispatch: dict, event_pool) -> int:
+        """Instrumented copy of the run loop; see backtester/instrumentation.py."""
+        profiler = self.profiler
+        dispatch = {
+            event_type: tuple(profiler.wrap(h) for h in handlers)
+            for event_type, handlers in dispatch.items()
+        }
+        update_bars = profiler.wrap(
+            self.data_handler.update_bars,
+            f"{type(self.data_handler).__name__}.update_bars",
+        )
+        counts = {event_type: 0 for event_type in dispatch}
+        events_queue = self.events_queue
+        popleft = events_queue.popleft
+        high_water = profiler.queue_high_water
+        market = EventType.MARKET
+        start = time.perf_counter()
+
+        while update_bars() or events_queue:
+            while events_queue:
+                depth = len(events_queue)
+                if depth > high_water:
+                    high_water = depth
+                event = popleft()
+                event_type = event.type
+                for handler in dispatch[event_type]:
+                    handler(event)
+                counts[event_type] += 1
+                if event_pool is not None and event_type is market:
+                    event_pool.release(event)
+
+        profiler.run_seconds += time.perf_counter() - start
+        profiler.queue_high_water = high_water
+        for event_type, n in counts.items():
+            if n:
+                name = event_type.name
+                profiler.event_counts[name] = profiler.event_counts.get(name, 0) + n
+        return sum(counts.values())
+
+
+class MultiStackEngine:
+    """
+    Runs many independent (Strategy, Portfolio, ExecutionHandler) stacks off one
+    pass over the data.
+
+    The data handler decodes each timestamp batch and builds its MarketEvents once,
+    into its own queue. Every stack then gets the same event objects in its own
+    isolated queue and drains it with its own dispatch table. Within a stack, events
+    are processed in exactly the order a standalone BacktestEngine would use, so
+    each stack's results match a separate run. Market data is held once, whatever
+    the number of stacks.
+    """
+
+    def __init__(self, data_handler):
+        self.data_handler = data_handler
+        self.stacks = {}  # name -> BacktestEngine wired to the stack's own queue
+
+    def add_stack(self, name: str, strategy, portfolio=None, execution_handler=None):
+        """Adds prebuilt components that share one events queue of their own."""
+        events_queue = strategy.events_queue
+        if events_queue is self.data_handler.events_queue:
+            raise ValueError("Each stack needs its own events queue")
+        for component in (portfolio, execution_handler):
+            if component is not None and component.events_queue is not events_queue:
+                raise ValueError(f"Stack {name!r} components use different queues")
+        stack = BacktestEngine(
+            self.data_handler,
+            strategy,
+            portfolio,
+            execution_handler,
+            events_queue=events_queue,
+        )
+        self.stacks[name] = stack
+        return stack
+
+    def add_strategy(
+        self,
+        name: str,
+        strategy_cls,
+        params: dict = None,
+        initial_capital=100000.0,
+        commission_per_share=0.001,
+        slippage_pct=0.0005,
+    ):
+        """Builds and adds the standard stack for strategy_cls(**params)."""
+        from .execution import SimulatedExecutionHandler
+        from .portfolio import Portfolio
+
+        events_queue = deque()
+        symbol_list = self.data_handler.symbol_list
+        return self.add_stack(
+            name,
+            strategy_cls(
+                events_queue, self.data_handler, symbol_list, **(params or {})
+            ),
+            Portfolio(events_queue, self.data_handler, initial_capital, symbol_list),
+            SimulatedExecutionHandler(events_queue, commission_per_share, slippage_pct),
+        )
+
+    def run(self) -> int:
+        """Runs every stack to the end of the data. Returns total events processed."""
+        stacks = [
+            (stack, stack.events_queue, stack.build_dispatch_table())
+            for stack in self.stacks.values()
+        ]
+        counts = [0] * len(stacks)
+        data_queue = self.data_handler.events_queue
+        update_bars = self.data_handler.update_bars
+        event_pool = getattr(self.data_handler, "event_pool", None)
+
+        while update_bars():
+            batch = list(data_queue)
+            data_queue.clear()
+            for k, (stack, events_queue, dispatch) in enumerate(stacks):
+                events_queue.extend(batch)
+                popleft = events_queue.popleft
+                n_events = 0
+                while events_queue:
+                    event = popleft()
+                    for handler in dispatch[event.type]:
+                        handler(event)
+                    n_events += 1
+                counts[k] += n_events
+            if event_pool is not None:
+                for event in batch:  # Every stack is done with them
+                    event_pool.release(event)
+
+        for (stack, _, _), n_events in zip(stacks, counts):
+            stack.events_processed += n_events
+        return sum(counts)
+
+    def results(self, equity_curves: bool = True) -> dict:
+        """
+        name -> total_return, sharpe and max_drawdown, plus the stack's fill ledger
+        and, unless equity_curves=False (no pandas needed), its equity curve.
+        """
+        from .performance import summarize_equity
+
+        results = {}
+        for name, stack in self.stacks.items():
+            portfolio = stack.portfolio
+            results[name] = dict(
+                summarize_equity(portfolio.total_equity(), portfolio.initial_capital),
+                ledger=portfolio.ledger,
+            )
+            if equity_curves:
+                results[name]["equity_curve"] = portfolio.get_equity_curve()
+        return results
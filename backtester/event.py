@@ -1,4 +1,5 @@
 # backtester/event.py
+import itertools
 from enum import Enum
 
 
@@ -7,45 +8,237 @@ class EventType(Enum):
     SIGNAL = 2  # Strategy generated a signal
     ORDER = 3  # Portfolio wants to place an order
     FILL = 4  # Order has been filled (or partially filled)
+    REBALANCE = 5  # Cross-sectional strategy wants new target weights
+    BAR = 6  # A higher-timeframe bar completed (see backtester/resample.py)
+
+
+# Events use __slots__ (no per-instance __dict__) and carry `type` as a class
+# attribute, which keeps them small and cheap to allocate on the hot path.
 
 
 class Event:
     """Base class for all events."""
 
-    def __init__(self, event_type: EventType):
-        self.type = event_type
+    __slots__ = ()
+    type = None
 
 
 class MarketEvent(Event):
-    def __init__(self, timestamp, symbol: str, data: dict):
-        super().__init__(EventType.MARKET)
+    """One bar for one symbol, with the OHLCV fields carried inline."""
+
+    __slots__ = (
+        "timestamp",
+        "symbol",
+        "open",
+        "high",
+        "low",
+        "close",
+        "adj_close",
+        "volume",
+        "last_in_batch",  # True on the last bar of a timestamp batch
+    )
+    type = EventType.MARKET
+
+    def __init__(
+        self,
+        timestamp,
+        symbol: str,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int,
+        adj_close: float = None,
+        last_in_batch: bool = False,
+    ):
+        self.timestamp = timestamp
+        self.symbol = symbol
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.adj_close = close if adj_close is None else adj_close
+        self.volume = volume
+        self.last_in_batch = last_in_batch
+
+    @property
+    def data(self):
+        """Dict-style access to the bar (event.data['close']) for older strategies."""
+        return self
+
+    def __getitem__(self, key):
+        if key in MarketEvent.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in MarketEvent.__slots__ else default
+
+
+class MarketEventPool:
+    """
+    Opt-in free list of MarketEvents. The data handler acquires events from it and the
+    engine releases them once every MARKET handler has run, so steady-state runs
+    allocate no new MarketEvents. Handlers must not keep references to pooled events.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._free = []
+
+    def acquire(
+        self, timestamp, symbol, open, high, low, close, volume, adj_close=None
+    ) -> MarketEvent:
+        if not self._free:
+            return MarketEvent(
+                timestamp, symbol, open, high, low, close, volume, adj_close
+            )
+        event = self._free.pop()
+        event.timestamp = timestamp
+        event.symbol = symbol
+        event.open = open
+        event.high = high
+        event.low = low
+        event.close = close
+        event.adj_close = close if adj_close is None else adj_close
+        event.volume = volume
+        event.last_in_batch = False
+        return event
+
+    def release(self, event: MarketEvent):
+        if len(self._free) < self.max_size:
+            self._free.append(event)
+
+
+class BarEvent(Event):
+    """
+    One completed higher-timeframe bar for one symbol, aggregated from base bars.
+    timestamp is the bar's close time (start + timeframe, or the session end).
+    """
+
+    __slots__ = (
+        "timestamp",
+        "symbol",
+        "timeframe",  # Label the aggregator was configured with, e.g. "5min"
+        "start",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "vwap",  # Volume-weighted typical price (high + low + close) / 3
+        "n_bars",  # Base bars aggregated
+    )
+    type = EventType.BAR
+
+    def __init__(
+        self,
+        timestamp,
+        symbol,
+        timeframe,
+        start,
+        open,
+        high,
+        low,
+        close,
+        volume,
+        vwap,
+        n_bars,
+    ):
         self.timestamp = timestamp
         self.symbol = symbol
-        self.data = data  # e.g., {'open': 150.0, 'high': 152.0, ... 'volume': 10000}
+        self.timeframe = timeframe
+        self.start = start
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.vwap = vwap
+        self.n_bars = n_bars
+
+    def __getitem__(self, key):
+        if key in BarEvent.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
 
 
 class SignalEvent(Event):
+    __slots__ = ("timestamp", "symbol", "direction", "strength")
+    type = EventType.SIGNAL
+
     def __init__(self, timestamp, symbol: str, direction: str, strength: float = 1.0):
-        super().__init__(EventType.SIGNAL)
         self.timestamp = timestamp
         self.symbol = symbol
         self.direction = direction  # 'LONG', 'SHORT', 'EXIT'
         self.strength = strength  # Optional: confidence or sizing factor
 
 
+class RebalanceEvent(Event):
+    """Target portfolio weights for every symbol at once (see CrossSectionalStrategy)."""
+
+    __slots__ = ("timestamp", "weights")
+    type = EventType.REBALANCE
+
+    def __init__(self, timestamp, weights):
+        self.timestamp = timestamp
+        # float array in symbol_list order: fraction of equity per symbol, NaN = hold
+        self.weights = weights
+
+
+_order_ids = itertools.count(1)  # Default order ids, unique within the process
+
+ORDER_TYPES = ("MKT", "LMT", "STP", "STP_LMT")
+
+
 class OrderEvent(Event):
+    __slots__ = (
+        "timestamp",
+        "symbol",
+        "order_type",
+        "quantity",
+        "direction",
+        "limit_price",
+        "stop_price",
+        "order_id",
+    )
+    type = EventType.ORDER
+
     def __init__(
-        self, timestamp, symbol: str, order_type: str, quantity: int, direction: str
+        self,
+        timestamp,
+        symbol: str,
+        order_type: str,
+        quantity: int,
+        direction: str,
+        limit_price: float = None,
+        stop_price: float = None,
+        order_id: int = None,
     ):
-        super().__init__(EventType.ORDER)
         self.timestamp = timestamp
         self.symbol = symbol
-        self.order_type = order_type  # 'MKT' (Market), 'LMT' (Limit - for future)
+        # 'MKT' (Market), 'LMT' (Limit), 'STP' (Stop) or 'STP_LMT' (Stop-limit)
+        self.order_type = order_type
         self.quantity = quantity
         self.direction = direction  # 'BUY' or 'SELL'
+        self.limit_price = limit_price  # LMT and STP_LMT
+        self.stop_price = stop_price  # STP and STP_LMT trigger price
+        self.order_id = next(_order_ids) if order_id is None else order_id
 
 
 class FillEvent(Event):
+    __slots__ = (
+        "timestamp",
+        "symbol",
+        "quantity",
+        "direction",
+        "fill_price",
+        "commission",
+        "cost",
+        "order_id",
+    )
+    type = EventType.FILL
+
     def __init__(
         self,
         timestamp,
@@ -54,14 +247,15 @@ class FillEvent(Event):
         direction: str,
         fill_price: float,
         commission: float = 0.0,
+        order_id: int = None,
     ):
-        super().__init__(EventType.FILL)
         self.timestamp = timestamp
         self.symbol = symbol
         self.quantity = quantity
         self.direction = direction
         self.fill_price = fill_price
         self.commission = commission
+        self.order_id = order_id  # OrderEvent.order_id; an order may fill in parts
         self.cost = (
             quantity * fill_price + commission
             if direction == "BUY"
@@ -1,5 +1,7 @@
 # backtester/execution.py
-from .event import FillEvent, OrderEvent
+import heapq
+import itertools
+from .event import ORDER_TYPES, FillEvent, OrderEvent
 from collections import deque
 
 
@@ -15,48 +17,345 @@ class ExecutionHandler:
         """Simulates order execution and generates a FillEvent."""
         raise NotImplementedError("Should implement execute_order()")
 
+    def on_market(self, market_event) -> None:
+        """Called for every MarketEvent before the strategy sees it. No-op by default."""
+        pass
+
+    def get_state(self) -> dict:
+        """Resting orders and other run state, for checkpoints. Stateless by default."""
+        return {}
+
+    def set_state(self, state: dict):
+        pass
+
+
+class OrderBook:
+    """
+    Resting orders for one symbol. Limit and stop orders sit in heaps keyed so the
+    top is always the order a bar reaches first: the highest buy limit, lowest sell
+    limit, lowest buy stop and highest sell stop. A bar only pops the orders its
+    high/low range can trigger. Cancelled orders stay in the heaps and are skipped
+    (lazy deletion) until compact() drops them.
+    """
+
+    __slots__ = ("market", "buy_limits", "sell_limits", "buy_stops", "sell_stops")
+
+    def __init__(self):
+        self.market = []  # Market orders, and stops triggered but not fully filled
+        # Heap entries are (price key, sequence, order); sequence keeps time priority
+        self.buy_limits = []  # (-limit_price, ...)
+        self.sell_limits = []  # (limit_price, ...)
+        self.buy_stops = []  # (stop_price, ...)
+        self.sell_stops = []  # (-stop_price, ...)
+
+    def __len__(self):
+        return (
+            len(self.market)
+            + len(self.buy_limits)
+            + len(self.sell_limits)
+            + len(self.buy_stops)
+            + len(self.sell_stops)
+        )
+
+    def compact(self, is_live):
+        """Drops entries whose order is no longer live."""
+        self.market = [order for order in self.market if is_live(order)]
+        for name in ("buy_limits", "sell_limits", "buy_stops", "sell_stops"):
+            heap = [entry for entry in getattr(self, name) if is_live(entry[2])]
+            heapq.heapify(heap)
+            setattr(self, name, heap)
+
 
 class SimulatedExecutionHandler(ExecutionHandler):
+    """
+    Simulated matching engine for MKT, LMT, STP and STP_LMT orders.
+
+    Orders are generated on a bar's close, so they first meet the market on the
+    symbol's next bar. Filling at the current bar's open would look ahead. On each
+    bar, in this order:
+    - Market orders fill at the open, with slippage.
+    - Stops whose price lies within [low, high] trigger. A STP fills at the worse of
+      its stop price and the open, with slippage. A STP_LMT fills at that trigger
+      price if it is within its limit; otherwise, or for any unfilled rest, it
+      becomes a limit that rests from the next bar on.
+    - Limits the bar's range reaches fill at their limit price, or at the open if it
+      gapped through.
+    Unfilled quantity rests until a later bar. With max_participation set, all fills
+    on a bar together take at most that fraction of the bar's volume; the rest of an
+    order stays open and fills in parts over later bars. Only orders whose prices the
+    bar reaches are examined, so the cost per bar does not grow with the number of
+    resting orders.
+    """
+
     def __init__(
-        self, events_queue: deque, commission_per_share=0.001, slippage_pct=0.0005
+        self,
+        events_queue: deque,
+        commission_per_share=0.001,
+        slippage_pct=0.0005,
+        max_participation: float = None,
     ):  # Added slippage
         super().__init__(events_queue)
         self.commission_per_share = commission_per_share
         self.slippage_pct = slippage_pct  # Percentage slippage
+        self.max_participation = max_participation  # Max fraction of bar volume
+        self.books = {}  # symbol -> OrderBook
+        self.open_orders = {}  # order_id -> live OrderEvent
+        self.remaining = {}  # order_id -> unfilled quantity
+        self._n_stale = {}  # symbol -> cancelled entries still in its book
+        self._sequence = itertools.count()
+
+    @staticmethod
+    def _validate(order_event: OrderEvent):
+        """Raises ValueError for an order the book can't take."""
+        order_type = order_event.order_type
+        if order_type not in ORDER_TYPES:
+            raise ValueError(f"Unsupported order type {order_type!r}")
+        if order_type in ("LMT", "STP_LMT") and order_event.limit_price is None:
+            raise ValueError(
+                f"{order_type} order {order_event.order_id} needs limit_price"
+            )
+        if order_type in ("STP", "STP_LMT") and order_event.stop_price is None:
+            raise ValueError(
+                f"{order_type} order {order_event.order_id} needs stop_price"
+            )
 
     def execute_order(
         self, order_event: OrderEvent, data_handler
     ):  # Added data_handler
-        symbol = order_event.symbol
-        quantity = order_event.quantity
-        direction = order_event.direction  # 'BUY' or 'SELL'
-
-        # Simulate fill: use next bar's open price for simplicity
-        # A more realistic simulation would use current bar's close, or VWAP, or have a proper matching engine
-        latest_bar = data_handler.get_latest_bar(symbol)
-        if latest_bar is None or latest_bar.get("open") is None:
-            # This happens if an order is generated but there's no subsequent market data for fill price.
-            # Could be end of data, or data issue. Skip fill or use last known close.
-            print(
-                f"Warning: No market data to fill order for {symbol} at {order_event.timestamp}. Order skipped."
+        """Accepts an order; it rests in the symbol's book until a bar fills it."""
+        self._validate(order_event)
+        order_type = order_event.order_type
+        if order_event.quantity <= 0:
+            return
+        self.open_orders[order_event.order_id] = order_event
+        self.remaining[order_event.order_id] = order_event.quantity
+        book = self.books.get(order_event.symbol)
+        if book is None:
+            book = self.books[order_event.symbol] = OrderBook()
+        if order_type == "MKT":
+            book.market.append(order_event)
+        elif order_type == "LMT":
+            self._rest_limit(book, order_event)
+        elif order_event.direction == "BUY":
+            heapq.heappush(
+                book.buy_stops,
+                (order_event.stop_price, next(self._sequence), order_event),
+            )
+        else:
+            heapq.heappush(
+                book.sell_stops,
+                (-order_event.stop_price, next(self._sequence), order_event),
             )
+
+    def _rest_limit(self, book: OrderBook, order_event: OrderEvent):
+        if order_event.direction == "BUY":
+            key, heap = -order_event.limit_price, book.buy_limits
+        else:
+            key, heap = order_event.limit_price, book.sell_limits
+        heapq.heappush(heap, (key, next(self._sequence), order_event))
+
+    def _is_live(self, order_event: OrderEvent) -> bool:
+        return self.open_orders.get(order_event.order_id) is order_event
+
+    def cancel_order(self, order_id: int) -> bool:
+        """Cancels the unfilled part of an order. Returns False if it was not open."""
+        order_event = self.open_orders.pop(order_id, None)
+        if order_event is None:
+            return False
+        del self.remaining[order_id]
+        # The book entry is skipped lazily; compact once stale entries dominate
+        symbol = order_event.symbol
+        n_stale = self._n_stale.get(symbol, 0) + 1
+        book = self.books[symbol]
+        if 2 * n_stale > len(book):
+            book.compact(self._is_live)
+            n_stale = 0
+        self._n_stale[symbol] = n_stale
+        return True
+
+    def replace_order(
+        self, order_id: int, quantity=None, limit_price=None, stop_price=None
+    ):
+        """
+        Cancel/replace: swaps an open order for one with the same id and the given
+        changes (quantity is the new unfilled quantity). The replacement loses time
+        priority. Returns the new OrderEvent, or None if the order was not open.
+        """
+        old = self.open_orders.get(order_id)
+        if old is None:
+            return None
+        if quantity is None:
+            quantity = self.remaining[order_id]
+        self.cancel_order(order_id)
+        new = OrderEvent(
+            old.timestamp,
+            old.symbol,
+            old.order_type,
+            quantity,
+            old.direction,
+            limit_price=old.limit_price if limit_price is None else limit_price,
+            stop_price=old.stop_price if stop_price is None else stop_price,
+            order_id=order_id,
+        )
+        self.execute_order(new, None)
+        return new
+
+    def get_state(self) -> dict:
+        sequence = next(self._sequence)
+        self._sequence = itertools.count(sequence)
+        # Book entries and open_orders share OrderEvent objects; they must be pickled
+        # together so _is_live()'s identity check still holds after a restore
+        return {
+            "books": self.books,
+            "open_orders": self.open_orders,
+            "remaining": self.remaining,
+            "n_stale": self._n_stale,
+            "sequence": sequence,
+        }
+
+    def set_state(self, state: dict):
+        self.books = state["books"]
+        self.open_orders = state["open_orders"]
+        self.remaining = state["remaining"]
+        self._n_stale = state["n_stale"]
+        self._sequence = itertools.count(state["sequence"])
+
+    def on_market(self, market_event):
+        book = self.books.get(market_event.symbol)
+        if book is None or not len(book):
             return
+        if self.max_participation is None:
+            capacity = float("inf")
+        else:
+            capacity = int(self.max_participation * market_event.volume)
+        is_live = self._is_live
+        bar_open, high, low = market_event.open, market_event.high, market_event.low
+        stale = 0  # Cancelled entries popped on this bar
+        triggered = []  # Stop-limits that trigger now; they rest after step 3
 
-        fill_price = latest_bar["open"]  # Fill at next available open
+        # 1. Market orders at the open
+        if book.market:
+            unfilled = []
+            for order_event in book.market:
+                if not is_live(order_event):
+                    stale += 1
+                    continue
+                capacity -= self.fill_order(order_event, market_event, capacity)
+                if is_live(order_event):
+                    unfilled.append(order_event)
+            book.market = unfilled
+
+        # 2. Stops inside the bar's range trigger
+        heap = book.buy_stops
+        while heap and heap[0][0] <= high:
+            order_event = heapq.heappop(heap)[2]
+            if not is_live(order_event):
+                stale += 1
+                continue
+            price = max(bar_open, order_event.stop_price)
+            capacity -= self._trigger(
+                book, order_event, market_event, price, capacity, triggered
+            )
+        heap = book.sell_stops
+        while heap and -heap[0][0] >= low:
+            order_event = heapq.heappop(heap)[2]
+            if not is_live(order_event):
+                stale += 1
+                continue
+            price = min(bar_open, order_event.stop_price)
+            capacity -= self._trigger(
+                book, order_event, market_event, price, capacity, triggered
+            )
+
+        # 3. Limits the bar reaches, best price first
+        heap = book.buy_limits
+        while capacity > 0 and heap and -heap[0][0] >= low:
+            order_event = heap[0][2]
+            if is_live(order_event):
+                price = min(bar_open, order_event.limit_price)
+                capacity -= self._fill(order_event, market_event, price, capacity)
+                if is_live(order_event):
+                    break  # Partially filled: the bar's volume is used up
+            else:
+                stale += 1
+            heapq.heappop(heap)
+        heap = book.sell_limits
+        while capacity > 0 and heap and heap[0][0] <= high:
+            order_event = heap[0][2]
+            if is_live(order_event):
+                price = max(bar_open, order_event.limit_price)
+                capacity -= self._fill(order_event, market_event, price, capacity)
+                if is_live(order_event):
+                    break
+            else:
+                stale += 1
+            heapq.heappop(heap)
+
+        # Triggered stop-limits rest only now, so step 3 cannot fill them at an open
+        # that traded before their stop did
+        for order_event in triggered:
+            self._rest_limit(book, order_event)
+        if stale:
+            self._n_stale[market_event.symbol] -= stale
+
+    def _trigger(self, book, order_event, market_event, price, capacity, triggered):
+        """
+        Converts a triggered stop at trigger price `price`; returns the quantity
+        filled on this bar.
+        """
+        if order_event.order_type == "STP_LMT":
+            # On the trigger bar nothing traded better than the trigger price
+            limit = order_event.limit_price
+            within = (
+                price <= limit if order_event.direction == "BUY" else price >= limit
+            )
+            filled = (
+                self._fill(order_event, market_event, price, capacity) if within else 0
+            )
+            if self._is_live(order_event):
+                triggered.append(order_event)
+            return filled
+        filled = self.fill_order(order_event, market_event, capacity, price)
+        if self._is_live(order_event):
+            book.market.append(order_event)  # Rest of a stop is a market order
+        return filled
 
+    def fill_order(
+        self, order_event: OrderEvent, market_event, capacity=None, fill_price=None
+    ) -> int:
+        """
+        Fills up to `capacity` shares of a market-type order at fill_price (default:
+        market_event's open) plus slippage. Returns the quantity filled.
+        """
+        price = market_event.open if fill_price is None else fill_price
         # Simulate slippage
-        if direction == "BUY":
-            fill_price *= 1 + self.slippage_pct
+        if order_event.direction == "BUY":
+            price *= 1 + self.slippage_pct
         else:  # SELL
-            fill_price *= 1 - self.slippage_pct
+            price *= 1 - self.slippage_pct
+        if capacity is None:
+            capacity = float("inf")
+        return self._fill(order_event, market_event, price, capacity)
 
+    def _fill(self, order_event, market_event, fill_price, capacity) -> int:
+        order_id = order_event.order_id
+        remaining = self.remaining[order_id]
+        quantity = remaining if remaining <= capacity else int(capacity)
+        if quantity <= 0:
+            return 0
+        if quantity == remaining:
+            del self.open_orders[order_id], self.remaining[order_id]
+        else:
+            self.remaining[order_id] = remaining - quantity
         commission = self.commission_per_share * quantity
         fill_event = FillEvent(
-            timestamp=order_event.timestamp,  # Or use timestamp from latest_bar if fill is on next tick
-            symbol=symbol,
+            timestamp=market_event.timestamp,  # Filled on the bar after the order
+            symbol=order_event.symbol,
             quantity=quantity,
-            direction=direction,
+            direction=order_event.direction,
             fill_price=fill_price,
             commission=commission,
+            order_id=order_id,
         )
         self.events_queue.append(fill_event)
+        return quantity
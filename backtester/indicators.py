@@ -0,0 +1,416 @@
+# backtester/indicators.py
+"""
+Streaming technical indicators.
+
+Every indicator takes one bar per update() call in O(1) (amortized O(1) for the
+rolling min/max) and keeps its window in a preallocated RingBuffer. `value` is the
+current reading and `prev` the reading before the last update; both are NaN until
+the indicator has seen enough bars (`ready`). Results match the pandas equivalents
+noted on each class (see benchmarks/indicator_parity.py).
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+NAN = float("nan")
+
+
+class RingBuffer:
+    """Fixed-capacity circular buffer over a preallocated float64 array."""
+
+    def __init__(self, capacity: int):
+        self.data = np.zeros(capacity, dtype=np.float64)
+        self.capacity = capacity
+        self.count = 0  # Number of valid elements (<= capacity)
+        self.pos = 0  # Slot the next value is written to
+
+    def append(self, x: float) -> float:
+        """Appends x and returns the value it evicted (NaN while not yet full)."""
+        evicted = float(self.data[self.pos]) if self.count == self.capacity else NAN
+        self.data[self.pos] = x
+        self.pos = (self.pos + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        return evicted
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.capacity
+
+    def __len__(self):
+        return self.count
+
+    def to_array(self) -> np.ndarray:
+        """Returns the contents ordered oldest to newest (a copy)."""
+        if self.count < self.capacity:
+            return self.data[: self.count].copy()
+        return np.roll(self.data, -self.pos)
+
+
+class Indicator:
+    """Base class for streaming indicators."""
+
+    def __init__(self):
+        self.value = NAN
+        self.prev = NAN
+
+    @property
+    def ready(self) -> bool:
+        return not math.isnan(self.value)
+
+    def _set(self, value: float) -> float:
+        self.prev = self.value
+        self.value = value
+        return value
+
+
+class SMA(Indicator):
+    """
+    Simple moving average. Matches Series.rolling(period).mean(): NaN while a NaN
+    (or inf) is in the window.
+    """
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self.buffer = RingBuffer(period)
+        self._sum = 0.0
+        self._n = 0
+        self._n_bad = 0  # Non-finite values in the window; the sum is stale if > 0
+
+    def update(self, x: float) -> float:
+        full = self.buffer.full
+        evicted = self.buffer.append(x)
+        self._n += 1
+        resum = self._n % self.period == 0
+        if not math.isfinite(x):
+            self._n_bad += 1
+        if full and not math.isfinite(evicted):
+            self._n_bad -= 1
+            resum = True  # The sum skipped everything since the bad value came in
+        if self._n_bad:
+            return self._set(NAN)
+        if resum:
+            # Resum once per window so the running sum can't drift (amortized O(1))
+            self._sum = float(self.buffer.data.sum())
+        elif full:
+            self._sum += x - evicted
+        else:
+            self._sum += x
+        return self._set(self._sum / self.period if self.buffer.full else NAN)
+
+
+class EMA(Indicator):
+    """
+    Exponential moving average seeded with the first value.
+    Matches Series.ewm(span=period, adjust=False, min_periods=period).mean().
+    """
+
+    def __init__(self, period: int, alpha: float = None):
+        super().__init__()
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self._ema = NAN
+        self._n = 0
+
+    def update(self, x: float) -> float:
+        self._n += 1
+        if self._n == 1:
+            self._ema = x
+        else:
+            self._ema += self.alpha * (x - self._ema)
+        return self._set(self._ema if self._n >= self.period else NAN)
+
+
+class RollingStd(Indicator):
+    """
+    Rolling standard deviation via a sliding-window Welford update.
+    Matches Series.rolling(period).std(ddof=ddof); `mean` holds the rolling mean.
+    Like SMA, NaN while a non-finite value is in the window.
+    """
+
+    def __init__(self, period: int, ddof: int = 1):
+        super().__init__()
+        self.period = period
+        self.ddof = ddof
+        self.buffer = RingBuffer(period)
+        self.mean = NAN
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._n = 0
+        self._n_bad = 0
+
+    def update(self, x: float) -> float:
+        full = self.buffer.full
+        evicted = self.buffer.append(x)
+        self._n += 1
+        count = self.buffer.count
+        resum = self._n % self.period == 0
+        if not math.isfinite(x):
+            self._n_bad += 1
+        if full and not math.isfinite(evicted):
+            self._n_bad -= 1
+            resum = True
+        if self._n_bad:
+            self.mean = NAN
+            return self._set(NAN)
+        if resum:
+            # Recompute from the window once per period to shed rounding error
+            window = self.buffer.data[:count]
+            self._mean = float(window.mean())
+            self._m2 = float(((window - self._mean) ** 2).sum())
+        elif not full:
+            delta = x - self._mean
+            self._mean += delta / count
+            self._m2 += delta * (x - self._mean)
+        else:
+            old_mean = self._mean
+            self._mean += (x - evicted) / count
+            self._m2 += (x - evicted) * (x - self._mean + evicted - old_mean)
+        if count < self.period:
+            return self._set(NAN)
+        self.mean = self._mean
+        if count <= self.ddof:  # No degrees of freedom left; pandas gives NaN too
+            return self._set(NAN)
+        return self._set(math.sqrt(max(self._m2, 0.0) / (count - self.ddof)))
+
+
+class BollingerBands(Indicator):
+    """
+    Bollinger bands: rolling mean +/- num_std rolling standard deviations.
+    `value` is the middle band; upper/lower (and prev_upper/prev_lower) the bands.
+    """
+
+    def __init__(self, period: int = 20, num_std: float = 2.0, ddof: int = 0):
+        super().__init__()
+        self.num_std = num_std
+        self.std = RollingStd(period, ddof=ddof)
+        self.upper = self.lower = NAN
+        self.prev_upper = self.prev_lower = NAN
+
+    def update(self, x: float) -> float:
+        std = self.std.update(x)
+        self.prev_upper, self.prev_lower = self.upper, self.lower
+        if math.isnan(std):
+            self.upper = self.lower = NAN
+            return self._set(NAN)
+        middle = self.std.mean
+        self.upper = middle + self.num_std * std
+        self.lower = middle - self.num_std * std
+        return self._set(middle)
+
+
+class RSI(Indicator):
+    """
+    Relative Strength Index with Wilder smoothing of gains and losses.
+    Matches 100 - 100 / (1 + rs) with rs from
+    ewm(alpha=1/period, adjust=False, min_periods=period) of close.diff() gains/losses.
+    """
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.alpha = 1.0 / period
+        self._last = NAN
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._n = 0  # Number of price changes seen
+
+    def update(self, x: float) -> float:
+        last, self._last = self._last, x
+        if math.isnan(last):
+            return self._set(NAN)
+        change = x - last
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self._n += 1
+        if self._n == 1:
+            self._avg_gain, self._avg_loss = gain, loss
+        else:
+            self._avg_gain += self.alpha * (gain - self._avg_gain)
+            self._avg_loss += self.alpha * (loss - self._avg_loss)
+        if self._n < self.period:
+            return self._set(NAN)
+        if self._avg_loss == 0.0:
+            return self._set(100.0 if self._avg_gain > 0.0 else NAN)
+        return self._set(100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss))
+
+
+class ATR(Indicator):
+    """
+    Average True Range with Wilder smoothing; the first true range is high - low.
+    Matches true_range.ewm(alpha=1/period, adjust=False, min_periods=period).mean().
+    """
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.alpha = 1.0 / period
+        self._prev_close = NAN
+        self._atr = 0.0
+        self._n = 0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev_close, self._prev_close = self._prev_close, close
+        true_range = high - low
+        if not math.isnan(prev_close):
+            true_range = max(true_range, abs(high - prev_close), abs(low - prev_close))
+        self._n += 1
+        if self._n == 1:
+            self._atr = true_range
+        else:
+            self._atr += self.alpha * (true_range - self._atr)
+        return self._set(self._atr if self._n >= self.period else NAN)
+
+
+class RollingMax(Indicator):
+    """
+    Rolling maximum using a monotonic deque (amortized O(1) per update).
+    Matches Series.rolling(period).max().
+    """
+
+    _sign = 1.0
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self._window = deque()  # (bar number, signed value), values decreasing
+        self._n = 0
+
+    def update(self, x: float) -> float:
+        n = self._n
+        self._n = n + 1
+        key = self._sign * x
+        window = self._window
+        while window and window[-1][1] <= key:
+            window.pop()
+        window.append((n, key))
+        if window[0][0] <= n - self.period:
+            window.popleft()
+        if self._n < self.period:
+            return self._set(NAN)
+        return self._set(self._sign * window[0][1])
+
+
+class RollingMin(RollingMax):
+    """Rolling minimum. Matches Series.rolling(period).min()."""
+
+    _sign = -1.0
+
+
+class VWAP(Indicator):
+    """
+    Volume-weighted average price (pass the close or the typical price as `price`).
+    With a period it is a rolling VWAP matching
+    (price * volume).rolling(period).sum() / volume.rolling(period).sum();
+    without one it accumulates until reset() (e.g. at a session boundary). A bar
+    with a non-finite price or volume reads NaN; the rolling VWAP stays NaN until
+    it leaves the window, the cumulative one skips it.
+    """
+
+    def __init__(self, period: int = None):
+        super().__init__()
+        self.period = period
+        if period is not None:
+            self._pv_buffer = RingBuffer(period)
+            self._v_buffer = RingBuffer(period)
+        self.reset()
+
+    def reset(self):
+        self._pv = 0.0
+        self._v = 0.0
+        self._n = 0
+        self._n_bad = 0
+        if self.period is not None:
+            self._pv_buffer = RingBuffer(self.period)
+            self._v_buffer = RingBuffer(self.period)
+
+    def update(self, price: float, volume: float) -> float:
+        pv = price * volume
+        bad = not (math.isfinite(pv) and math.isfinite(volume))
+        self._n += 1
+        if self.period is None:
+            if bad:
+                return self._set(NAN)
+            self._pv += pv
+            self._v += volume
+        else:
+            full = self._pv_buffer.full
+            old_pv = self._pv_buffer.append(pv)
+            old_v = self._v_buffer.append(volume)
+            resum = self._n % self.period == 0
+            self._n_bad += bad
+            if full and not (math.isfinite(old_pv) and math.isfinite(old_v)):
+                self._n_bad -= 1
+                resum = True
+            if self._n_bad:
+                return self._set(NAN)
+            if resum:
+                self._pv = float(self._pv_buffer.data.sum())
+                self._v = float(self._v_buffer.data.sum())
+            elif full:
+                self._pv += pv - old_pv
+                self._v += volume - old_v
+            else:
+                self._pv += pv
+                self._v += volume
+            if self._n < self.period:
+                return self._set(NAN)
+        return self._set(self._pv / self._v if self._v else NAN)
+
+
+# Whole-array counterparts for the vectorized fast path (Strategy.compute_signals)
+
+
+def _window_sums(values, window: int) -> tuple:
+    """
+    (offset, sum, sum of squares) of (values - offset) over every full window, in
+    O(n). A single cumulative sum over the whole series would lose the precision
+    of a window's sum to the size of the running total (prices can drift over
+    orders of magnitude). Instead the series is cut into blocks of `window` values,
+    each with prefix sums relative to its own first value. A window spans the tail
+    of one block and the head of the next, and is summed relative to the first
+    block's offset, so rounding error stays on the scale of one window.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_windows = len(values) - window + 1
+    n_blocks = -(-len(values) // window)
+    padded = np.zeros(n_blocks * window)
+    padded[: len(values)] = values
+    blocks = padded.reshape(n_blocks, window)
+    offsets = blocks[:, 0].copy()
+    deviations = blocks - offsets[:, None]
+    zeros = np.zeros((n_blocks, 1))
+    # prefix[k, j]: sum of the first j deviations of block k
+    prefix1 = np.hstack((zeros, np.cumsum(deviations, axis=1)))
+    prefix2 = np.hstack((zeros, np.cumsum(deviations * deviations, axis=1)))
+
+    start = np.arange(n_windows)
+    block, split = start // window, start % window
+    head = np.minimum(block + 1, n_blocks - 1)  # Unused (split == 0) past the end
+    tail1 = prefix1[block, window] - prefix1[block, split]
+    tail2 = prefix2[block, window] - prefix2[block, split]
+    head1 = prefix1[head, split]
+    head2 = prefix2[head, split]
+    # Re-base the head block's deviations onto the tail block's offset
+    shift = offsets[head] - offsets[block]
+    sum1 = tail1 + head1 + split * shift
+    sum2 = tail2 + head2 + 2.0 * shift * head1 + split * shift * shift
+    return offsets[block], sum1, sum2
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    """Mean of every full window (len(values) - window + 1 of them), in O(n)."""
+    offset, sum1, _ = _window_sums(values, window)
+    return offset + sum1 / window
+
+
+def rolling_mean_std(values, window: int, ddof: int = 0) -> tuple:
+    """(rolling mean, rolling std) over every full window, in O(n)."""
+    offset, sum1, sum2 = _window_sums(values, window)
+    m2 = np.maximum(sum2 - sum1 * sum1 / window, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(m2 / (window - ddof))
+    return offset + sum1 / window, std
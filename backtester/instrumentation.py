@@ -0,0 +1,158 @@
+# backtester/instrumentation.py
+"""
+Hot-path instrumentation for the event loop.
+
+A Profiler passed to BacktestEngine(profiler=...) makes the engine run an
+instrumented copy of its loop. The copy counts events per type, times every handler
+call and update_bars() into log-bucketed histograms, and tracks the event queue's
+high-water mark. Without a profiler the engine runs its plain loop, so
+instrumentation costs nothing when it is off.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+SUB_BUCKETS = 4  # Buckets per power of two: percentiles are within ~19%
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of nanosecond latencies with O(1) record()."""
+
+    def __init__(self):
+        self.buckets = [0] * (64 * SUB_BUCKETS)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int):
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[_bucket(ns)] += 1
+
+    def percentile(self, p: float) -> float:
+        """Approximate p-th percentile (0-100) in nanoseconds: the bucket's upper edge."""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(_bucket_upper(i), self.max_ns)
+        return float(self.max_ns)
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+
+def _bucket(ns: int) -> int:
+    exponent = ns.bit_length()
+    if exponent <= 2:
+        return ns
+    # Top two bits below the leading one pick the sub-bucket
+    return exponent * SUB_BUCKETS + ((ns >> (exponent - 3)) & (SUB_BUCKETS - 1))
+
+
+def _bucket_upper(i: int) -> float:
+    if i < SUB_BUCKETS:
+        return float(i)
+    exponent, sub = divmod(i, SUB_BUCKETS)
+    return float((SUB_BUCKETS + sub + 1) << (exponent - 3))
+
+
+def handler_name(handler) -> str:
+    func = getattr(handler, "func", handler)  # functools.partial
+    owner = getattr(func, "__self__", None)
+    name = getattr(func, "__name__", repr(func))
+    return f"{type(owner).__name__}.{name}" if owner is not None else name
+
+
+class Profiler:
+    """Collects counts, latencies and queue depth for one or more engine runs."""
+
+    def __init__(self):
+        self.event_counts = {}  # EventType name -> events dispatched
+        self.latencies = {}  # handler / phase name -> LatencyHistogram
+        self.phases = {}  # name -> wall seconds, for coarse phases such as loading
+        self.queue_high_water = 0
+        self.run_seconds = 0.0
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        if name not in self.latencies:
+            self.latencies[name] = LatencyHistogram()
+        return self.latencies[name]
+
+    def wrap(self, handler, name: str = None):
+        """Returns handler wrapped so each call is timed into the histogram `name`."""
+        record = self.histogram(name or handler_name(handler)).record
+        clock = time.perf_counter_ns
+
+        def timed(*args):
+            start = clock()
+            result = handler(*args)
+            record(clock() - start)
+            return result
+
+        return timed
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times a coarse phase, e.g. `with profiler.phase("load"): ...`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def to_dict(self) -> dict:
+        return {
+            "run_seconds": self.run_seconds,
+            "phases": dict(self.phases),
+            "event_counts": dict(self.event_counts),
+            "queue_high_water": self.queue_high_water,
+            "handlers": {
+                name: {
+                    "calls": h.count,
+                    "total_ms": h.total_ns / 1e6,
+                    "mean_us": h.mean_ns / 1e3,
+                    "p50_us": h.percentile(50) / 1e3,
+                    "p99_us": h.percentile(99) / 1e3,
+                    "max_us": h.max_ns / 1e3,
+                }
+                for name, h in self.latencies.items()
+            },
+        }
+
+    def export_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self) -> str:
+        stats = self.to_dict()
+        lines = ["\n--- Profiling Report ---"]
+        for name, seconds in stats["phases"].items():
+            lines.append(f"Phase {name}: {seconds:.3f}s")
+        lines.append(f"Event loop:  {stats['run_seconds']:.3f}s")
+        counts = ", ".join(f"{k} {v:,}" for k, v in stats["event_counts"].items())
+        lines.append(f"Events:      {counts}")
+        lines.append(f"Queue high-water mark: {stats['queue_high_water']:,}")
+        lines.append(
+            f"{'handler':<46}{'calls':>10}{'total ms':>11}{'mean us':>9}"
+            f"{'p50 us':>9}{'p99 us':>9}{'max us':>10}"
+        )
+        by_total = sorted(
+            stats["handlers"].items(), key=lambda kv: kv[1]["total_ms"], reverse=True
+        )
+        for name, h in by_total:
+            lines.append(
+                f"{name:<46}{h['calls']:>10,}{h['total_ms']:>11.1f}{h['mean_us']:>9.2f}"
+                f"{h['p50_us']:>9.2f}{h['p99_us']:>9.2f}{h['max_us']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def print_report(self):
+        print(self.report())
@@ -0,0 +1,258 @@
+# backtester/ledger.py
+"""
+Append-only columnar ledger of fills.
+
+Portfolio records every FillEvent into a FillLedger. Each fill becomes one row of
+typed arrays, not a dict. The arrays grow by doubling, like EquityRecorder, so
+recording a fill is amortized O(1).
+
+round_trips() rebuilds closed trades from the ledger by FIFO lot matching, and
+trade_stats() summarises them with array operations. A ledger can be saved to
+.npz (numpy only) or .parquet (needs pyarrow) and loaded back, so the fills of a
+long run or a whole sweep can be analysed later without re-running it.
+"""
+
+import numpy as np
+
+
+class FillLedger:
+    """
+    One row per fill: timestamp, symbol id, order id, signed quantity (+ buy,
+    - sell), fill price, commission, and the symbol's position and the portfolio's
+    cash after the fill.
+    """
+
+    COLUMNS = {
+        "timestamps": "datetime64[ns]",
+        "symbol_ids": np.int32,
+        "order_ids": np.int64,
+        "quantity": np.int64,
+        "price": np.float64,
+        "commission": np.float64,
+        "position": np.int64,
+        "cash": np.float64,
+    }
+
+    def __init__(self, symbol_list: list, capacity: int = 256):
+        self.symbol_list = list(symbol_list)
+        self.size = 0
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.empty(capacity, dtype=dtype))
+
+    def _grow(self):
+        capacity = 2 * len(self.timestamps)
+        for name in self.COLUMNS:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+
+    def record(self, fill_event, sid: int, position: int, cash: float):
+        if self.size == len(self.timestamps):
+            self._grow()
+        i = self.size
+        quantity = fill_event.quantity
+        self.timestamps[i] = fill_event.timestamp
+        self.symbol_ids[i] = sid
+        self.order_ids[i] = fill_event.order_id or 0
+        self.quantity[i] = quantity if fill_event.direction == "BUY" else -quantity
+        self.price[i] = fill_event.fill_price
+        self.commission[i] = fill_event.commission
+        self.position[i] = position
+        self.cash[i] = cash
+        self.size = i + 1
+
+    def __len__(self):
+        return self.size
+
+    def columns(self) -> dict:
+        """name -> array view of the recorded rows (not copies)."""
+        return {name: getattr(self, name)[: self.size] for name in self.COLUMNS}
+
+    def get_state(self) -> dict:
+        state = {name: column.copy() for name, column in self.columns().items()}
+        state["symbol_list"] = list(self.symbol_list)
+        return state
+
+    def set_state(self, state: dict):
+        n = len(state["timestamps"])
+        capacity = max(len(self.timestamps), n, 1)
+        for name, dtype in self.COLUMNS.items():
+            column = np.empty(capacity, dtype=dtype)
+            column[:n] = state[name]
+            setattr(self, name, column)
+        self.symbol_list = list(state["symbol_list"])
+        self.size = n
+
+    def to_dataframe(self):
+        import pandas as pd
+
+        columns = self.columns()
+        symbols = np.asarray(self.symbol_list, dtype=object)
+        frame = pd.DataFrame(
+            {name: column.copy() for name, column in columns.items()}
+        ).rename(columns={"timestamps": "timestamp", "order_ids": "order_id"})
+        frame.insert(1, "symbol", symbols[columns["symbol_ids"]])
+        return frame.drop(columns="symbol_ids")
+
+    def save(self, path: str):
+        """Writes the ledger to path: .parquet via pyarrow, anything else as .npz."""
+        columns = self.columns()
+        if str(path).endswith(".parquet"):
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Saving a ledger as Parquet requires pyarrow")
+            table = pa.table(
+                columns, metadata={"symbol_list": "\n".join(self.symbol_list)}
+            )
+            pq.write_table(table, path)
+        else:
+            np.savez_compressed(
+                path, symbol_list=np.asarray(self.symbol_list), **columns
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "FillLedger":
+        ledger = cls([])
+        if str(path).endswith(".parquet"):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Loading a Parquet ledger requires pyarrow")
+            table = pq.read_table(path)
+            metadata = table.schema.metadata or {}
+            symbol_list = metadata.get(b"symbol_list", b"").decode()
+            state = {name: table.column(name).to_numpy() for name in cls.COLUMNS}
+            state["symbol_list"] = symbol_list.split("\n") if symbol_list else []
+        else:
+            with np.load(path) as data:
+                state = {name: data[name] for name in cls.COLUMNS}
+                state["symbol_list"] = data["symbol_list"].tolist()
+        ledger.set_state(state)
+        return ledger
+
+    def round_trips(self) -> dict:
+        return round_trips(self.columns())
+
+    def trade_stats(self, initial_capital: float = None) -> dict:
+        return trade_stats(self.round_trips(), self.columns(), initial_capital)
+
+
+TRADE_COLUMNS = (
+    "symbol_ids",
+    "side",  # +1 long, -1 short
+    "quantity",
+    "entry_time",
+    "exit_time",
+    "entry_price",
+    "exit_price",
+    "commission",
+    "pnl",  # Net of the commission share of both legs
+)
+
+
+def round_trips(columns: dict) -> dict:
+    """
+    Closed trades matched FIFO from ledger columns, as a dict of arrays
+    (TRADE_COLUMNS), ordered by symbol and then by exit.
+
+    Every fill is split into the part that reduces the open position and the part
+    that opens or extends one, so a fill that flips the position closes the old side
+    and opens the new one. Per symbol, the cumulative opened and closed quantities
+    then line up lot for lot. Each stretch between consecutive breakpoints of the
+    two cumulative sums is one matched piece, found with searchsorted. A piece's
+    commission is each leg's per-share commission times its quantity. Shares still
+    open at the end are not trades yet and are left out.
+    """
+    quantity = columns["quantity"]
+    position = columns["position"]
+    before = position - quantity
+    size = np.abs(quantity)
+    # Shares of each fill that close existing exposure, and shares that open new
+    closing = (before != 0) & (np.sign(quantity) != np.sign(before))
+    close_qty = np.where(closing, np.minimum(size, np.abs(before)), 0)
+    open_qty = size - close_qty
+    with np.errstate(invalid="ignore", divide="ignore"):
+        commission_per_share = np.where(size > 0, columns["commission"] / size, 0.0)
+
+    pieces = []
+    symbol_ids = columns["symbol_ids"]
+    for sid in np.unique(symbol_ids).tolist():
+        rows = np.flatnonzero(symbol_ids == sid)
+        opens = rows[open_qty[rows] > 0]
+        closes = rows[close_qty[rows] > 0]
+        if not len(closes):
+            continue
+        opened = np.cumsum(open_qty[opens])
+        closed = np.cumsum(close_qty[closes])
+        # Every closed share was opened earlier, so closed[-1] <= opened[-1]
+        ends = np.union1d(opened[opened <= closed[-1]], closed)
+        starts = np.concatenate(([0], ends[:-1]))
+        entry = opens[np.searchsorted(opened, starts, side="right")]
+        exit = closes[np.searchsorted(closed, starts, side="right")]
+        pieces.append(
+            (np.full(len(ends), sid, dtype=np.int32), entry, exit, ends - starts)
+        )
+
+    if not pieces:
+        trades = {name: np.empty(0) for name in TRADE_COLUMNS}
+        trades["symbol_ids"] = np.empty(0, dtype=np.int32)
+        trades["entry_time"] = np.empty(0, dtype="datetime64[ns]")
+        trades["exit_time"] = np.empty(0, dtype="datetime64[ns]")
+        return trades
+
+    sids, entry, exit, matched = (np.concatenate(parts) for parts in zip(*pieces))
+    side = np.sign(quantity[entry])
+    price = columns["price"]
+    commission = matched * (commission_per_share[entry] + commission_per_share[exit])
+    return {
+        "symbol_ids": sids,
+        "side": side,
+        "quantity": matched,
+        "entry_time": columns["timestamps"][entry],
+        "exit_time": columns["timestamps"][exit],
+        "entry_price": price[entry],
+        "exit_price": price[exit],
+        "commission": commission,
+        "pnl": side * matched * (price[exit] - price[entry]) - commission,
+    }
+
+
+def trade_stats(trades: dict, columns: dict = None, initial_capital=None) -> dict:
+    """
+    Vectorized statistics over round_trips() output. Win rate, average win/loss,
+    profit factor and expectancy use net PnL per trade; profit factor is inf when
+    there are wins but no losses. Holding periods are in days. With the ledger
+    columns, it also reports total commission and traded notional. With
+    initial_capital as well, it adds turnover (notional / capital) and commission
+    drag (commission / capital).
+    """
+    pnl = trades["pnl"]
+    n = len(pnl)
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+    held = (trades["exit_time"] - trades["entry_time"]) / np.timedelta64(1, "D")
+    gross_loss = -losses.sum()
+    stats = {
+        "n_trades": n,
+        "win_rate": len(wins) / n if n else 0.0,
+        "avg_win": wins.mean() if len(wins) else 0.0,
+        "avg_loss": losses.mean() if len(losses) else 0.0,
+        "profit_factor": (
+            wins.sum() / gross_loss if gross_loss else np.inf if len(wins) else 0.0
+        ),
+        "expectancy": pnl.mean() if n else 0.0,
+        "net_pnl": pnl.sum(),
+        "avg_holding_days": held.mean() if n else 0.0,
+        "max_holding_days": held.max() if n else 0.0,
+    }
+    if columns is not None:
+        notional = np.abs(columns["quantity"] * columns["price"]).sum()
+        stats["total_commission"] = columns["commission"].sum()
+        stats["traded_notional"] = notional
+        if initial_capital:
+            stats["turnover"] = notional / initial_capital
+            stats["commission_drag"] = stats["total_commission"] / initial_capital
+    return {name: float(value) for name, value in stats.items()}
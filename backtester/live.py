@@ -0,0 +1,255 @@
+# backtester/live.py
+"""
+Asyncio engine mode for streaming sources.
+
+The Strategy, Portfolio and ExecutionHandler components run unchanged. What
+changes is where bars come from and how the loop waits:
+- ReplayServer replays BarStores batch by batch onto a bounded asyncio.Queue,
+  either as fast as possible or paced to the bars' timestamps at a given speed.
+  The queue is bounded, so a slow consumer blocks the server instead of letting
+  batches pile up in memory (backpressure).
+- AsyncDataHandler consumes batches from such a queue (or from any producer that
+  puts lists of MarketEvents on it, followed by None).
+- AsyncExecutionHandler is the SimulatedExecutionHandler matching engine behind
+  simulated network latency: orders reach the book ack_latency seconds after they
+  are sent, and fills come back fill_latency seconds after they happen.
+- AsyncBacktestEngine drives the loop and measures tick-to-order latency, from
+  the moment a batch is published to the moment each order it caused is handed to
+  the execution handler.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+from .data import ColumnarDataHandler, DataHandler
+from .engine import BacktestEngine
+from .event import EventType
+from .execution import SimulatedExecutionHandler
+from .instrumentation import LatencyHistogram
+
+
+class ReplayServer:
+    """
+    Publishes bar_stores onto self.queue one timestamp batch at a time.
+
+    Each item is (published perf_counter_ns, [MarketEvent, ...]) and a final None
+    ends the stream. speed=None replays as fast as the consumer keeps up; speed=1.0
+    replays in real time and speed=60.0 sixty times faster, sleeping between batches
+    according to the gaps between their timestamps.
+    """
+
+    def __init__(
+        self,
+        bar_stores: dict,
+        symbol_list: list = None,
+        speed: float = None,
+        queue_size: int = 256,
+    ):
+        self.speed = speed
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self._events = deque()
+        self._source = ColumnarDataHandler(self._events, bar_stores, symbol_list)
+        self.symbol_list = self._source.symbol_list
+        self.batches_sent = 0
+        self.blocked_seconds = 0.0  # Time spent waiting on a full queue
+
+    async def serve(self):
+        source, events, queue = self._source, self._events, self.queue
+        clock = time.perf_counter
+        start_wall = start_ts = None
+        while source.update_bars():
+            batch = list(events)
+            events.clear()
+            if self.speed:
+                ts = int(np.datetime64(source.batch_timestamp, "ns").astype(np.int64))
+                if start_wall is None:
+                    start_wall, start_ts = clock(), ts
+                delay = start_wall + (ts - start_ts) / 1e9 / self.speed - clock()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if queue.full():
+                blocked = clock()
+                await queue.put((time.perf_counter_ns(), batch))
+                self.blocked_seconds += clock() - blocked
+            else:
+                queue.put_nowait((time.perf_counter_ns(), batch))
+            self.batches_sent += 1
+        await queue.put(None)
+
+
+class AsyncDataHandler(DataHandler):
+    """
+    DataHandler fed from an asyncio.Queue of (published ns, [MarketEvent, ...])
+    items terminated by None. get_latest_bar() returns the symbol's latest
+    MarketEvent, which supports the same bar["close"] access as a BarView.
+    """
+
+    def __init__(self, events_queue: deque, feed: asyncio.Queue, symbol_list: list):
+        super().__init__(events_queue, symbol_list)
+        self.feed = feed
+        self.latest_symbol_data = {}
+        self.batch_timestamp = None
+        self.batch_symbols = []
+        self.batch_published_ns = 0  # When the current batch left its producer
+        self.feed_lag = LatencyHistogram()  # Publish -> receive, in ns
+
+    def get_latest_bar(self, symbol: str):
+        return self.latest_symbol_data.get(symbol)
+
+    def update_bars(self) -> bool:
+        raise NotImplementedError("AsyncDataHandler is driven by next_batch()")
+
+    async def next_batch(self) -> bool:
+        """Waits for the next batch and queues its events. False at end of stream."""
+        item = await self.feed.get()
+        if item is None:
+            return False
+        self.batch_published_ns, batch = item
+        self.feed_lag.record(time.perf_counter_ns() - self.batch_published_ns)
+        latest = self.latest_symbol_data
+        for market_event in batch:
+            latest[market_event.symbol] = market_event
+        self.events_queue.extend(batch)
+        if batch:
+            batch[-1].last_in_batch = True
+            self.batch_timestamp = batch[-1].timestamp
+        self.batch_symbols = [market_event.symbol for market_event in batch]
+        return True
+
+
+class AsyncExecutionHandler(SimulatedExecutionHandler):
+    """
+    SimulatedExecutionHandler behind simulated exchange latency (in seconds).
+    Orders enter the book ack_latency after execute_order(), so they only fill on
+    bars that arrive after that; FillEvents reach the events queue fill_latency after
+    the bar that filled them. Must be used inside a running event loop.
+    """
+
+    def __init__(
+        self,
+        events_queue: deque,
+        commission_per_share=0.001,
+        slippage_pct=0.0005,
+        max_participation: float = None,
+        ack_latency: float = 0.0,
+        fill_latency: float = 0.0,
+    ):
+        # The matching engine writes fills to a private queue; they are delivered
+        # to the engine's queue after fill_latency
+        super().__init__(deque(), commission_per_share, slippage_pct, max_participation)
+        self.out_queue = events_queue
+        self.ack_latency = ack_latency
+        self.fill_latency = fill_latency
+        self.acked = 0
+        self._in_flight = 0  # Orders and fills still "on the wire"
+
+    def execute_order(self, order_event, data_handler):
+        # Rejected here, in the caller's stack, not later inside the event loop
+        self._validate(order_event)
+        if not self.ack_latency:
+            self._ack(order_event)
+            return
+        self._in_flight += 1
+        asyncio.get_running_loop().call_later(
+            self.ack_latency, self._ack, order_event, True
+        )
+
+    def _ack(self, order_event, delayed=False):
+        if delayed:
+            self._in_flight -= 1
+        SimulatedExecutionHandler.execute_order(self, order_event, None)
+        self.acked += 1
+
+    def on_market(self, market_event):
+        super().on_market(market_event)
+        fills = self.events_queue
+        if not fills:
+            return
+        if not self.fill_latency:
+            self.out_queue.extend(fills)
+        else:
+            self._in_flight += 1
+            asyncio.get_running_loop().call_later(
+                self.fill_latency, self._deliver, list(fills)
+            )
+        fills.clear()
+
+    def _deliver(self, fills):
+        self._in_flight -= 1
+        self.out_queue.extend(fills)
+
+    async def drain(self):
+        """Waits until every delayed ack and fill has landed."""
+        while self._in_flight:
+            await asyncio.sleep(
+                min(self.ack_latency or 1e-3, self.fill_latency or 1e-3)
+            )
+
+
+class AsyncBacktestEngine(BacktestEngine):
+    """
+    BacktestEngine for an AsyncDataHandler. Uses the same wiring and dispatch table;
+    the loop awaits each batch instead of calling update_bars(), and
+    tick_to_order records, in ns, the time from a batch's publication to each
+    resulting order reaching the execution handler.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tick_to_order = LatencyHistogram()
+
+    def run(self, feed: ReplayServer = None) -> int:
+        return asyncio.run(self.run_async(feed))
+
+    async def run_async(self, feed: ReplayServer = None) -> int:
+        """Runs until the feed ends; feed, if given, is served concurrently."""
+        server = asyncio.create_task(feed.serve()) if feed is not None else None
+        dispatch = self.build_dispatch_table()
+        events_queue = self.events_queue
+        popleft = events_queue.popleft
+        next_batch = self.data_handler.next_batch
+        record_latency = self.tick_to_order.record
+        clock = time.perf_counter_ns
+        order = EventType.ORDER
+        n_events = 0
+
+        def drain():
+            nonlocal n_events
+            while events_queue:
+                event = popleft()
+                event_type = event.type
+                if event_type is order:
+                    record_latency(clock() - self.data_handler.batch_published_ns)
+                for handler in dispatch[event_type]:
+                    handler(event)
+                n_events += 1
+
+        while await next_batch():
+            drain()
+            await asyncio.sleep(0)  # Let the server and delayed acks/fills run
+        if isinstance(self.execution_handler, AsyncExecutionHandler):
+            await self.execution_handler.drain()
+        drain()
+        if server is not None:
+            await server
+
+        self.events_processed += n_events
+        return n_events
+
+    def latency_report(self) -> str:
+        h = self.tick_to_order
+        lines = [
+            f"Tick-to-order: {h.count:,} orders, mean {h.mean_ns / 1e3:.1f}us, "
+            f"p50 {h.percentile(50) / 1e3:.1f}us, p99 {h.percentile(99) / 1e3:.1f}us, "
+            f"max {h.max_ns / 1e3:.1f}us"
+        ]
+        lag = getattr(self.data_handler, "feed_lag", None)
+        if lag is not None and lag.count:
+            lines.append(
+                f"Feed lag:      p50 {lag.percentile(50) / 1e3:.1f}us, "
+                f"p99 {lag.percentile(99) / 1e3:.1f}us"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,197 @@
+# backtester/metrics.py
+"""
+Online performance metrics.
+
+OnlineMetrics is fed one equity sample at a time, e.g. by
+Portfolio(metrics=OnlineMetrics(...)). It keeps O(1) running state: Welford
+mean/variance of returns, downside deviation, running peak, drawdown depth and
+duration, and time in the market. Every metric can be read mid-run in O(1).
+
+The conventions match backtester/performance.py. Returns are simple returns between
+consecutive samples. Standard deviations are population (ddof=0) values, and
+drawdowns are measured from the highest equity seen so far.
+"""
+
+import math
+
+
+class OnlineMetrics:
+    """Running Sharpe, Sortino, drawdown, Calmar and exposure of an equity stream."""
+
+    def __init__(
+        self, initial_capital: float, periods_per_year=252, risk_free_rate_annual=0.0
+    ):
+        self.initial_capital = initial_capital
+        self.periods_per_year = periods_per_year
+        self.rf_per_period = risk_free_rate_annual / periods_per_year
+
+        self.n_samples = 0
+        self.last_timestamp = None
+        self.equity = initial_capital
+
+        # Welford accumulators over per-period returns
+        self.n_returns = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside_sq = 0.0  # Sum of squared below-target excess returns
+
+        # Drawdown state
+        self.peak = None
+        self.peak_timestamp = None
+        self._peak_sample = 0
+        self.max_drawdown = 0.0
+        self.max_drawdown_peak = None  # Timestamps bracketing the deepest drawdown
+        self.max_drawdown_trough = None
+        self.max_drawdown_duration = 0  # Longest stretch below a peak, in samples
+
+        # Exposure
+        self._invested_samples = 0
+        self._gross_exposure_sum = 0.0
+
+    def update(self, timestamp, total_equity: float, holdings_value: float = 0.0):
+        """Adds one equity sample. O(1)."""
+        n = self.n_samples
+        if n:
+            previous = self.equity
+            r = total_equity / previous - 1.0 if previous else 0.0
+            self.n_returns += 1
+            delta = r - self._mean
+            self._mean += delta / self.n_returns
+            self._m2 += delta * (r - self._mean)
+            shortfall = r - self.rf_per_period
+            if shortfall < 0.0:
+                self._downside_sq += shortfall * shortfall
+
+        if self.peak is None or total_equity >= self.peak:
+            self.peak = total_equity
+            self.peak_timestamp = timestamp
+            self._peak_sample = n
+        else:
+            drawdown = (self.peak - total_equity) / self.peak
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+                self.max_drawdown_peak = self.peak_timestamp
+                self.max_drawdown_trough = timestamp
+            duration = n - self._peak_sample
+            if duration > self.max_drawdown_duration:
+                self.max_drawdown_duration = duration
+
+        if holdings_value:
+            self._invested_samples += 1
+            if total_equity:
+                self._gross_exposure_sum += abs(holdings_value) / total_equity
+        self.equity = total_equity
+        self.last_timestamp = timestamp
+        self.n_samples = n + 1
+
+    @property
+    def total_return(self) -> float:
+        return self.equity / self.initial_capital - 1.0
+
+    @property
+    def volatility(self) -> float:
+        """Annualized standard deviation of returns."""
+        if self.n_returns < 2:
+            return 0.0
+        return math.sqrt(self._m2 / self.n_returns * self.periods_per_year)
+
+    @property
+    def sharpe(self) -> float:
+        if self.n_returns < 2 or self._m2 <= 0.0:
+            return 0.0
+        std = math.sqrt(self._m2 / self.n_returns)
+        return (
+            (self._mean - self.rf_per_period) / std * math.sqrt(self.periods_per_year)
+        )
+
+    @property
+    def downside_deviation(self) -> float:
+        """Per-period root mean square of returns below the risk-free rate."""
+        if not self.n_returns:
+            return 0.0
+        return math.sqrt(self._downside_sq / self.n_returns)
+
+    @property
+    def sortino(self) -> float:
+        downside = self.downside_deviation
+        if self.n_returns < 2 or downside == 0.0:
+            return 0.0
+        excess = self._mean - self.rf_per_period
+        return excess / downside * math.sqrt(self.periods_per_year)
+
+    @property
+    def annualized_return(self) -> float:
+        if not self.n_samples or self.equity <= 0.0:
+            return 0.0
+        growth = self.equity / self.initial_capital
+        return growth ** (self.periods_per_year / self.n_samples) - 1.0
+
+    @property
+    def calmar(self) -> float:
+        if self.max_drawdown == 0.0:
+            return 0.0
+        return self.annualized_return / self.max_drawdown
+
+    @property
+    def current_drawdown(self) -> float:
+        if not self.peak:
+            return 0.0
+        return (self.peak - self.equity) / self.peak
+
+    @property
+    def current_drawdown_duration(self) -> int:
+        """Samples since the last equity peak."""
+        return self.n_samples - 1 - self._peak_sample if self.n_samples else 0
+
+    @property
+    def exposure(self) -> float:
+        """Fraction of samples with an open position."""
+        return self._invested_samples / self.n_samples if self.n_samples else 0.0
+
+    @property
+    def avg_gross_exposure(self) -> float:
+        """Mean |holdings value| / equity over all samples."""
+        return self._gross_exposure_sum / self.n_samples if self.n_samples else 0.0
+
+    def summary(self) -> dict:
+        return {
+            name: float(value)
+            for name, value in {
+                "final_equity": self.equity,
+                "total_return": self.total_return,
+                "annualized_return": self.annualized_return,
+                "volatility": self.volatility,
+                "sharpe": self.sharpe,
+                "sortino": self.sortino,
+                "max_drawdown": self.max_drawdown,
+                "max_drawdown_duration": self.max_drawdown_duration,
+                "calmar": self.calmar,
+                "exposure": self.exposure,
+                "avg_gross_exposure": self.avg_gross_exposure,
+            }.items()
+        }
+
+    def report(self) -> str:
+        lines = [
+            "\n--- Performance Summary ---",
+            f"Initial Capital: ${self.initial_capital:,.2f}",
+            f"Final Equity:    ${self.equity:,.2f}",
+            f"Total Return:    {self.total_return:.2%}",
+            f"Annual Return:   {self.annualized_return:.2%}",
+            f"Volatility:      {self.volatility:.2%}",
+            f"Sharpe Ratio:    {self.sharpe:.2f}",
+            f"Sortino Ratio:   {self.sortino:.2f}",
+            f"Max Drawdown:    {self.max_drawdown:.2%}",
+            f"DD Duration:     {self.max_drawdown_duration} periods",
+            f"Calmar Ratio:    {self.calmar:.2f}",
+            f"Exposure:        {self.exposure:.2%}",
+        ]
+        if self.max_drawdown_peak is not None:
+            lines.insert(
+                9,
+                f"Max DD Window:   {self.max_drawdown_peak} -> {self.max_drawdown_trough}",
+            )
+        return "\n".join(lines)
+
+    def print_summary(self):
+        print(self.report())
@@ -1,6 +1,10 @@
 # backtester/performance.py
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
+
+if TYPE_CHECKING:  # pandas is only imported by the functions that build Series
+    import pandas as pd
 
 
 def calculate_sharpe_ratio(
@@ -17,9 +21,11 @@ def calculate_sharpe_ratio(
     return (mean_excess_return / std_dev_excess_return) * np.sqrt(periods_per_year)
 
 
-def calculate_max_drawdown(equity_curve_series: pd.Series):
+def calculate_max_drawdown(equity_curve_series: "pd.Series"):
     """Calculates Max Drawdown from an equity curve pandas Series."""
     if equity_curve_series.empty:
+        import pandas as pd
+
         return 0.0, pd.Series(dtype=float)
     cumulative_max = equity_curve_series.cummax()
     drawdown = (equity_curve_series - cumulative_max) / cumulative_max
@@ -30,12 +36,37 @@ def calculate_max_drawdown(equity_curve_series: pd.Series):
     )  # Return absolute value for easier interpretation
 
 
-def display_performance_summary(equity_curve: pd.DataFrame, initial_capital: float):
+def summarize_equity(
+    equity, initial_capital: float, periods_per_year=252, risk_free_rate_annual=0.0
+) -> dict:
+    """
+    Compact summary of an equity curve (array or Series): total return, Sharpe ratio
+    and max drawdown, as reported by display_performance_summary.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if len(equity) < 2:
+        return {"total_return": 0.0, "sharpe": 0.0, "max_drawdown": 0.0}
+    returns = equity[1:] / equity[:-1] - 1.0
+    cumulative_max = np.maximum.accumulate(equity)
+    return {
+        "total_return": float(equity[-1] / initial_capital - 1.0),
+        "sharpe": float(
+            calculate_sharpe_ratio(returns, periods_per_year, risk_free_rate_annual)
+        ),
+        "max_drawdown": float(-((equity - cumulative_max) / cumulative_max).min()),
+    }
+
+
+def display_performance_summary(
+    equity_curve: "pd.DataFrame", initial_capital: float, plot: bool = True
+):
+    """Prints the summary; plot=False stays headless and never imports matplotlib."""
     if equity_curve.empty or len(equity_curve) < 2:
         print("Not enough data to calculate performance.")
         return
 
-    equity_curve.set_index("timestamp", inplace=True)
+    if "timestamp" in equity_curve.columns:
+        equity_curve = equity_curve.set_index("timestamp")
     total_return = (equity_curve["total_equity"].iloc[-1] / initial_capital) - 1.0
     daily_returns = equity_curve["total_equity"].pct_change().dropna()
 
@@ -48,24 +79,191 @@ def display_performance_summary(equity_curve: pd.DataFrame, initial_capital: flo
     print(f"Total Return:    {total_return:.2%}")
     print(f"Sharpe Ratio:    {sharpe:.2f}")
     print(f"Max Drawdown:    {max_dd:.2%}")
-    # Add more metrics: Sortino, Calmar, Win Rate, Avg Win/Loss etc. later
+    # Sortino, Calmar and exposure: see backtester/metrics.py (OnlineMetrics)
 
-    # Plotting (can be in utils.py)
-    import matplotlib.pyplot as plt
+    if plot:
+        from .utils import plot_equity_curve
 
-    fig, (ax1, ax2) = plt.subplots(
-        2, 1, sharex=True, figsize=(12, 8), gridspec_kw={"height_ratios": [3, 1]}
-    )
-    equity_curve["total_equity"].plot(
-        ax=ax1, title="Equity Curve", legend=True, ylabel="Portfolio Value"
+        plot_equity_curve(equity_curve["total_equity"], dd_series)
+
+
+# --- Monte Carlo robustness analysis ---
+#
+# Resampled paths are columns of one 2-D array (periods x paths), so every statistic
+# is a single column-wise NumPy reduction. Work is split into chunks of chunk_size
+# paths, which bounds memory (10 years of daily data x 2,000 paths is ~40 MB) and
+# lets large runs fan out over a process pool. Each chunk draws from its own
+# SeedSequence child, so results depend on seed and chunk_size but not on n_workers.
+
+
+def path_statistics(
+    growth: np.ndarray, periods_per_year=252, risk_free_rate_annual=0.0
+) -> dict:
+    """
+    Per-column Sharpe ratio, max drawdown and terminal growth of a
+    (periods x paths) array of cumulative growth factors (equity / initial).
+    Same conventions as calculate_sharpe_ratio and calculate_max_drawdown; the
+    starting value 1.0 counts as the first peak.
+    """
+    previous = np.empty_like(growth)
+    previous[0] = 1.0
+    previous[1:] = growth[:-1]
+    returns = growth / previous - 1.0
+    excess = returns - risk_free_rate_annual / periods_per_year
+    mean, std = excess.mean(axis=0), excess.std(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(periods_per_year), 0.0)
+    peak = np.maximum(np.maximum.accumulate(growth, axis=0), 1.0)
+    max_drawdown = ((peak - growth) / peak).max(axis=0)
+    return {"sharpe": sharpe, "max_drawdown": max_drawdown, "terminal": growth[-1]}
+
+
+def block_bootstrap_growth(returns, n_paths: int, block_size=20, rng=None):
+    """
+    Circular block bootstrap: each path strings together randomly placed blocks of
+    block_size consecutive returns (wrapping at the end), which keeps short-range
+    autocorrelation and volatility clustering. Returns (len(returns) x n_paths)
+    growth factors.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    rng = rng if rng is not None else np.random.default_rng()
+    n = len(returns)
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_blocks, 1, n_paths))
+    offsets = np.arange(block_size).reshape(1, block_size, 1)
+    index = (starts + offsets).reshape(n_blocks * block_size, n_paths)[:n]
+    index %= n
+    return np.cumprod(1.0 + returns[index], axis=0)
+
+
+def trade_shuffle_growth(
+    trade_pnl, initial_capital: float, n_paths: int, replace=False, rng=None
+):
+    """
+    Trade-order Monte Carlo: each path replays the trades' PnL in a random order
+    (replace=True: draws trades with replacement, so the terminal equity varies
+    too). Returns (n_trades x n_paths) growth factors.
+    """
+    trade_pnl = np.asarray(trade_pnl, dtype=np.float64)
+    rng = rng if rng is not None else np.random.default_rng()
+    n = len(trade_pnl)
+    if replace:
+        index = rng.integers(0, n, size=(n, n_paths))
+    else:
+        index = rng.random((n, n_paths)).argsort(axis=0)
+    equity = np.cumsum(trade_pnl[index], axis=0)
+    equity += initial_capital
+    return equity / initial_capital
+
+
+def _monte_carlo_chunk(kind, data, n_paths, seed, options, periods_per_year, rf):
+    rng = np.random.default_rng(seed)
+    if kind == "bootstrap":
+        growth = block_bootstrap_growth(data, n_paths, rng=rng, **options)
+    else:
+        growth = trade_shuffle_growth(data, n_paths=n_paths, rng=rng, **options)
+    return path_statistics(growth, periods_per_year, rf)
+
+
+def _run_monte_carlo(
+    kind, data, n_paths, seed, chunk_size, n_workers, options, periods_per_year, rf
+) -> dict:
+    sizes = [min(chunk_size, n_paths - i) for i in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [
+        (kind, data, size, s, options, periods_per_year, rf)
+        for size, s in zip(sizes, seeds)
+    ]
+    if (n_workers is None or n_workers > 1) and len(args) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            chunks = list(executor.map(_monte_carlo_chunk, *zip(*args)))
+    else:
+        chunks = [_monte_carlo_chunk(*a) for a in args]
+    return {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]}
+
+
+def monte_carlo_returns(
+    returns,
+    n_paths=10_000,
+    block_size=20,
+    seed=None,
+    chunk_size=2_000,
+    n_workers=1,
+    periods_per_year=252,
+    risk_free_rate_annual=0.0,
+) -> dict:
+    """
+    Block-bootstrap Monte Carlo of a per-period return series. Returns arrays of
+    n_paths Sharpe ratios, max drawdowns and terminal growth factors (final equity /
+    initial). n_workers > 1 (None: one per CPU) spreads the chunks over a process
+    pool; n_workers=1 runs them in this process.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if len(returns) < 2:
+        raise ValueError("Need at least two returns to resample")
+    return _run_monte_carlo(
+        "bootstrap",
+        returns,
+        n_paths,
+        seed,
+        chunk_size,
+        n_workers,
+        {"block_size": block_size},
+        periods_per_year,
+        risk_free_rate_annual,
     )
-    ax1.grid(True)
 
-    dd_series.plot(
-        ax=ax2, title="Drawdown Curve", legend=True, color="red", ylabel="Drawdown"
+
+def monte_carlo_trades(
+    trade_pnl,
+    initial_capital: float,
+    n_paths=10_000,
+    replace=False,
+    seed=None,
+    chunk_size=2_000,
+    n_workers=1,
+) -> dict:
+    """
+    Trade-shuffle Monte Carlo of per-trade PnL, e.g. round_trips()["pnl"] from
+    backtester/ledger.py. Same outputs as monte_carlo_returns. Sharpe is per trade
+    (not annualized); with replace=False every path ends at the same equity, and
+    the drawdown distribution is the point.
+    """
+    trade_pnl = np.asarray(trade_pnl, dtype=np.float64)
+    if len(trade_pnl) < 2:
+        raise ValueError("Need at least two trades to shuffle")
+    return _run_monte_carlo(
+        "shuffle",
+        trade_pnl,
+        n_paths,
+        seed,
+        chunk_size,
+        n_workers,
+        {"initial_capital": initial_capital, "replace": replace},
+        1,
+        0.0,
     )
-    ax2.fill_between(dd_series.index, dd_series, 0, color="red", alpha=0.3)
-    ax2.grid(True)
 
-    plt.tight_layout()
-    plt.show()
+
+def confidence_intervals(distributions: dict, confidence=0.95) -> dict:
+    """name -> (lower, median, upper) percentiles of each Monte Carlo distribution."""
+    tail = (1.0 - confidence) / 2 * 100
+    return {
+        name: tuple(float(q) for q in np.percentile(values, [tail, 50, 100 - tail]))
+        for name, values in distributions.items()
+    }
+
+
+def display_monte_carlo_summary(distributions: dict, confidence=0.95):
+    intervals = confidence_intervals(distributions, confidence)
+    n_paths = len(next(iter(distributions.values())))
+    print(f"\n--- Monte Carlo ({n_paths:,} paths, {confidence:.0%} interval) ---")
+    lo, mid, hi = intervals["sharpe"]
+    print(f"Sharpe Ratio:    {mid:.2f}  [{lo:.2f}, {hi:.2f}]")
+    lo, mid, hi = intervals["max_drawdown"]
+    print(f"Max Drawdown:    {mid:.2%}  [{lo:.2%}, {hi:.2%}]")
+    lo, mid, hi = (q - 1.0 for q in intervals["terminal"])
+    print(f"Total Return:    {mid:.2%}  [{lo:.2%}, {hi:.2%}]")
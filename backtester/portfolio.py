@@ -1,7 +1,147 @@
 # backtester/portfolio.py
-import pandas as pd
-from .event import OrderEvent, FillEvent
+from typing import TYPE_CHECKING
+
+import numpy as np
+from .event import OrderEvent, FillEvent, RebalanceEvent, SignalEvent
+from .ledger import FillLedger
 from collections import deque
+from collections.abc import Mapping
+
+if TYPE_CHECKING:  # pandas is only imported when a DataFrame is requested
+    import pandas as pd
+
+
+class SymbolView(Mapping):
+    """
+    Read-only symbol -> value mapping over one of Portfolio's per-symbol arrays.
+    It reads the live array, so it never goes stale. Writing to it raises instead
+    of silently changing a copy: positions and holdings only change through fills
+    and revaluation, which keep the running totals consistent.
+    """
+
+    __slots__ = ("_portfolio", "_name")
+
+    def __init__(self, portfolio, name: str):
+        self._portfolio = portfolio
+        self._name = name  # Array attribute, looked up per access (set_state swaps it)
+
+    def __getitem__(self, symbol):
+        portfolio = self._portfolio
+        return getattr(portfolio, self._name)[portfolio.symbol_ids[symbol]].item()
+
+    def __iter__(self):
+        return iter(self._portfolio.symbol_list)
+
+    def __len__(self):
+        return len(self._portfolio.symbol_list)
+
+    def __setitem__(self, symbol, value):
+        raise TypeError(f"Portfolio.current_{self._name} is read-only")
+
+    def __delitem__(self, symbol):
+        raise TypeError(f"Portfolio.current_{self._name} is read-only")
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class EquityRecorder:
+    """
+    Array-backed equity curve recorder.
+    Columns grow by doubling, so appends are amortized O(1); the DataFrame is only
+    built when to_dataframe() is called.
+    """
+
+    COLUMNS = ("total_equity", "cash", "holdings_value")
+
+    def __init__(self, capacity: int = 1024, every: int = 1):
+        self.every = every  # Keep one sample in every `every` (1 = keep all)
+        self.size = 0
+        self.timestamps = np.empty(capacity, dtype="datetime64[ns]")
+        self.total_equity = np.empty(capacity, dtype=np.float64)
+        self.cash = np.empty(capacity, dtype=np.float64)
+        self.holdings_value = np.empty(capacity, dtype=np.float64)
+        self._n_samples = 0
+        self._pending = None  # Latest skipped sample, so the final equity is never lost
+
+    def _grow(self):
+        capacity = 2 * len(self.timestamps)
+        for name in ("timestamps",) + self.COLUMNS:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+
+    def record(self, timestamp, total_equity, cash, holdings_value):
+        n = self._n_samples
+        self._n_samples = n + 1
+        if n % self.every:
+            self._pending = (timestamp, total_equity, cash, holdings_value)
+            return
+        self._pending = None
+        self._append(timestamp, total_equity, cash, holdings_value)
+
+    def _append(self, timestamp, total_equity, cash, holdings_value):
+        if self.size == len(self.timestamps):
+            self._grow()
+        i = self.size
+        self.timestamps[i] = timestamp
+        self.total_equity[i] = total_equity
+        self.cash[i] = cash
+        self.holdings_value[i] = holdings_value
+        self.size = i + 1
+
+    def __len__(self):
+        return self.size + (self._pending is not None)
+
+    def get_state(self) -> dict:
+        n = self.size
+        state = {
+            name: getattr(self, name)[:n].copy()
+            for name in ("timestamps",) + self.COLUMNS
+        }
+        state.update(every=self.every, n_samples=self._n_samples, pending=self._pending)
+        return state
+
+    def set_state(self, state: dict):
+        n = len(state["timestamps"])
+        capacity = max(len(self.timestamps), n)
+        for name in ("timestamps",) + self.COLUMNS:
+            column = np.empty(capacity, dtype=getattr(self, name).dtype)
+            column[:n] = state[name]
+            setattr(self, name, column)
+        self.size = n
+        self.every = state["every"]
+        self._n_samples = state["n_samples"]
+        self._pending = state["pending"]
+
+    def finish(self):
+        """Appends the pending sample; called once, at the end of a run."""
+        if self._pending is not None:
+            self._append(*self._pending)
+            self._pending = None
+
+    def column(self, name: str = "total_equity", latest=None) -> np.ndarray:
+        """
+        Recorded values of one column, without pandas and without changing what
+        is recorded, so it is safe mid-run. The pending sample (or `latest`, a
+        (timestamp, total_equity, cash, holdings_value) sample not recorded yet)
+        is appended to a copy; otherwise this is a view.
+        """
+        values = getattr(self, name)[: self.size]
+        latest = latest if latest is not None else self._pending
+        if latest is None:
+            return values
+        field = (("timestamps",) + self.COLUMNS).index(name)
+        return np.append(values, np.array(latest[field], dtype=values.dtype))
+
+    def to_dataframe(self, latest=None) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.DataFrame(
+            {name: self.column(name, latest).copy() for name in self.COLUMNS},
+            index=pd.Index(self.column("timestamps", latest).copy(), name="timestamp"),
+        )
 
 
 class Portfolio:
@@ -11,6 +151,9 @@ class Portfolio:
         data_handler,
         initial_capital=100000.0,
         symbol_list: list = None,
+        record_on_batch: bool = True,
+        record_every: int = 1,
+        metrics=None,
     ):
         self.events_queue = events_queue
         self.data_handler = data_handler
@@ -18,63 +161,72 @@ class Portfolio:
         self.initial_capital = initial_capital
         self.current_cash = initial_capital
 
-        self.current_positions = {s: 0 for s in self.symbol_list}  # Quantity of shares
-        self.current_holdings_value = {
-            s: 0.0 for s in self.symbol_list
-        }  # Market value of shares
-        self.total_market_value = 0.0  # Sum of all holdings_value + cash
-
-        # For PnL tracking and equity curve
-        self.all_positions = []  # List of position dicts at each timestamp
-        self.all_holdings = []  # List of holdings dicts at each timestamp
-        self.equity_curve = pd.DataFrame(
-            columns=["timestamp", "total_equity", "cash", "holdings_value"]
-        )
+        # Per-symbol state lives in arrays indexed by symbol id, so a bar only
+        # touches its own symbol and portfolio-wide marks are vectorized
+        self.symbol_ids = {s: i for i, s in enumerate(self.symbol_list)}
+        n = len(self.symbol_list)
+        self.positions = np.zeros(n, dtype=np.int64)  # Quantity of shares
+        self._n_open = 0  # Nonzero positions, kept by update_fill
+        self.holdings_value = np.zeros(n)  # Market value of shares
+        self.last_price = np.full(n, np.nan)  # Latest close seen per symbol
+        self.total_holdings_value = 0.0  # Running sum of holdings_value
+        self.total_market_value = initial_capital  # total_holdings_value + cash
+        # Signed quantity of this portfolio's orders not yet filled, so rebalance()
+        # does not order the same shares twice while earlier orders are in flight
+        self.pending = np.zeros(n, dtype=np.int64)
+        self._pending_orders = {}  # order_id -> [symbol id, signed unfilled quantity]
+
+        # For PnL tracking: every fill, with the position and cash it left behind
+        # (see backtester/ledger.py for round trips and trade statistics)
+        self.ledger = FillLedger(self.symbol_list)
+        # record_on_batch: one equity sample per timestamp batch instead of per MarketEvent
+        # record_every: additionally downsample to every Nth sample
+        self.record_on_batch = record_on_batch
+        self.equity_recorder = EquityRecorder(every=record_every)
+        # Timestamp of a sample that is due but not yet recorded. Samples are taken
+        # once the rest of the batch (including fills it triggered) has been processed.
+        self._snapshot_due = None
+        # Optional backtester.metrics.OnlineMetrics, fed every equity sample
+        self.metrics = metrics
 
     def update_timeindex(self, market_event):
         """
         Updates the portfolio's holdings value based on the latest market data.
         This is called at each 'heartbeat' of the backtest.
         """
-        timestamp = (
-            market_event.timestamp
-        )  # Assuming all symbols get a market event for a given timestamp in a batch
-        # Or, if processing symbol by symbol, this needs careful handling
-
-        # Update holdings value for each symbol
-        current_total_holdings_value = 0.0
-        for symbol in self.symbol_list:
-            if self.current_positions[symbol] != 0:
-                latest_bar = self.data_handler.get_latest_bar(symbol)
-                if latest_bar:
-                    self.current_holdings_value[symbol] = (
-                        self.current_positions[symbol] * latest_bar["close"]
-                    )
-                # else: market data not available, use last known value or handle
-            else:
-                self.current_holdings_value[symbol] = 0.0
-            current_total_holdings_value += self.current_holdings_value[symbol]
-
-        self.total_market_value = self.current_cash + current_total_holdings_value
-
-        # Record equity
-        new_equity_row = pd.DataFrame(
-            [
-                {
-                    "timestamp": timestamp,
-                    "total_equity": self.total_market_value,
-                    "cash": self.current_cash,
-                    "holdings_value": current_total_holdings_value,
-                }
-            ]
-        )
-        self.equity_curve = pd.concat(
-            [self.equity_curve, new_equity_row], ignore_index=True
-        )
+        timestamp = market_event.timestamp  # Shared by every bar in the batch
+        if self._snapshot_due is not None:
+            self._record_snapshot()  # Previous batch is fully processed
+
+        # Only this bar's symbol changes value: O(1) per event instead of O(N)
+        sid = self.symbol_ids.get(market_event.symbol)
+        if sid is not None:
+            price = market_event.close
+            self.last_price[sid] = price
+            quantity = self.positions[sid]
+            if quantity:
+                value = quantity * price
+                self.total_holdings_value += value - self.holdings_value[sid]
+                self.holdings_value[sid] = value
 
-        # Store snapshots (optional, can make equity_curve large)
-        # self.all_positions.append(self.current_positions.copy())
-        # self.all_holdings.append(self.current_holdings_value.copy())
+        # Record equity once the batch's remaining events have been processed
+        if market_event.last_in_batch or not self.record_on_batch:
+            self._snapshot_due = timestamp
+
+    def _record_snapshot(self):
+        holdings_value = self.total_holdings_value
+        self.total_market_value = self.current_cash + holdings_value
+        self.equity_recorder.record(
+            self._snapshot_due,
+            self.total_market_value,
+            self.current_cash,
+            holdings_value,
+        )
+        if self.metrics is not None:
+            self.metrics.update(
+                self._snapshot_due, self.total_market_value, holdings_value
+            )
+        self._snapshot_due = None
 
     def update_signal(self, signal_event: SignalEvent):
         """Acts on a SignalEvent to generate OrderEvents."""
@@ -87,16 +239,49 @@ class Portfolio:
         target_quantity = 100  # Example fixed quantity
         order_type = "MKT"
 
-        current_quantity = self.current_positions[symbol]
+        current_quantity = self.positions[self.symbol_ids[symbol]]
 
         if direction == "LONG" and current_quantity == 0:
             order = OrderEvent(timestamp, symbol, order_type, target_quantity, "BUY")
-            self.events_queue.append(order)
+            self._send_order(order, self.symbol_ids[symbol], target_quantity)
         elif direction == "EXIT" and current_quantity > 0:  # Exit long position
             order = OrderEvent(timestamp, symbol, order_type, current_quantity, "SELL")
-            self.events_queue.append(order)
+            self._send_order(order, self.symbol_ids[symbol], -current_quantity)
         # Add SHORT logic if desired
 
+    def _send_order(self, order: OrderEvent, sid: int, signed_quantity: int):
+        self.pending[sid] += signed_quantity
+        self._pending_orders[order.order_id] = [sid, signed_quantity]
+        self.events_queue.append(order)
+
+    def rebalance(self, rebalance_event: RebalanceEvent):
+        """
+        Moves every symbol to its target weight in one vectorized step: target
+        shares = weight * equity / latest close (truncated toward zero), less what
+        is held or already on order. Symbols with a NaN weight or no price yet are
+        left alone. Emits one MKT OrderEvent per symbol that needs to trade.
+        """
+        weights = np.asarray(rebalance_event.weights, dtype=np.float64)
+        if len(weights) != len(self.symbol_list):
+            raise ValueError(
+                f"Got {len(weights)} weights for {len(self.symbol_list)} symbols"
+            )
+        equity = self.current_cash + self.total_holdings_value
+        price = self.last_price
+        with np.errstate(invalid="ignore"):
+            tradable = ~np.isnan(weights) & (price > 0)
+        target = np.zeros(len(weights), dtype=np.int64)
+        target[tradable] = np.trunc(weights[tradable] * equity / price[tradable])
+        delta = np.where(tradable, target - self.positions - self.pending, 0)
+
+        timestamp = rebalance_event.timestamp
+        symbols = self.symbol_list
+        for sid in np.flatnonzero(delta).tolist():
+            quantity = int(delta[sid])
+            direction = "BUY" if quantity > 0 else "SELL"
+            order = OrderEvent(timestamp, symbols[sid], "MKT", abs(quantity), direction)
+            self._send_order(order, sid, quantity)
+
     def update_fill(self, fill_event: FillEvent):
         """Updates portfolio state based on a FillEvent."""
         symbol = fill_event.symbol
@@ -106,23 +291,122 @@ class Portfolio:
 
         self.current_cash -= fill_cost  # fill_cost includes commission and sign
 
-        if fill_event.direction == "BUY":
-            self.current_positions[symbol] += fill_event.quantity
-        elif fill_event.direction == "SELL":
-            self.current_positions[symbol] -= fill_event.quantity
+        sid = self.symbol_ids[symbol]
+        signed_quantity = (
+            fill_event.quantity
+            if fill_event.direction == "BUY"
+            else -fill_event.quantity
+        )
+        was_open = self.positions[sid] != 0
+        self.positions[sid] += signed_quantity
+        if was_open != (self.positions[sid] != 0):  # Opened or closed out
+            self._n_open += -1 if was_open else 1
+        entry = self._pending_orders.get(fill_event.order_id)
+        if entry is not None:  # One of our orders (possibly a partial fill)
+            self.pending[sid] -= signed_quantity
+            entry[1] -= signed_quantity
+            if not entry[1]:
+                del self._pending_orders[fill_event.order_id]
+        self.ledger.record(fill_event, sid, self.positions[sid], self.current_cash)
 
-        # Update holdings value immediately after fill (or wait for next market tick)
-        latest_bar = self.data_handler.get_latest_bar(symbol)
-        if latest_bar:
-            self.current_holdings_value[symbol] = (
-                self.current_positions[symbol] * latest_bar["close"]
-            )
-        else:  # If no current bar (e.g. EOD fill), use fill_price as an estimate
-            self.current_holdings_value[symbol] = (
-                self.current_positions[symbol] * fill_event.fill_price
-            )
+        # Revalue at the latest close; with no bar yet, use the fill price as estimate
+        price = self.last_price[sid]
+        if price != price:  # NaN
+            price = fill_event.fill_price
+        value = self.positions[sid] * price
+        self.total_holdings_value += value - self.holdings_value[sid]
+        self.holdings_value[sid] = value
+        if not self._n_open:
+            self.total_holdings_value = 0.0  # Flat: drop accumulated rounding
+
+    def mark_to_market(self, prices=None):
+        """
+        Revalues every position in one vectorized pass at `prices` (an array in
+        symbol_list order; default: the latest closes) and resets the running total,
+        discarding any rounding it accumulated.
+        """
+        if prices is not None:
+            self.last_price[:] = prices
+        self.holdings_value = np.where(
+            self.positions != 0, self.positions * self.last_price, 0.0
+        )
+        self.total_holdings_value = float(self.holdings_value.sum())
+        self.total_market_value = self.current_cash + self.total_holdings_value
+        return self.total_market_value
+
+    @property
+    def current_positions(self) -> "SymbolView":
+        """Live read-only view of positions by symbol; they change only via fills."""
+        return SymbolView(self, "positions")
+
+    @property
+    def current_holdings_value(self) -> "SymbolView":
+        """Live read-only view of holdings value by symbol."""
+        return SymbolView(self, "holdings_value")
+
+    def get_state(self) -> dict:
+        """Cash, positions, valuation and the recorded equity, for checkpoints."""
+        return {
+            "symbol_list": list(self.symbol_list),
+            "current_cash": self.current_cash,
+            "positions": self.positions.copy(),
+            "holdings_value": self.holdings_value.copy(),
+            "last_price": self.last_price.copy(),
+            "total_holdings_value": self.total_holdings_value,
+            "total_market_value": self.total_market_value,
+            "pending": self.pending.copy(),
+            "pending_orders": {k: list(v) for k, v in self._pending_orders.items()},
+            "snapshot_due": self._snapshot_due,
+            "equity": self.equity_recorder.get_state(),
+            "ledger": self.ledger.get_state(),
+            "metrics": self.metrics,
+        }
+
+    def set_state(self, state: dict):
+        if state["symbol_list"] != list(self.symbol_list):
+            raise ValueError("Checkpoint was taken with a different symbol_list")
+        self.current_cash = state["current_cash"]
+        self.positions = state["positions"].copy()
+        self._n_open = int(np.count_nonzero(self.positions))
+        self.holdings_value = state["holdings_value"].copy()
+        self.last_price = state["last_price"].copy()
+        self.total_holdings_value = state["total_holdings_value"]
+        self.total_market_value = state["total_market_value"]
+        self.pending = state["pending"].copy()
+        self._pending_orders = {k: list(v) for k, v in state["pending_orders"].items()}
+        self._snapshot_due = state["snapshot_due"]
+        self.equity_recorder.set_state(state["equity"])
+        self.ledger.set_state(state["ledger"])
+        if self.metrics is not None and state["metrics"] is not None:
+            vars(self.metrics).update(vars(state["metrics"]))  # Keep callers' reference
+        else:
+            self.metrics = state["metrics"]
+
+    def finish(self):
+        """
+        Records the equity sample still due at the end of a run, if any, and the
+        recorder's pending one. The accessors below never change what is recorded,
+        so they can be called mid-run.
+        """
+        if self._snapshot_due is not None:
+            self._record_snapshot()
+        self.equity_recorder.finish()
+
+    def _due_sample(self):
+        if self._snapshot_due is None:
+            return None
+        holdings_value = self.total_holdings_value
+        cash = self.current_cash
+        return (self._snapshot_due, cash + holdings_value, cash, holdings_value)
+
+    def get_equity_curve(self) -> "pd.DataFrame":
+        """Returns the recorded equity curve as a DataFrame indexed by timestamp."""
+        return self.equity_recorder.to_dataframe(self._due_sample())
+
+    def total_equity(self) -> np.ndarray:
+        """Recorded total equity as an array; get_equity_curve() without pandas."""
+        return self.equity_recorder.column("total_equity", self._due_sample())
 
-    def get_equity_curve(self):
-        if not self.equity_curve.empty:
-            self.equity_curve.set_index("timestamp", inplace=True)
-        return self.equity_curve
+    def trade_stats(self) -> dict:
+        """Round-trip trade statistics from the fill ledger."""
+        return self.ledger.trade_stats(self.initial_capital)
@@ -0,0 +1,394 @@
+# backtester/resample.py
+"""
+Higher-timeframe bars (5-minute, hourly, daily...) built from a base feed.
+
+Two interchangeable sources of BarEvents, subscribed to MARKET events with
+BacktestEngine(..., aggregator=...). Strategies receive the bars in
+Strategy.on_bar():
+- BarAggregator builds the bars incrementally, one base bar at a time.
+- ResampledBarFeed replays bars that resample_stores() computed up front with
+  vectorized reduceat passes over the columnar data, so a multi-timeframe run does
+  no per-bar aggregation work. It emits the same events as BarAggregator, at the
+  same points; only VWAPs may differ in the last bits, since reduceat sums in a
+  different order.
+
+Bucketing is session-aware. With session_start (e.g. "09:30"), intraday buckets
+are aligned to the session open rather than to midnight, so hourly bars run
+09:30-10:30 and so on. With session_end (e.g. "16:00"), the last bucket is cut
+at the close and base bars outside the session are ignored. Timeframes of a day
+or more group whole sessions.
+
+A bar is emitted once it is known to be complete. That happens on the first base
+bar of a later bucket or, with base_period (the base bars' duration, e.g.
+"1min"), on the base bar that ends exactly at the bucket's end. The event
+timestamp is the bucket's end, and each bar's VWAP uses the typical price
+(high + low + close) / 3.
+"""
+
+import re
+
+import numpy as np
+
+from .bars import BarStore
+from .event import BarEvent
+
+DAY_NS = 86_400 * 10**9
+NEVER = np.iinfo(np.int64).max
+_UNITS = {"s": 10**9, "min": 60 * 10**9, "h": 3600 * 10**9, "d": DAY_NS}
+_NS = np.dtype("datetime64[ns]")
+
+
+def _timestamp_ns(timestamp) -> int:
+    # .item() of a datetime64[ns] scalar is its int ns, and much cheaper than astype
+    if getattr(timestamp, "dtype", None) == _NS:
+        return timestamp.item()
+    return int(np.datetime64(timestamp, "ns").astype(np.int64))
+
+
+def _duration_ns(value) -> int:
+    """'5min', '1h', '2d', '30s', '09:30' (time of day) or a timedelta -> ns."""
+    if isinstance(value, str):
+        text = value.strip().lower()
+        match = re.fullmatch(r"(\d+)\s*(s|min|h|d)", text)
+        if match:
+            return int(match.group(1)) * _UNITS[match.group(2)]
+        match = re.fullmatch(r"(\d{1,2}):(\d{2})", text)
+        if match:
+            return (int(match.group(1)) * 60 + int(match.group(2))) * _UNITS["min"]
+        raise ValueError(f"Cannot parse duration {value!r}")
+    return int(np.timedelta64(value, "ns").astype(np.int64))
+
+
+class Timeframe:
+    """Maps int64 ns timestamps (scalars or arrays) to bucket start and end times."""
+
+    def __init__(self, timeframe, session_start=None, session_end=None):
+        self.label = timeframe if isinstance(timeframe, str) else str(timeframe)
+        self.ns = _duration_ns(timeframe)
+        if self.ns <= 0:
+            raise ValueError(f"Timeframe must be positive, got {timeframe!r}")
+        self.session_start = _duration_ns(session_start) if session_start else 0
+        # Session length; sessions that end past midnight wrap to the next day
+        self.session_length = DAY_NS
+        if session_end is not None:
+            length = _duration_ns(session_end) - self.session_start
+            self.session_length = length if length > 0 else length + DAY_NS
+
+    def in_session(self, t):
+        return (t - self.session_start) % DAY_NS < self.session_length
+
+    def bucket_start(self, t):
+        shifted = t - self.session_start
+        if self.ns >= DAY_NS:
+            return shifted // self.ns * self.ns + self.session_start
+        day = shifted // DAY_NS * DAY_NS
+        return day + (shifted - day) // self.ns * self.ns + self.session_start
+
+    def bucket_end(self, start):
+        if self.ns >= DAY_NS:  # Ends at the close of the bucket's last session
+            return start + self.ns - DAY_NS + self.session_length
+        session = (start - self.session_start) // DAY_NS * DAY_NS + self.session_start
+        return np.minimum(start + self.ns, session + self.session_length)
+
+
+class _PartialBars:
+    """
+    The bar being built for every symbol, for one timeframe. Plain lists: the
+    aggregator only ever touches one symbol's slot at a time, and scalar access
+    to lists is several times cheaper than to NumPy arrays.
+    """
+
+    FIELDS = ("start", "end", "open", "high", "low", "close", "volume", "pv", "n_bars")
+
+    def __init__(self, n: int):
+        self.start = [-1] * n  # -1: no bar in progress
+        self.end = [-1] * n  # Bucket end of the bar in progress
+        self.open = [0.0] * n
+        self.high = [0.0] * n
+        self.low = [0.0] * n
+        self.close = [0.0] * n
+        self.volume = [0] * n
+        self.pv = [0.0] * n  # Sum of typical price * volume
+        self.n_bars = [0] * n
+
+
+def _vwap(pv, volume, close):
+    return pv / volume if volume else close
+
+
+class BarAggregator:
+    """
+    Streaming aggregation of MarketEvents into BarEvents for each timeframe in
+    timeframes. O(len(timeframes)) per base bar. flush() emits the bars still in
+    progress, e.g. at the end of the data.
+    """
+
+    def __init__(
+        self,
+        events_queue,
+        symbol_list: list,
+        timeframes,
+        session_start=None,
+        session_end=None,
+        base_period=None,
+    ):
+        self.events_queue = events_queue
+        self.symbol_list = list(symbol_list)
+        self.symbol_ids = {s: i for i, s in enumerate(self.symbol_list)}
+        self.timeframes = [
+            Timeframe(tf, session_start, session_end) for tf in timeframes
+        ]
+        self.base_period = _duration_ns(base_period) if base_period else None
+        self.partial = [_PartialBars(len(self.symbol_list)) for _ in self.timeframes]
+        self.bars_emitted = 0
+
+    def on_market(self, market_event):
+        sid = self.symbol_ids.get(market_event.symbol)
+        if sid is None:
+            return
+        t = _timestamp_ns(market_event.timestamp)
+        high, low, close = market_event.high, market_event.low, market_event.close
+        volume = market_event.volume
+        pv = (high + low + close) / 3.0 * volume
+        base_period = self.base_period
+        for timeframe, bars in zip(self.timeframes, self.partial):
+            end = bars.end[sid]
+            if t < end:  # Still inside the bar in progress (time only moves forward)
+                if high > bars.high[sid]:
+                    bars.high[sid] = high
+                if low < bars.low[sid]:
+                    bars.low[sid] = low
+                bars.volume[sid] += volume
+                bars.pv[sid] += pv
+                bars.n_bars[sid] += 1
+            else:
+                if not timeframe.in_session(t):
+                    continue
+                if end >= 0:
+                    self._emit(timeframe, bars, sid)
+                start = timeframe.bucket_start(t)
+                end = int(timeframe.bucket_end(start))
+                bars.start[sid] = start
+                bars.end[sid] = end
+                bars.open[sid] = market_event.open
+                bars.high[sid] = high
+                bars.low[sid] = low
+                bars.volume[sid] = volume
+                bars.pv[sid] = pv
+                bars.n_bars[sid] = 1
+            bars.close[sid] = close
+            if base_period and t + base_period >= end:
+                self._emit(timeframe, bars, sid)
+
+    def _emit(self, timeframe, bars, sid):
+        close = bars.close[sid]
+        volume = bars.volume[sid]
+        self.events_queue.append(
+            BarEvent(
+                np.datetime64(bars.end[sid], "ns"),
+                self.symbol_list[sid],
+                timeframe.label,
+                np.datetime64(bars.start[sid], "ns"),
+                bars.open[sid],
+                bars.high[sid],
+                bars.low[sid],
+                close,
+                volume,
+                _vwap(bars.pv[sid], volume, close),
+                bars.n_bars[sid],
+            )
+        )
+        bars.start[sid] = bars.end[sid] = -1
+        self.bars_emitted += 1
+
+    def flush(self):
+        """Emits every bar in progress, complete or not."""
+        for timeframe, bars in zip(self.timeframes, self.partial):
+            for sid, start in enumerate(bars.start):
+                if start >= 0:
+                    self._emit(timeframe, bars, sid)
+
+    def get_state(self) -> dict:
+        return {
+            "symbol_list": list(self.symbol_list),
+            "partial": [
+                {name: list(getattr(bars, name)) for name in _PartialBars.FIELDS}
+                for bars in self.partial
+            ],
+            "bars_emitted": self.bars_emitted,
+        }
+
+    def set_state(self, state: dict):
+        if state["symbol_list"] != self.symbol_list:
+            raise ValueError("Checkpoint was taken with a different symbol_list")
+        for bars, fields in zip(self.partial, state["partial"]):
+            for name, column in fields.items():
+                setattr(bars, name, list(column))
+        self.bars_emitted = state["bars_emitted"]
+
+
+class ResampledBars(BarStore):
+    """
+    A BarStore of higher-timeframe bars (timestamps are bar ends), plus each bar's
+    start, VWAP, base bar count, and emit_times: the base bar timestamp at which a
+    streaming BarAggregator would emit it (NEVER for a final, incomplete bar).
+    """
+
+    __slots__ = ("timeframe", "starts", "vwap", "n_bars", "emit_times")
+
+
+def _reduceat(ufunc, values, first):
+    return ufunc.reduceat(values, first) if len(first) else values[:0]
+
+
+def resample_store(
+    store: BarStore, timeframe, session_start=None, session_end=None, base_period=None
+) -> ResampledBars:
+    """
+    Aggregates one symbol's BarStore with a few vectorized reduceat passes.
+    timeframe is a label such as "5min" or a Timeframe (whose session is used).
+    """
+    tf = timeframe
+    if not isinstance(tf, Timeframe):
+        tf = Timeframe(timeframe, session_start, session_end)
+    rows = np.flatnonzero(tf.in_session(store.timestamps))
+    t = store.timestamps[rows]
+    starts = tf.bucket_start(t)
+    # First and last row of each bucket
+    first = np.flatnonzero(np.diff(starts, prepend=starts[:1] - 1) != 0)
+    last = np.append(first[1:], len(rows))[: len(first)] - 1
+    high, low, close = store.high[rows], store.low[rows], store.close[rows]
+    volume = store.volume[rows]
+
+    bar_volume = _reduceat(np.add, volume, first)
+    pv = _reduceat(np.add, (high + low + close) / 3.0 * volume, first)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = np.where(bar_volume != 0, pv / bar_volume, close[last])
+    ends = tf.bucket_end(starts[first])
+
+    # When BarAggregator would emit each bar: on the first base bar of the next
+    # bucket, or on its own last bar if base_period shows that bar ends the bucket
+    emit_times = np.append(t[first[1:]], NEVER)[: len(first)]
+    if base_period:
+        complete = t[last] + _duration_ns(base_period) >= ends
+        emit_times = np.where(complete, t[last], emit_times)
+
+    bars = ResampledBars(
+        ends,
+        store.open[rows][first],
+        _reduceat(np.maximum, high, first),
+        _reduceat(np.minimum, low, first),
+        close[last],
+        store.adj_close[rows][last],
+        bar_volume,
+    )
+    bars.timeframe = tf.label
+    bars.starts = starts[first]
+    bars.vwap = vwap
+    bars.n_bars = np.diff(np.append(first, len(rows)))
+    bars.emit_times = emit_times
+    return bars
+
+
+def resample_stores(
+    bar_stores: dict,
+    timeframes,
+    session_start=None,
+    session_end=None,
+    base_period=None,
+) -> dict:
+    """{timeframe label: {symbol: ResampledBars}} for every store and timeframe."""
+    resampled = {}
+    for timeframe in timeframes:
+        tf = Timeframe(timeframe, session_start, session_end)
+        resampled[tf.label] = {
+            symbol: resample_store(store, tf, base_period=base_period)
+            for symbol, store in bar_stores.items()
+        }
+    return resampled
+
+
+class ResampledBarFeed:
+    """
+    Emits precomputed resample_stores() bars as BarEvents at the same points in
+    the base feed where BarAggregator would emit them. Per base bar and
+    timeframe, the only work is an integer comparison against the next pending
+    bar's emit time. The base feed must replay the same BarStores the bars were
+    computed from.
+    """
+
+    def __init__(self, events_queue, symbol_list: list, resampled: dict):
+        self.events_queue = events_queue
+        self.symbol_list = list(symbol_list)
+        self.symbol_ids = {s: i for i, s in enumerate(self.symbol_list)}
+        self.resampled = resampled
+        # Per timeframe: each symbol's bars (None if absent), index of its next bar
+        # to emit, and that bar's emit time as a Python int
+        self._bars = [
+            [stores.get(symbol) for symbol in self.symbol_list]
+            for stores in resampled.values()
+        ]
+        self.cursors = [[0] * len(self.symbol_list) for _ in self._bars]
+        self._next_emit = [[NEVER] * len(self.symbol_list) for _ in self._bars]
+        self._sync_next_emit()
+        self.bars_emitted = 0
+
+    def _sync_next_emit(self):
+        for per_symbol, cursors, next_emit in zip(
+            self._bars, self.cursors, self._next_emit
+        ):
+            for sid, bars in enumerate(per_symbol):
+                i = cursors[sid]
+                if bars is not None and i < len(bars):
+                    next_emit[sid] = int(bars.emit_times[i])
+                else:
+                    next_emit[sid] = NEVER
+
+    def on_market(self, market_event):
+        sid = self.symbol_ids.get(market_event.symbol)
+        if sid is None:
+            return
+        t = _timestamp_ns(market_event.timestamp)
+        for per_symbol, cursors, next_emit in zip(
+            self._bars, self.cursors, self._next_emit
+        ):
+            if t < next_emit[sid]:
+                continue
+            bars = per_symbol[sid]
+            i = cursors[sid]
+            # One base bar can finish two bars: the one it closes and, with
+            # base_period, its own bucket (a session-cut bucket, or after a gap)
+            while t >= next_emit[sid]:
+                self.events_queue.append(
+                    BarEvent(
+                        bars.index[i],
+                        market_event.symbol,
+                        bars.timeframe,
+                        np.datetime64(int(bars.starts[i]), "ns"),
+                        bars.open[i],
+                        bars.high[i],
+                        bars.low[i],
+                        bars.close[i],
+                        bars.volume[i],
+                        bars.vwap[i],
+                        int(bars.n_bars[i]),
+                    )
+                )
+                i += 1
+                next_emit[sid] = int(bars.emit_times[i]) if i < len(bars) else NEVER
+                self.bars_emitted += 1
+            cursors[sid] = i
+
+    def get_state(self) -> dict:
+        return {
+            "symbol_list": list(self.symbol_list),
+            "cursors": [list(cursors) for cursors in self.cursors],
+            "bars_emitted": self.bars_emitted,
+        }
+
+    def set_state(self, state: dict):
+        if state["symbol_list"] != self.symbol_list:
+            raise ValueError("Checkpoint was taken with a different symbol_list")
+        self.cursors = [list(cursors) for cursors in state["cursors"]]
+        self._sync_next_emit()
+        self.bars_emitted = state["bars_emitted"]
@@ -1,7 +1,12 @@
 # backtester/strategy.py
-from .event import SignalEvent
+import numpy as np
+from .data import CrossSection
+from .event import RebalanceEvent, SignalEvent
 from collections import deque  # For events_queue
 
+# Whole-array signal codes returned by Strategy.compute_signals()
+LONG, EXIT = 1, -1
+
 
 class Strategy:
     """Abstract base class for trading strategies."""
@@ -15,3 +20,121 @@ class Strategy:
     def calculate_signals(self, market_event) -> None:
         """Processes a MarketEvent and may generate SignalEvents."""
         raise NotImplementedError("Should implement calculate_signals()")
+
+    def on_bar(self, bar_event) -> None:
+        """Receives higher-timeframe BarEvents when the engine has an aggregator."""
+
+    def compute_signals(self, bars) -> np.ndarray:
+        """
+        Optional vectorized fast path (see backtester/vectorized.py).
+        Given one symbol's BarStore, returns an int8 array with LONG, EXIT or 0 per bar:
+        exactly the SignalEvents calculate_signals() would emit bar by bar.
+        """
+        raise NotImplementedError("Vectorized runs need compute_signals()")
+
+    def sync_positions(self, positions: dict):
+        """
+        Aligns the strategy's signal memory with positions (symbol -> quantity) it
+        did not build itself, such as those a walk-forward run carries across a
+        parameter switch. The default handles the `signals` dict of the long-only
+        strategies: held symbols become "LONG", so the next EXIT goes out, and flat
+        ones "EXIT", so the next LONG does. Override it for other signal state.
+        """
+        signals = getattr(self, "signals", None)
+        for symbol, quantity in positions.items():
+            if symbol in self.bought:
+                self.bought[symbol] = quantity > 0
+            if signals is not None and symbol in signals:
+                signals[symbol] = "LONG" if quantity > 0 else "EXIT"
+
+    # Attributes wired in at construction rather than accumulated during a run
+    _NOT_STATE = ("events_queue", "data_handler")
+
+    def get_state(self) -> dict:
+        """
+        Everything the strategy has accumulated (indicator buffers, last signals...),
+        for checkpoints. The default captures every attribute except the wiring, so
+        subclasses only override it to exclude something unpicklable.
+        """
+        return {k: v for k, v in vars(self).items() if k not in self._NOT_STATE}
+
+    def set_state(self, state: dict):
+        vars(self).update(state)
+
+
+class CrossSectionalStrategy(Strategy):
+    """
+    Base class for strategies that look at the whole universe at once (ranking,
+    momentum, pairs...).
+
+    Instead of reacting to each MarketEvent, subclasses implement
+    rebalance(cross_section). It is called once per timestamp batch, on the batch's
+    last MarketEvent, with a CrossSection holding every symbol's latest bar as
+    arrays in symbol_list order. It returns a target weight per symbol (fraction of
+    equity, NaN = leave as is), or None for no change. The weights go out as a
+    RebalanceEvent, which Portfolio.rebalance() turns into orders in one vectorized
+    step. Per-event strategies keep working alongside it.
+
+    With a ColumnarDataHandler over the same symbol_list, the data handler fills the
+    arrays with one vectorized scatter per batch. Otherwise they are filled here,
+    event by event.
+    """
+
+    def __init__(self, events_queue: deque, data_handler, symbol_list: list):
+        super().__init__(events_queue, data_handler, symbol_list)
+        self.symbol_ids = {s: i for i, s in enumerate(symbol_list)}
+        shared = getattr(data_handler, "cross_section", None)
+        self._fill_arrays = not (
+            shared is not None and list(data_handler.symbol_list) == list(symbol_list)
+        )
+        self.cross_section = (
+            CrossSection(symbol_list) if self._fill_arrays else shared()
+        )
+
+    def calculate_signals(self, market_event) -> None:
+        cs = self.cross_section
+        if self._fill_arrays:
+            sid = self.symbol_ids.get(market_event.symbol)
+            if sid is not None:
+                cs.open[sid] = market_event.open
+                cs.high[sid] = market_event.high
+                cs.low[sid] = market_event.low
+                cs.close[sid] = market_event.close
+                cs.volume[sid] = market_event.volume
+                cs.updated[sid] = True
+        if not market_event.last_in_batch:
+            return
+        cs.timestamp = market_event.timestamp
+        weights = self.rebalance(cs)
+        if self._fill_arrays:
+            cs.updated[:] = False
+        if weights is not None:
+            self.events_queue.append(
+                RebalanceEvent(
+                    market_event.timestamp, np.asarray(weights, dtype=np.float64)
+                )
+            )
+
+    def rebalance(self, cross_section: CrossSection):
+        """Returns target weights (array in symbol_list order) or None."""
+        raise NotImplementedError("Should implement rebalance()")
+
+    def get_state(self) -> dict:
+        state = super().get_state()
+        if not self._fill_arrays:
+            del state["cross_section"]  # The data handler's; it restores it itself
+        return state
+
+
+def dedupe_signals(raw: np.ndarray) -> np.ndarray:
+    """
+    Drops signals that repeat the previously emitted one, mirroring the
+    `self.signals[symbol] != current_signal` check used by the event-driven strategies.
+    """
+    raw = np.asarray(raw, dtype=np.int8)
+    idx = np.flatnonzero(raw)
+    keep = np.ones(len(idx), dtype=bool)
+    keep[1:] = raw[idx[1:]] != raw[idx[:-1]]
+    out = np.zeros_like(raw)
+    out[idx[keep]] = raw[idx[keep]]
+    return out
@@ -0,0 +1,244 @@
+# backtester/sweep.py
+"""
+Parallel parameter sweeps.
+
+Market data is loaded once in the parent and packed into a single
+multiprocessing.shared_memory block; worker processes attach to it and rebuild
+BarStores as zero-copy views. Each worker runs a chunk of parameter sets and sends
+back only compact summaries (total return, Sharpe, max drawdown). Event-driven
+chunks run as one MultiStackEngine pass, so a worker decodes the data once per
+chunk rather than once per parameter set.
+"""
+
+import itertools
+import math
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .bars import BarStore, slice_stores
+from .cache import COLUMNS
+from .data import ColumnarDataHandler, HistoricCSVDataHandler
+from .engine import MultiStackEngine
+from .performance import summarize_equity
+from .vectorized import event_driven_portfolio, vectorized_equity
+
+
+class SharedBarData:
+    """
+    BarStores packed into one shared memory block.
+    `spec` is a small picklable description other processes pass to attach().
+    """
+
+    def __init__(self, bar_stores: dict):
+        layout = []
+        offset = 0
+        for symbol, store in bar_stores.items():
+            layout.append((symbol, len(store), offset))
+            offset += len(store) * 8 * len(COLUMNS)  # All columns are 8-byte dtypes
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.spec = (self.shm.name, layout)
+        for (symbol, length, start), store in zip(layout, bar_stores.values()):
+            for column, view in zip(COLUMNS, _column_views(self.shm, length, start)):
+                view[:] = getattr(store, column)
+
+    @staticmethod
+    def attach(spec):
+        """Returns (shared memory handle, {symbol: BarStore}) viewing the block in place."""
+        name, layout = spec
+        shm = shared_memory.SharedMemory(name=name)
+        bar_stores = {
+            symbol: BarStore(*_column_views(shm, length, start))
+            for symbol, length, start in layout
+        }
+        return shm, bar_stores
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _column_views(shm, length: int, start: int):
+    views = []
+    for i, column in enumerate(COLUMNS):
+        dtype = np.float64 if column not in ("timestamps", "volume") else np.int64
+        views.append(
+            np.ndarray(
+                length, dtype=dtype, buffer=shm.buf, offset=start + i * length * 8
+            )
+        )
+    return views
+
+
+def expand_grid(param_grid) -> list:
+    """{'a': [1, 2], 'b': [3]} -> [{'a': 1, 'b': 3}, {'a': 2, 'b': 3}]; lists pass through."""
+    if isinstance(param_grid, dict):
+        names = list(param_grid)
+        return [
+            dict(zip(names, values))
+            for values in itertools.product(*(param_grid[n] for n in names))
+        ]
+    return [dict(p) for p in param_grid]
+
+
+# Per-worker state, set once by _init_worker
+_worker_shm = None
+_worker_stores = None
+
+
+def _init_worker(spec):
+    global _worker_shm, _worker_stores
+    _worker_shm, _worker_stores = SharedBarData.attach(spec)
+
+
+def run_backtest_summary(
+    strategy_cls, bar_stores, symbol_list, params, initial_capital, fast=False
+) -> dict:
+    """Runs one backtest and returns its summary metrics."""
+    # Arrays rather than DataFrames, so sweep workers never import pandas
+    if fast:
+        _, cash, holdings = vectorized_equity(
+            strategy_cls, bar_stores, symbol_list, params, initial_capital
+        )
+        equity = cash + holdings
+    else:
+        equity = event_driven_portfolio(
+            strategy_cls, bar_stores, symbol_list, params, initial_capital
+        ).total_equity()
+    return summarize_equity(equity, initial_capital)
+
+
+def run_fanout_summaries(
+    strategy_cls, bar_stores, symbol_list, chunk, initial_capital, ledger_dir=None
+) -> list:
+    """
+    Event-driven backtests of every (i, params) in chunk off one data pass. With
+    ledger_dir, each run's fill ledger is also saved there as ledger_<i>.npz.
+    """
+    data_handler = ColumnarDataHandler(deque(), bar_stores, list(symbol_list))
+    engine = MultiStackEngine(data_handler)
+    for i, params in chunk:
+        engine.add_strategy(i, strategy_cls, params, initial_capital)
+    engine.run()
+    summaries = []
+    for i, result in engine.results(equity_curves=False).items():
+        if ledger_dir is not None:
+            result["ledger"].save(os.path.join(ledger_dir, f"ledger_{i}.npz"))
+        summaries.append(
+            (
+                i,
+                {k: v for k, v in result.items() if k != "ledger"},
+            )
+        )
+    return summaries
+
+
+def summarize_chunk(
+    strategy_cls, bar_stores, symbol_list, chunk, initial_capital, fast, ledger_dir=None
+) -> list:
+    """[(i, summary)] for every (i, params) in chunk, backtested over bar_stores."""
+    if not fast:
+        return run_fanout_summaries(
+            strategy_cls, bar_stores, symbol_list, chunk, initial_capital, ledger_dir
+        )
+    return [
+        (
+            i,
+            run_backtest_summary(
+                strategy_cls, bar_stores, symbol_list, params, initial_capital, fast
+            ),
+        )
+        for i, params in chunk
+    ]
+
+
+def _run_chunk(
+    strategy_cls, chunk, symbol_list, initial_capital, fast, ledger_dir, window=None
+):
+    # window: optional (start ns, stop ns) time range, sliced out of the shared data
+    stores = _worker_stores if window is None else slice_stores(_worker_stores, *window)
+    return summarize_chunk(
+        strategy_cls, stores, symbol_list, chunk, initial_capital, fast, ledger_dir
+    )
+
+
+def run_sweep(
+    strategy_cls,
+    param_grid,
+    symbol_list: list,
+    csv_dir: str = None,
+    bar_stores: dict = None,
+    initial_capital=100000.0,
+    n_workers: int = None,
+    chunk_size: int = None,
+    fast: bool = False,
+    stop_when=None,
+    ledger_dir: str = None,
+) -> list:
+    """
+    Backtests strategy_cls for every parameter set in param_grid on a process pool.
+
+    Data comes from bar_stores, or is loaded once from csv_dir. Parameter sets are
+    scheduled in chunks of chunk_size (default: about four chunks per worker).
+    fast=True uses the vectorized runner (the strategy must implement
+    compute_signals). stop_when(result) -> True cancels all chunks not yet started.
+    ledger_dir saves every event-driven run's fill ledger as ledger_<grid index>.npz
+    (see backtester/ledger.py) for trade-level analysis after the sweep.
+
+    Returns one dict per completed parameter set, in grid order: the parameters plus
+    total_return, sharpe and max_drawdown.
+    """
+    symbol_list = list(symbol_list)
+    if ledger_dir is not None:
+        if fast:
+            raise ValueError("ledger_dir needs event-driven runs (fast=False)")
+        os.makedirs(ledger_dir, exist_ok=True)
+    if bar_stores is None:
+        bar_stores = HistoricCSVDataHandler(deque(), csv_dir, symbol_list).bar_stores
+    grid = list(enumerate(expand_grid(param_grid)))
+    n_workers = n_workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, math.ceil(len(grid) / (4 * n_workers)))
+    chunks = [grid[i : i + chunk_size] for i in range(0, len(grid), chunk_size)]
+
+    results = {}
+    with SharedBarData({s: bar_stores[s] for s in symbol_list}) as shared:
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(shared.spec,)
+        ) as executor:
+            pending = {
+                executor.submit(
+                    _run_chunk,
+                    strategy_cls,
+                    chunk,
+                    symbol_list,
+                    initial_capital,
+                    fast,
+                    ledger_dir,
+                )
+                for chunk in chunks
+            }
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    stop = False
+                    for future in done:
+                        for i, summary in future.result():
+                            result = dict(grid[i][1], **summary)
+                            results[i] = result
+                            stop = stop or bool(stop_when and stop_when(result))
+                    if stop:
+                        break
+            finally:
+                for future in pending:
+                    future.cancel()
+                executor.shutdown(wait=True, cancel_futures=True)
+    return [results[i] for i in sorted(results)]
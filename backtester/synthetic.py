@@ -0,0 +1,128 @@
+# backtester/synthetic.py
+"""
+Deterministic synthetic OHLCV data for benchmarks and experiments.
+
+Prices follow a geometric random walk with occasional overnight jumps. Bars can be
+dropped at random to simulate data gaps, and symbols can trade on different
+calendars: business days, every day (crypto-style), or 390 one-minute bars per
+business day. The same (seed, symbol index) always produces the same bars.
+"""
+
+import os
+
+import numpy as np
+
+from .bars import BarStore
+
+CALENDARS = ("business", "daily", "minute", "mixed")
+MINUTES_PER_SESSION = 390  # 09:30-16:00
+SESSION_OPEN = np.timedelta64(9 * 60 + 30, "m")
+
+
+def calendar_timestamps(calendar: str, n_bars: int, start="2000-01-03") -> np.ndarray:
+    """Returns n_bars int64 nanosecond timestamps on the given calendar."""
+    start = np.datetime64(start, "D")
+    if calendar == "business":
+        days = np.busday_offset(start, np.arange(n_bars), roll="forward")
+        return days.astype("datetime64[ns]").view(np.int64)
+    if calendar == "daily":
+        days = start + np.arange(n_bars).astype("timedelta64[D]")
+        return days.astype("datetime64[ns]").view(np.int64)
+    if calendar == "minute":
+        k = np.arange(n_bars)
+        days = np.busday_offset(start, k // MINUTES_PER_SESSION, roll="forward")
+        minutes = (k % MINUTES_PER_SESSION).astype("timedelta64[m]") + SESSION_OPEN
+        return (days + minutes).astype("datetime64[ns]").view(np.int64)
+    raise ValueError(f"Unknown calendar {calendar!r}; expected one of {CALENDARS}")
+
+
+def generate_bar_store(
+    n_bars: int,
+    seed: int = 0,
+    calendar: str = "business",
+    start="2000-01-03",
+    start_price: float = 100.0,
+    drift: float = 0.0002,
+    volatility: float = 0.015,
+    jump_prob: float = 0.01,
+    jump_scale: float = 0.05,
+    gap_prob: float = 0.0,
+) -> BarStore:
+    """
+    One symbol's bars. drift/volatility are per bar (log returns); with probability
+    jump_prob a bar opens with an extra N(0, jump_scale) gap; with probability gap_prob
+    a bar is missing entirely.
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = calendar_timestamps(calendar, n_bars, start)
+
+    log_returns = rng.normal(drift, volatility, n_bars)
+    jumps = np.where(
+        rng.random(n_bars) < jump_prob, rng.normal(0, jump_scale, n_bars), 0
+    )
+    # Split each bar's move into an overnight gap (plus jump) and an intraday move
+    overnight = 0.2 * log_returns + jumps
+    log_close = np.log(start_price) + np.cumsum(log_returns + jumps)
+    close = np.exp(log_close)
+    open_ = np.exp(log_close - (log_returns + jumps) + overnight)
+    wick = np.abs(rng.normal(0, volatility / 2, (2, n_bars)))
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+    volume = rng.lognormal(13.0, 0.5, n_bars).astype(np.int64)
+
+    keep = rng.random(n_bars) >= gap_prob
+    return BarStore(
+        timestamps[keep],
+        open_[keep],
+        high[keep],
+        low[keep],
+        close[keep],
+        close[keep],
+        volume[keep],
+    )
+
+
+def generate_bar_stores(
+    n_symbols: int, n_bars: int, seed: int = 0, calendar: str = "business", **kwargs
+) -> dict:
+    """
+    N symbols x M bars, named SYM0000, SYM0001, ... Each symbol gets its own
+    independent stream derived from seed. calendar="mixed" alternates business-day
+    and every-day calendars between symbols.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(n_symbols)
+    stores = {}
+    for k, child in enumerate(seeds):
+        symbol_calendar = calendar
+        if calendar == "mixed":
+            symbol_calendar = ("business", "daily")[k % 2]
+        stores[f"SYM{k:04d}"] = generate_bar_store(
+            n_bars,
+            seed=int(child.generate_state(1)[0]),
+            calendar=symbol_calendar,
+            **kwargs,
+        )
+    return stores
+
+
+def write_csvs(bar_stores: dict, csv_dir: str, timeframe: str = "1d"):
+    """Writes each store as {csv_dir}/{symbol}_{timeframe}.csv in the layout
+    HistoricCSVDataHandler reads (Date,Open,High,Low,Close,Adj Close,Volume)."""
+    os.makedirs(csv_dir, exist_ok=True)
+    for symbol, store in bar_stores.items():
+        dates = np.datetime_as_string(store.index, unit="s")
+        rows = zip(
+            dates,
+            store.open.tolist(),
+            store.high.tolist(),
+            store.low.tolist(),
+            store.close.tolist(),
+            store.adj_close.tolist(),
+            store.volume.tolist(),
+        )
+        with open(os.path.join(csv_dir, f"{symbol}_{timeframe}.csv"), "w") as f:
+            f.write("Date,Open,High,Low,Close,Adj Close,Volume\n")
+            f.writelines(
+                f"{d.replace('T', ' ')},{o!r},{h!r},{l!r},{c!r},{a!r},{v}\n"
+                for d, o, h, l, c, a, v in rows
+            )
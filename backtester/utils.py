@@ -0,0 +1,24 @@
+# backtester/utils.py
+"""Plotting helpers. matplotlib is imported on first use, so headless runs never load it."""
+
+
+def plot_equity_curve(equity, drawdown, show: bool = True):
+    """Equity curve above its drawdown curve; equity and drawdown are pandas Series."""
+    import matplotlib.pyplot as plt
+
+    fig, (ax1, ax2) = plt.subplots(
+        2, 1, sharex=True, figsize=(12, 8), gridspec_kw={"height_ratios": [3, 1]}
+    )
+    equity.plot(ax=ax1, title="Equity Curve", legend=True, ylabel="Portfolio Value")
+    ax1.grid(True)
+
+    drawdown.plot(
+        ax=ax2, title="Drawdown Curve", legend=True, color="red", ylabel="Drawdown"
+    )
+    ax2.fill_between(drawdown.index, drawdown, 0, color="red", alpha=0.3)
+    ax2.grid(True)
+
+    plt.tight_layout()
+    if show:
+        plt.show()
+    return fig
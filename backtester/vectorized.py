@@ -0,0 +1,226 @@
+# backtester/vectorized.py
+"""
+Vectorized fast path for simple signal strategies.
+
+A Strategy that implements compute_signals(bars) can be run here in a handful of
+NumPy passes per symbol instead of event by event. The model mirrors the event-driven
+components: Portfolio.update_signal's fixed-size long-only orders, and
+SimulatedExecutionHandler's fills at the next bar's open with slippage and
+per-share commission. check_parity() runs both engines on the same data and diffs
+the equity curves.
+"""
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .data import ColumnarDataHandler
+from .engine import BacktestEngine
+from .execution import SimulatedExecutionHandler
+from .portfolio import Portfolio
+from .strategy import EXIT, LONG
+
+if TYPE_CHECKING:  # pandas is only imported to build the returned DataFrames
+    import pandas as pd
+
+
+def _symbol_flows(signals, bars, quantity, commission_per_share, slippage_pct):
+    """Returns (cumulative cash flow, holdings value) per bar for one symbol."""
+    # Target position after each bar's signal: LONG opens `quantity`, EXIT flattens
+    target = np.full(len(signals), np.nan)
+    target[signals == LONG] = quantity
+    target[signals == EXIT] = 0.0
+    if len(target):
+        target[0] = 0.0 if np.isnan(target[0]) else target[0]
+    idx = np.where(np.isnan(target), 0, np.arange(len(target)))
+    target = target[np.maximum.accumulate(idx)]  # Forward fill
+
+    # Orders fill on the next bar's open
+    position = np.zeros(len(signals))
+    position[1:] = target[:-1]
+    trade = np.diff(position, prepend=0.0)
+    fill_price = bars.open * np.where(trade > 0, 1 + slippage_pct, 1 - slippage_pct)
+    cost = trade * fill_price + commission_per_share * np.abs(trade)
+    cost[trade == 0] = 0.0
+    return np.cumsum(-cost), position * bars.close
+
+
+def vectorized_equity(
+    strategy_cls,
+    bar_stores: dict,
+    symbol_list: list = None,
+    params: dict = None,
+    initial_capital=100000.0,
+    quantity=100,
+    commission_per_share=0.001,
+    slippage_pct=0.0005,
+) -> tuple:
+    """
+    The vectorized backtest as arrays: (timestamps, cash, holdings value), one
+    entry per timestamp of the merged timeline. No pandas needed.
+    """
+    symbol_list = list(bar_stores) if symbol_list is None else list(symbol_list)
+    strategy = strategy_cls(deque(), None, symbol_list, **(params or {}))
+    stores = [bar_stores[s] for s in symbol_list]
+    timestamps = np.unique(
+        np.concatenate([store.timestamps for store in stores] + [np.empty(0, np.int64)])
+    )
+
+    cash = np.full(len(timestamps), float(initial_capital))
+    holdings = np.zeros(len(timestamps))
+    for store in stores:
+        if not len(store):
+            continue
+        signals = np.asarray(strategy.compute_signals(store))
+        cash_flow, value = _symbol_flows(
+            signals, store, quantity, commission_per_share, slippage_pct
+        )
+        # Latest bar of this symbol at or before each global timestamp
+        row = np.searchsorted(store.timestamps, timestamps, side="right") - 1
+        seen = row >= 0
+        cash[seen] += cash_flow[row[seen]]
+        holdings[seen] += value[row[seen]]
+    return timestamps, cash, holdings
+
+
+def run_vectorized(
+    strategy_cls,
+    bar_stores: dict,
+    symbol_list: list = None,
+    params: dict = None,
+    initial_capital=100000.0,
+    quantity=100,
+    commission_per_share=0.001,
+    slippage_pct=0.0005,
+) -> "pd.DataFrame":
+    """
+    Backtests strategy_cls(**params) over bar_stores in one vectorized pass.
+    Returns an equity curve shaped like Portfolio.get_equity_curve(): one row per
+    timestamp with total_equity, cash and holdings_value.
+    """
+    import pandas as pd
+
+    timestamps, cash, holdings = vectorized_equity(
+        strategy_cls,
+        bar_stores,
+        symbol_list,
+        params,
+        initial_capital,
+        quantity,
+        commission_per_share,
+        slippage_pct,
+    )
+    return pd.DataFrame(
+        {"total_equity": cash + holdings, "cash": cash, "holdings_value": holdings},
+        index=pd.Index(timestamps.view("datetime64[ns]"), name="timestamp"),
+    )
+
+
+def run_event_driven(
+    strategy_cls,
+    bar_stores: dict,
+    symbol_list: list = None,
+    params: dict = None,
+    initial_capital=100000.0,
+    commission_per_share=0.001,
+    slippage_pct=0.0005,
+) -> "pd.DataFrame":
+    """Runs the same backtest through the event-driven components."""
+    return event_driven_portfolio(
+        strategy_cls,
+        bar_stores,
+        symbol_list,
+        params,
+        initial_capital,
+        commission_per_share,
+        slippage_pct,
+    ).get_equity_curve()
+
+
+def event_driven_portfolio(
+    strategy_cls,
+    bar_stores: dict,
+    symbol_list: list = None,
+    params: dict = None,
+    initial_capital=100000.0,
+    commission_per_share=0.001,
+    slippage_pct=0.0005,
+) -> Portfolio:
+    """run_event_driven(), returning the finished Portfolio instead of a DataFrame."""
+    symbol_list = list(bar_stores) if symbol_list is None else list(symbol_list)
+    events_queue = deque()
+    data_handler = ColumnarDataHandler(events_queue, bar_stores, symbol_list)
+    strategy = strategy_cls(events_queue, data_handler, symbol_list, **(params or {}))
+    portfolio = Portfolio(events_queue, data_handler, initial_capital, symbol_list)
+    execution_handler = SimulatedExecutionHandler(
+        events_queue, commission_per_share, slippage_pct
+    )
+    BacktestEngine(data_handler, strategy, portfolio, execution_handler).run()
+    portfolio.finish()
+    return portfolio
+
+
+class ParityReport:
+    """Outcome of check_parity(): both equity curves, their difference and timings."""
+
+    def __init__(self, event_curve, fast_curve, event_seconds, fast_seconds, rtol):
+        self.event_curve = event_curve
+        self.fast_curve = fast_curve
+        self.event_seconds = event_seconds
+        self.fast_seconds = fast_seconds
+        self.same_index = event_curve.index.equals(fast_curve.index)
+        if self.same_index:
+            self.diff = fast_curve - event_curve
+            self.max_abs_diff = float(np.abs(self.diff.to_numpy()).max(initial=0.0))
+            self.ok = bool(
+                np.allclose(
+                    fast_curve.to_numpy(), event_curve.to_numpy(), rtol=rtol, atol=1e-6
+                )
+            )
+        else:
+            self.diff = None
+            self.max_abs_diff = float("inf")
+            self.ok = False
+
+    @property
+    def speedup(self) -> float:
+        return self.event_seconds / self.fast_seconds if self.fast_seconds else 0.0
+
+    def __str__(self):
+        status = "MATCH" if self.ok else "MISMATCH"
+        if not self.same_index:
+            status += " (timestamps differ)"
+        return (
+            f"Parity: {status}, max |diff| {self.max_abs_diff:.3g}, "
+            f"event-driven {self.event_seconds:.3f}s, vectorized "
+            f"{self.fast_seconds:.3f}s ({self.speedup:.0f}x)"
+        )
+
+
+def check_parity(
+    strategy_cls,
+    bar_stores: dict,
+    symbol_list: list = None,
+    params: dict = None,
+    initial_capital=100000.0,
+    commission_per_share=0.001,
+    slippage_pct=0.0005,
+    rtol=1e-9,
+) -> ParityReport:
+    """Runs both engines on the same data and diffs their equity curves."""
+    kwargs = dict(
+        symbol_list=symbol_list,
+        params=params,
+        initial_capital=initial_capital,
+        commission_per_share=commission_per_share,
+        slippage_pct=slippage_pct,
+    )
+    start = time.perf_counter()
+    event_curve = run_event_driven(strategy_cls, bar_stores, **kwargs)
+    event_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    fast_curve = run_vectorized(strategy_cls, bar_stores, **kwargs)
+    fast_seconds = time.perf_counter() - start
+    return ParityReport(event_curve, fast_curve, event_seconds, fast_seconds, rtol)
@@ -0,0 +1,292 @@
+# backtester/walkforward.py
+"""
+Walk-forward optimization.
+
+The merged timeline of all symbols is cut into rolling (or anchored) windows of
+train_bars in-sample timestamps, each followed by test_bars out-of-sample
+timestamps. Every window is a zero-copy slice of the loaded BarStores, found by
+searchsorted on the timestamps; nothing is re-read or copied.
+
+The in-sample parameter search for all windows runs on one process pool over
+one shared-memory copy of the data (see backtester/sweep.py). Workers slice their
+window out of the shared block. The best parameter set per window, by `metric`,
+then trades that window's out-of-sample segment. All segments share one
+Portfolio and one SimulatedExecutionHandler, so the stitched out-of-sample
+equity curve compounds, and positions and resting orders carry across window
+boundaries.
+
+Strategy state is carried forward rather than rebuilt. When a window keeps the
+previous window's parameters, the same strategy object simply continues with
+its indicators warm. When the parameters change, a new strategy is warmed up on
+only the warmup_bars timestamps before its segment, with its signals discarded.
+The positions the previous strategy left open are kept, and the new strategy's
+signal memory is reconciled with them (Strategy.sync_positions), so it can exit
+positions it did not open and enter symbols its warm-up thought it held.
+Out-of-sample work is therefore proportional to the total number of bars plus
+one warm-up per parameter change, not windows x history.
+"""
+
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .bars import slice_stores
+from .data import ColumnarDataHandler
+from .engine import BacktestEngine
+from .execution import SimulatedExecutionHandler
+from .performance import summarize_equity
+from .portfolio import Portfolio
+from .sweep import (
+    SharedBarData,
+    _init_worker,
+    _run_chunk,
+    expand_grid,
+    summarize_chunk,
+)
+
+# Metrics where smaller is better; every other summary metric is maximized
+MINIMIZE = ("max_drawdown",)
+
+
+def walk_forward_windows(
+    n_timestamps: int, train_bars: int, test_bars: int, anchored=False
+) -> list:
+    """
+    (in-sample start, out-of-sample start, out-of-sample stop) index triples into
+    the merged timeline. anchored=True grows every in-sample window from index 0.
+    """
+    windows = []
+    for oos_start in range(train_bars, n_timestamps, test_bars):
+        is_start = 0 if anchored else oos_start - train_bars
+        windows.append((is_start, oos_start, min(oos_start + test_bars, n_timestamps)))
+    return windows
+
+
+class WalkForwardReport:
+    """Per-window choices and the stitched out-of-sample equity curve."""
+
+    def __init__(self, windows: list, equity_curve, initial_capital, metric, seconds):
+        self.windows = windows
+        self.equity_curve = equity_curve
+        self.metric = metric
+        self.seconds = seconds
+        self.summary = summarize_equity(
+            equity_curve["total_equity"].to_numpy(), initial_capital
+        )
+        self.warmup_bars = sum(w["warmup_bars"] for w in windows)
+
+    def __str__(self):
+        lines = [
+            f"Walk-forward: {len(self.windows)} windows in {self.seconds:.2f}s, "
+            f"{self.warmup_bars:,} warm-up timestamps replayed"
+        ]
+        for w in self.windows:
+            lines.append(
+                f"  OOS {w['out_of_sample'][0]} -> {w['out_of_sample'][1]}: "
+                f"{w['params']} (IS {self.metric} {w['in_sample'][self.metric]:.2f}), "
+                f"OOS return {w['oos_return']:.2%}"
+            )
+        s = self.summary
+        lines.append(
+            f"Stitched OOS: total return {s['total_return']:.2%}, "
+            f"Sharpe {s['sharpe']:.2f}, max drawdown {s['max_drawdown']:.2%}"
+        )
+        return "\n".join(lines)
+
+
+def _search_in_sample(
+    strategy_cls,
+    grid,
+    bar_stores,
+    symbol_list,
+    bounds,
+    initial_capital,
+    fast,
+    n_workers,
+    chunk_size,
+) -> list:
+    """{grid index: summary} per window, for windows given as (start, stop) ns."""
+    chunk_size = chunk_size or max(
+        1, math.ceil(len(grid) * len(bounds) / (4 * n_workers))
+    )
+    chunks = [grid[i : i + chunk_size] for i in range(0, len(grid), chunk_size)]
+    results = [{} for _ in bounds]
+    if n_workers == 1:
+        for w, window in enumerate(bounds):
+            stores = slice_stores(bar_stores, *window)
+            for chunk in chunks:
+                results[w].update(
+                    summarize_chunk(
+                        strategy_cls, stores, symbol_list, chunk, initial_capital, fast
+                    )
+                )
+        return results
+
+    with SharedBarData(bar_stores) as shared:
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(shared.spec,)
+        ) as executor:
+            futures = [
+                (
+                    w,
+                    executor.submit(
+                        _run_chunk,
+                        strategy_cls,
+                        chunk,
+                        symbol_list,
+                        initial_capital,
+                        fast,
+                        None,
+                        window,
+                    ),
+                )
+                for w, window in enumerate(bounds)
+                for chunk in chunks
+            ]
+            for w, future in futures:
+                results[w].update(future.result())
+    return results
+
+
+def _warm_up(strategy_cls, params, bar_stores, symbol_list):
+    """A new strategy that has seen bar_stores; its signals go nowhere."""
+    scratch = deque()
+    data_handler = ColumnarDataHandler(scratch, bar_stores, list(symbol_list))
+    strategy = strategy_cls(scratch, data_handler, list(symbol_list), **params)
+    BacktestEngine(data_handler, strategy).run()  # No SIGNAL handlers: dropped
+    return strategy
+
+
+def walk_forward(
+    strategy_cls,
+    param_grid,
+    bar_stores: dict,
+    symbol_list: list = None,
+    train_bars=504,
+    test_bars=126,
+    anchored=False,
+    warmup_bars: int = None,
+    metric="sharpe",
+    initial_capital=100000.0,
+    commission_per_share=0.001,
+    slippage_pct=0.0005,
+    fast=False,
+    n_workers: int = None,
+    chunk_size: int = None,
+) -> WalkForwardReport:
+    """
+    Walk-forward optimization of strategy_cls over param_grid (see expand_grid).
+
+    Window sizes count timestamps of the merged timeline. warmup_bars (default
+    train_bars) is how many timestamps a newly chosen strategy replays before its
+    segment. Set it to the strategy's longest lookback (long_window for DMAC) for
+    the cheapest warm-up that still fills windowed indicators completely. After a
+    warm-up, the strategy's signal memory is synced to the carried-over positions;
+    positions are never flattened on a parameter switch. metric is a summary key
+    (sharpe, total_return or max_drawdown). fast=True searches in-sample with the
+    vectorized runner (the strategy must implement compute_signals). n_workers=1
+    runs the search in this process.
+
+    Strategies are re-pointed to each segment's data handler, so they must not
+    bind to data handler internals at construction (as a CrossSectionalStrategy
+    sharing a CrossSection does).
+    """
+    start_time = time.perf_counter()
+    symbol_list = list(bar_stores) if symbol_list is None else list(symbol_list)
+    bar_stores = {s: bar_stores[s] for s in symbol_list}
+    timestamps = np.unique(
+        np.concatenate(
+            [store.timestamps for store in bar_stores.values()]
+            + [np.empty(0, np.int64)]
+        )
+    )
+    dates = timestamps.view("datetime64[ns]")
+    windows = walk_forward_windows(len(timestamps), train_bars, test_bars, anchored)
+    if not windows:
+        raise ValueError(
+            f"Need more than train_bars={train_bars} timestamps, got {len(timestamps)}"
+        )
+    warmup_bars = train_bars if warmup_bars is None else warmup_bars
+    grid = list(enumerate(expand_grid(param_grid)))
+
+    def ns(index):  # Window bound as a timestamp; None past the end
+        return int(timestamps[index]) if index < len(timestamps) else None
+
+    in_sample = _search_in_sample(
+        strategy_cls,
+        grid,
+        bar_stores,
+        symbol_list,
+        [(ns(is_start), ns(oos_start)) for is_start, oos_start, _ in windows],
+        initial_capital,
+        fast,
+        n_workers or os.cpu_count() or 1,
+        chunk_size,
+    )
+
+    sign = -1.0 if metric in MINIMIZE else 1.0
+    events_queue = deque()
+    portfolio = Portfolio(events_queue, None, initial_capital, symbol_list)
+    execution_handler = SimulatedExecutionHandler(
+        events_queue, commission_per_share, slippage_pct
+    )
+    strategy = current_params = None
+    report = []
+    for (is_start, oos_start, oos_stop), summaries in zip(windows, in_sample):
+        best = max(summaries, key=lambda i: sign * summaries[i][metric])
+        params = grid[best][1]
+        warmed = 0
+        if params != current_params:
+            warm_start = max(0, oos_start - warmup_bars)
+            warmed = oos_start - warm_start
+            strategy = _warm_up(
+                strategy_cls,
+                params,
+                slice_stores(bar_stores, ns(warm_start), ns(oos_start)),
+                symbol_list,
+            )
+            # Held or on order, as the portfolio will see it on the next bar
+            exposure = portfolio.positions + portfolio.pending
+            strategy.sync_positions(dict(zip(symbol_list, exposure.tolist())))
+            current_params = params
+
+        segment = slice_stores(bar_stores, ns(oos_start), ns(oos_stop))
+        data_handler = ColumnarDataHandler(events_queue, segment, list(symbol_list))
+        strategy.events_queue = events_queue
+        strategy.data_handler = data_handler
+        portfolio.data_handler = data_handler
+        equity_before = portfolio.current_cash + portfolio.total_holdings_value
+        BacktestEngine(
+            data_handler, strategy, portfolio, execution_handler, events_queue
+        ).run()
+        equity_after = portfolio.current_cash + portfolio.total_holdings_value
+
+        report.append(
+            {
+                "in_sample": dict(
+                    summaries[best],
+                    start=dates[is_start],
+                    end=dates[oos_start - 1],
+                ),
+                "out_of_sample": (
+                    dates[oos_start],
+                    dates[oos_stop - 1],
+                ),
+                "params": params,
+                "warmup_bars": warmed,
+                "oos_return": equity_after / equity_before - 1.0,
+            }
+        )
+
+    portfolio.finish()
+    return WalkForwardReport(
+        report,
+        portfolio.get_equity_curve(),
+        initial_capital,
+        metric,
+        time.perf_counter() - start_time,
+    )
@@ -0,0 +1,114 @@
+# benchmarks/bench_data_handler.py
+"""
+Bars/sec of the columnar HistoricCSVDataHandler against the old iterrows() path.
+The columnar path is timed without the cache, with a cold cache and with a warm one,
+and StreamingCSVDataHandler is timed reading the CSVs chunk by chunk. --memory also
+reports each run's peak traced allocation (tracemalloc; slows every run down).
+
+Run from the repository root:
+    python -m benchmarks.bench_data_handler --symbols 20 --bars 20000
+    python -m benchmarks.bench_data_handler --symbols 1 --bars 1000000 --memory
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+
+import pandas as pd
+
+from backtester.data import HistoricCSVDataHandler, StreamingCSVDataHandler
+from backtester.synthetic import generate_bar_stores, write_csvs
+
+
+def run_iterrows(csv_dir: str, symbols: list) -> int:
+    """Replica of the pre-columnar update_bars(): iterrows() plus a dict per bar."""
+    iterators = {
+        s: pd.read_csv(f"{csv_dir}/{s}_1d.csv", index_col="Date", parse_dates=True)
+        .sort_index()
+        .iterrows()
+        for s in symbols
+    }
+    latest = {}
+    n_bars = 0
+    more_data = True
+    while more_data:
+        more_data = False
+        for symbol in symbols:
+            try:
+                timestamp, row = next(iterators[symbol])
+            except StopIteration:
+                continue
+            latest[symbol] = {
+                "open": row["Open"],
+                "high": row["High"],
+                "low": row["Low"],
+                "close": row["Close"],
+                "volume": row["Volume"],
+                "adj_close": row.get("Adj Close", row["Close"]),
+            }
+            n_bars += 1
+            more_data = True
+    return n_bars
+
+
+def run_columnar(csv_dir: str, symbols: list, use_cache: bool = False) -> int:
+    events_queue = deque()
+    data_handler = HistoricCSVDataHandler(
+        events_queue, csv_dir, list(symbols), use_cache=use_cache
+    )
+    n_bars = 0
+    while data_handler.update_bars():
+        n_bars += len(events_queue)
+        events_queue.clear()
+    return n_bars
+
+
+def run_streaming(csv_dir: str, symbols: list) -> int:
+    events_queue = deque()
+    data_handler = StreamingCSVDataHandler(events_queue, csv_dir, list(symbols))
+    n_bars = 0
+    while data_handler.update_bars():
+        n_bars += len(events_queue)
+        events_queue.clear()
+    return n_bars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--bars", type=int, default=20000)
+    parser.add_argument("--memory", action="store_true", help="Trace peak memory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as csv_dir:
+        bar_stores = generate_bar_stores(args.symbols, args.bars, calendar="minute")
+        write_csvs(bar_stores, csv_dir)
+        symbols = list(bar_stores)
+        runs = (
+            ("iterrows", run_iterrows),
+            ("columnar", run_columnar),
+            ("cold cache", lambda d, s: run_columnar(d, s, use_cache=True)),
+            ("warm cache", lambda d, s: run_columnar(d, s, use_cache=True)),
+            ("streaming", run_streaming),
+        )
+        del bar_stores  # Keep the generated arrays out of the memory numbers
+        for name, fn in runs:
+            if args.memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            n_bars = fn(csv_dir, symbols)
+            elapsed = time.perf_counter() - start
+            peak = ""
+            if args.memory:
+                peak = f", peak {tracemalloc.get_traced_memory()[1] / 2**20:,.1f} MiB"
+                tracemalloc.stop()
+            print(
+                f"{name:>10}: {n_bars:,} bars in {elapsed:.2f}s "
+                f"({n_bars / elapsed:,.0f} bars/sec){peak}"
+            )
+
+
+if __name__ == "__main__":
+    main()
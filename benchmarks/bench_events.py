@@ -0,0 +1,132 @@
+# benchmarks/bench_events.py
+"""
+Event allocation cost: dict-payload events vs slotted MarketEvents vs a MarketEventPool.
+
+For each variant, streams N symbols x M bars of synthetic data through a
+no-op MARKET handler. It reports wall time, gen-0 GC collections and the bytes
+tracemalloc sees allocated over the run.
+
+Wide universes (large timestamp batches) are where pooling pays off; with few
+symbols per timestamp each event dies before the next is created and the pool
+mostly adds call overhead.
+
+Run from the repository root:
+    python -m benchmarks.bench_events --symbols 2000 --bars 150
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from backtester.bars import BarStore, BarView
+from backtester.data import ColumnarDataHandler
+from backtester.engine import BacktestEngine
+from backtester.event import EventType, MarketEvent, MarketEventPool
+
+
+class LegacyMarketEvent:
+    """Replica of the pre-slots MarketEvent: per-instance __dict__ plus a dict payload."""
+
+    def __init__(self, timestamp, symbol, data):
+        self.type = EventType.MARKET
+        self.timestamp = timestamp
+        self.symbol = symbol
+        self.data = data
+
+
+class LegacyDataHandler(ColumnarDataHandler):
+    """Emits LegacyMarketEvents with a bar dict, like the original handler did."""
+
+    def update_bars(self) -> bool:
+        if self._batch >= self.n_batches:
+            return False
+        start = self._batch_bounds[self._batch]
+        stop = self._batch_bounds[self._batch + 1]
+        self._batch += 1
+        for sid, i in zip(
+            self._merge_symbol[start:stop].tolist(),
+            self._merge_row[start:stop].tolist(),
+        ):
+            symbol, store = self._symbols[sid], self._stores[sid]
+            self.cursors[symbol] = i + 1
+            bar = BarView(store, i).to_dict()
+            self.events_queue.append(LegacyMarketEvent(store.index[i], symbol, bar))
+        return True
+
+
+def synthetic_stores(n_symbols: int, n_bars: int) -> dict:
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(n_bars, dtype=np.int64) * 60_000_000_000
+    stores = {}
+    for k in range(n_symbols):
+        close = 100.0 + np.cumsum(rng.normal(0.0, 0.1, n_bars))
+        stores[f"SYM{k:04d}"] = BarStore(
+            timestamps, close, close, close, close, close, np.ones(n_bars, np.int64)
+        )
+    return stores
+
+
+def run(handler_cls, stores, event_pool=None):
+    events_queue = deque()
+    kwargs = {"event_pool": event_pool} if event_pool is not None else {}
+    data_handler = handler_cls(events_queue, stores, **kwargs)
+    engine = BacktestEngine(data_handler)
+    engine.subscribe(EventType.MARKET, lambda event: None)
+
+    gc.collect()
+    collections_before = gc.get_stats()[0]["collections"]
+    tracemalloc.start()
+    start = time.perf_counter()
+    n_events = engine.run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections = gc.get_stats()[0]["collections"] - collections_before
+
+    # Wall time without tracemalloc's overhead
+    data_handler = handler_cls(deque(), stores, **kwargs)
+    engine = BacktestEngine(data_handler)
+    engine.subscribe(EventType.MARKET, lambda event: None)
+    start = time.perf_counter()
+    engine.run()
+    wall = time.perf_counter() - start
+    return n_events, wall, collections, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--bars", type=int, default=150)
+    args = parser.parse_args()
+
+    legacy = LegacyMarketEvent(None, "X", BarView(synthetic_stores(1, 1)["SYM0000"], 0))
+    legacy.data = legacy.data.to_dict()
+    slotted = MarketEvent(None, "X", 1.0, 1.0, 1.0, 1.0, 1, 1.0)
+    print(
+        "bytes per event: legacy "
+        f"{sys.getsizeof(legacy) + sys.getsizeof(legacy.__dict__) + sys.getsizeof(legacy.data)}"
+        f", slotted {sys.getsizeof(slotted)}"
+    )
+
+    stores = synthetic_stores(args.symbols, args.bars)
+    variants = (
+        ("legacy dict", LegacyDataHandler, None),
+        ("slotted", ColumnarDataHandler, None),
+        ("slotted+pool", ColumnarDataHandler, MarketEventPool()),
+    )
+    for name, handler_cls, pool in variants:
+        n_events, wall, collections, peak = run(handler_cls, stores, pool)
+        print(
+            f"{name:>13}: {n_events:,} events in {wall:.2f}s "
+            f"({n_events / wall:,.0f}/s), gen0 GCs {collections:,}, "
+            f"traced peak {peak / 1024:,.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
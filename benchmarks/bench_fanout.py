@@ -0,0 +1,82 @@
+# benchmarks/bench_fanout.py
+"""
+N strategy variants: N separate HistoricCSVDataHandler runs vs one MultiStackEngine
+pass feeding N stacks. Also checks that every variant's equity curve is identical.
+
+Run from the repository root:
+    python -m benchmarks.bench_fanout --variants 50 --symbols 10 --bars 2000
+"""
+
+import argparse
+import tempfile
+import time
+from collections import deque
+
+from backtester.data import HistoricCSVDataHandler
+from backtester.engine import BacktestEngine, MultiStackEngine
+from backtester.execution import SimulatedExecutionHandler
+from backtester.portfolio import Portfolio
+from backtester.synthetic import generate_bar_stores, write_csvs
+from strategies.dmac import DualMovingAverageCrossover
+
+
+def variant_grid(n: int) -> list:
+    return [
+        {"short_window": 5 + k % 25, "long_window": 50 + 10 * (k // 25)}
+        for k in range(n)
+    ]
+
+
+def run_separate(csv_dir: str, symbols: list, grid: list) -> list:
+    curves = []
+    for params in grid:
+        events_queue = deque()
+        data_handler = HistoricCSVDataHandler(
+            events_queue, csv_dir, list(symbols), use_cache=False
+        )
+        strategy = DualMovingAverageCrossover(
+            events_queue, data_handler, symbols, **params
+        )
+        portfolio = Portfolio(events_queue, data_handler, 100000.0, symbols)
+        execution_handler = SimulatedExecutionHandler(events_queue)
+        BacktestEngine(data_handler, strategy, portfolio, execution_handler).run()
+        curves.append(portfolio.get_equity_curve())
+    return curves
+
+
+def run_fanout(csv_dir: str, symbols: list, grid: list) -> list:
+    data_handler = HistoricCSVDataHandler(
+        deque(), csv_dir, list(symbols), use_cache=False
+    )
+    engine = MultiStackEngine(data_handler)
+    for k, params in enumerate(grid):
+        engine.add_strategy(k, DualMovingAverageCrossover, params)
+    engine.run()
+    return [result["equity_curve"] for result in engine.results().values()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--variants", type=int, default=50)
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--bars", type=int, default=2000)
+    args = parser.parse_args()
+
+    grid = variant_grid(args.variants)
+    with tempfile.TemporaryDirectory() as csv_dir:
+        bar_stores = generate_bar_stores(args.symbols, args.bars)
+        write_csvs(bar_stores, csv_dir)
+        symbols = list(bar_stores)
+        timings = {}
+        for name, fn in (("separate", run_separate), ("fan-out", run_fanout)):
+            start = time.perf_counter()
+            timings[name] = (fn(csv_dir, symbols, grid), time.perf_counter() - start)
+            print(f"{name:>8}: {args.variants} variants in {timings[name][1]:.2f}s")
+
+    separate, fanout = timings["separate"][0], timings["fan-out"][0]
+    identical = all(a.equals(b) for a, b in zip(separate, fanout))
+    print(f"Equity curves identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
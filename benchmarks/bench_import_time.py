@@ -0,0 +1,95 @@
+# benchmarks/bench_import_time.py
+"""
+Cold-start import time of the core engine, guarded against regressions.
+
+Each module set is imported in a fresh interpreter under `python -X importtime`,
+several times; the fastest run is reported. Fails (exit code 1) if pandas or
+matplotlib get imported, or if the backtester's own import time exceeds the
+target. numpy is a hard dependency with a fixed cost of its own, so it is
+reported separately and not counted against the target.
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time --repeat 5 --target-ms 100
+"""
+
+import argparse
+import subprocess
+import sys
+
+CORE = (
+    "backtester.engine",
+    "backtester.event",
+    "backtester.data",
+    "backtester.portfolio",
+    "backtester.execution",
+    "backtester.strategy",
+    "strategies.dmac",
+)
+CASES = (
+    ("engine", ("backtester.engine",)),
+    ("core", CORE),
+    ("sweep", CORE + ("backtester.sweep", "backtester.walkforward")),
+)
+HEAVY = ("pandas", "matplotlib")
+
+
+def import_times(modules: tuple) -> tuple:
+    """
+    (total, numpy) cumulative import microseconds of one cold start, and the set
+    of HEAVY packages it loaded.
+    """
+    code = "import " + ", ".join(modules)
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    # Lines read "import time: self [us] | cumulative | imported package", in
+    # completion order, with nested imports indented under their importer. The
+    # interpreter's own startup ends with `site`; unindented lines after it are
+    # the statement's imports, whose cumulative times add up to its total.
+    total = numpy = 0
+    heavy = set()
+    after_site = False
+    for line in stderr.splitlines()[1:]:
+        _, cumulative, name = line[len("import time:") :].split("|")
+        package = name.strip().split(".")[0]
+        if package in HEAVY:
+            heavy.add(package)
+        if name.strip() == "numpy":
+            numpy = int(cumulative)
+        if name.startswith("  "):
+            continue
+        if after_site:
+            total += int(cumulative)
+        after_site = after_site or name.strip() == "site"
+    return total, numpy, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    ok = True
+    for name, modules in CASES:
+        runs = [import_times(modules) for _ in range(args.repeat)]
+        total = min(run[0] for run in runs) / 1000
+        numpy = min(run[1] for run in runs) / 1000
+        own = min(run[0] - run[1] for run in runs) / 1000  # All but numpy
+        heavy = sorted(set().union(*(run[2] for run in runs)))
+        passed = own <= args.target_ms and not heavy
+        ok &= passed
+        print(
+            f"{name:>6}: {total:6.1f} ms cold start ({numpy:.1f} ms numpy, "
+            f"{own:.1f} ms backtester) - {'OK' if passed else 'FAIL'}"
+            + (f", imported {', '.join(heavy)}" if heavy else "")
+        )
+    print(f"Target: backtester import time <= {args.target_ms:g} ms, no {HEAVY}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_live.py
+"""
+End-to-end tick-to-order latency of the asyncio engine under replay load.
+
+Replays N symbols x M synthetic bars through ReplayServer -> AsyncDataHandler ->
+DMAC -> Portfolio -> AsyncExecutionHandler. Three runs:
+- max: replay as fast as possible. The bounded queue stays full, so latency is
+  mostly queueing and the server's blocked time shows the backpressure.
+- paced: replay at --speed, i.e. a bar interval of 86400 / speed seconds.
+- slow: max speed with an artificially slow strategy (--slow-us per event); the
+  server blocks instead of buffering.
+
+Run from the repository root:
+    python -m benchmarks.bench_live --symbols 50 --bars 1000 --speed 20000000
+"""
+
+import argparse
+import asyncio
+import time
+from collections import deque
+
+from backtester.live import (
+    AsyncBacktestEngine,
+    AsyncDataHandler,
+    AsyncExecutionHandler,
+    ReplayServer,
+)
+from backtester.portfolio import Portfolio
+from backtester.synthetic import generate_bar_stores
+from strategies.dmac import DualMovingAverageCrossover
+
+
+async def run(bar_stores, speed, queue_size, slow_us, latency):
+    events_queue = deque()
+    symbol_list = list(bar_stores)
+    server = ReplayServer(bar_stores, symbol_list, speed, queue_size)
+    data_handler = AsyncDataHandler(events_queue, server.queue, symbol_list)
+    strategy = DualMovingAverageCrossover(events_queue, data_handler, symbol_list)
+    if slow_us:
+        calculate_signals = strategy.calculate_signals
+
+        def slow_calculate_signals(market_event):
+            deadline = time.perf_counter() + slow_us / 1e6
+            while time.perf_counter() < deadline:
+                pass
+            calculate_signals(market_event)
+
+        strategy.calculate_signals = slow_calculate_signals
+    portfolio = Portfolio(events_queue, data_handler, 100000.0, symbol_list)
+    execution_handler = AsyncExecutionHandler(
+        events_queue, ack_latency=latency, fill_latency=latency
+    )
+    engine = AsyncBacktestEngine(data_handler, strategy, portfolio, execution_handler)
+    start = time.perf_counter()
+    n_events = await engine.run_async(server)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {n_events:,} events in {elapsed:.2f}s ({n_events / elapsed:,.0f}/s), "
+        f"server blocked {server.blocked_seconds:.2f}s, queue size {queue_size}"
+    )
+    print("  " + engine.latency_report().replace("\n", "\n  "))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--speed", type=float, default=20_000_000.0)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--slow-us", type=float, default=50.0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Ack/fill seconds")
+    args = parser.parse_args()
+
+    bar_stores = generate_bar_stores(args.symbols, args.bars)
+    runs = (
+        ("max", None, 0.0),
+        (f"paced x{args.speed:,.0f}", args.speed, 0.0),
+        (f"slow strategy ({args.slow_us:g}us/event)", None, args.slow_us),
+    )
+    for name, speed, slow_us in runs:
+        print(name)
+        asyncio.run(run(bar_stores, speed, args.queue_size, slow_us, args.latency))
+
+
+if __name__ == "__main__":
+    main()
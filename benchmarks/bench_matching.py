@@ -0,0 +1,62 @@
+# benchmarks/bench_matching.py
+"""
+Per-bar cost of SimulatedExecutionHandler.on_market as resting orders pile up.
+
+Each run rests N limit and N stop orders away from the market, plus a small band of
+limits that bars keep crossing (refilled after each fill). Per-bar time should stay
+flat as N grows, because bars only pop the orders their range can reach.
+
+Run from the repository root:
+    python -m benchmarks.bench_matching --bars 20000
+"""
+
+import argparse
+import time
+from collections import deque
+
+from backtester.event import MarketEvent, OrderEvent
+from backtester.execution import SimulatedExecutionHandler
+
+
+def run(n_resting: int, n_bars: int) -> float:
+    events_queue = deque()
+    handler = SimulatedExecutionHandler(events_queue, max_participation=0.05)
+    for k in range(n_resting):
+        # Far from the market: never triggered
+        handler.execute_order(
+            OrderEvent(0, "A", "LMT", 100, "BUY", limit_price=50.0 - k * 1e-4), None
+        )
+        handler.execute_order(
+            OrderEvent(0, "A", "STP", 100, "BUY", stop_price=150.0 + k * 1e-4), None
+        )
+    active = [
+        OrderEvent(0, "A", "LMT", 500, "SELL", limit_price=100.5 + k * 0.01)
+        for k in range(20)
+    ]
+    for order_event in active:
+        handler.execute_order(order_event, None)
+
+    bar = MarketEvent(0, "A", 100.0, 101.0, 99.0, 100.0, 10_000)
+    start = time.perf_counter()
+    for _ in range(n_bars):
+        handler.on_market(bar)
+        for fill in events_queue:
+            if fill.order_id not in handler.open_orders:  # Fully filled: replace it
+                handler.execute_order(
+                    OrderEvent(0, "A", "LMT", 500, "SELL", limit_price=100.5), None
+                )
+        events_queue.clear()
+    return (time.perf_counter() - start) / n_bars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bars", type=int, default=20000)
+    args = parser.parse_args()
+    for n_resting in (10, 1_000, 10_000, 100_000):
+        per_bar = run(n_resting, args.bars)
+        print(f"{2 * n_resting:>8,} resting orders: {per_bar * 1e6:6.2f} us/bar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_monte_carlo.py
+"""
+Monte Carlo throughput: block-bootstrap paths over 10 years of daily returns, and
+trade-shuffle paths over a trade list. Target: 10,000 bootstrap paths in a few
+seconds.
+
+Run from the repository root:
+    python -m benchmarks.bench_monte_carlo --paths 10000 --workers 1
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from backtester.performance import (
+    display_monte_carlo_summary,
+    monte_carlo_returns,
+    monte_carlo_trades,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paths", type=int, default=10_000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--trades", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=2_000)
+    parser.add_argument("--workers", type=int, default=1, help="0: one per CPU")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0004, 0.01, 252 * args.years)
+    trade_pnl = rng.normal(50.0, 1000.0, args.trades)
+    n_workers = args.workers or None
+
+    start = time.perf_counter()
+    distributions = monte_carlo_returns(
+        returns,
+        args.paths,
+        seed=1,
+        chunk_size=args.chunk_size,
+        n_workers=n_workers,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Block bootstrap: {args.paths:,} x {len(returns):,} in {elapsed:.2f}s")
+    display_monte_carlo_summary(distributions)
+
+    start = time.perf_counter()
+    distributions = monte_carlo_trades(
+        trade_pnl,
+        100000.0,
+        args.paths,
+        replace=True,
+        seed=1,
+        chunk_size=args.chunk_size,
+        n_workers=n_workers,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"\nTrade resampling: {args.paths:,} x {args.trades:,} in {elapsed:.2f}s")
+    display_monte_carlo_summary(distributions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_resample.py
+"""
+Multi-timeframe runs on minute data: event loop with no aggregation, with the
+streaming BarAggregator, and with bars precomputed by resample_stores() and
+replayed by ResampledBarFeed.
+
+Run from the repository root:
+    python -m benchmarks.bench_resample --symbols 10 --days 60
+"""
+
+import argparse
+import time
+from collections import deque
+
+from backtester.data import ColumnarDataHandler
+from backtester.engine import BacktestEngine
+from backtester.resample import BarAggregator, ResampledBarFeed, resample_stores
+from backtester.strategy import Strategy
+from backtester.synthetic import MINUTES_PER_SESSION, generate_bar_stores
+
+TIMEFRAMES = ("5min", "15min", "1h", "1d")
+SESSION = ("09:30", "16:00")
+
+
+class BarCounter(Strategy):
+    def __init__(self, events_queue, data_handler, symbol_list):
+        super().__init__(events_queue, data_handler, symbol_list)
+        self.n_bars = 0
+
+    def calculate_signals(self, market_event):
+        pass
+
+    def on_bar(self, bar_event):
+        self.n_bars += 1
+
+
+def run(bar_stores, mode: str):
+    events_queue = deque()
+    symbol_list = list(bar_stores)
+    data_handler = ColumnarDataHandler(events_queue, bar_stores, symbol_list)
+    start = time.perf_counter()
+    aggregator = None
+    if mode == "streaming":
+        aggregator = BarAggregator(
+            events_queue, symbol_list, TIMEFRAMES, *SESSION, base_period="1min"
+        )
+    elif mode == "precomputed":
+        resampled = resample_stores(
+            bar_stores, TIMEFRAMES, *SESSION, base_period="1min"
+        )
+        aggregator = ResampledBarFeed(events_queue, symbol_list, resampled)
+    strategy = BarCounter(events_queue, data_handler, symbol_list)
+    BacktestEngine(data_handler, strategy, aggregator=aggregator).run()
+    return time.perf_counter() - start, strategy.n_bars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--days", type=int, default=60)
+    args = parser.parse_args()
+
+    bar_stores = generate_bar_stores(
+        args.symbols, args.days * MINUTES_PER_SESSION, calendar="minute"
+    )
+    n_base = sum(len(store) for store in bar_stores.values())
+    print(f"{n_base:,} minute bars, timeframes {', '.join(TIMEFRAMES)}")
+    for mode in ("none", "streaming", "precomputed"):
+        elapsed, n_bars = run(bar_stores, mode)
+        print(f"{mode:>12}: {elapsed:.2f}s, {n_bars:,} higher-timeframe bars")
+
+    start = time.perf_counter()
+    resample_stores(bar_stores, TIMEFRAMES, *SESSION)
+    print(f"resample_stores alone: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
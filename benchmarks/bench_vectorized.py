@@ -0,0 +1,41 @@
+# benchmarks/bench_vectorized.py
+"""
+Vectorized fast path against the event-driven engine: parity and speedup.
+
+Run from the repository root:
+    python -m benchmarks.bench_vectorized --symbols 5 --bars 50000
+"""
+
+import argparse
+import sys
+
+from backtester.synthetic import generate_bar_stores
+from backtester.vectorized import check_parity
+from strategies.bollinger_bands import BollingerBandReversion
+from strategies.dmac import DualMovingAverageCrossover
+
+CASES = (
+    (DualMovingAverageCrossover, {"short_window": 20, "long_window": 50}),
+    (BollingerBandReversion, {"window": 20, "num_std": 2.0}),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=5)
+    parser.add_argument("--bars", type=int, default=50000)
+    args = parser.parse_args()
+
+    bar_stores = generate_bar_stores(
+        args.symbols, args.bars, calendar="mixed", gap_prob=0.01
+    )
+    ok = True
+    for strategy_cls, params in CASES:
+        report = check_parity(strategy_cls, bar_stores, params=params)
+        print(f"{strategy_cls.__name__}: {report}")
+        ok &= report.ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
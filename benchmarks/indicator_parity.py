@@ -0,0 +1,127 @@
+# benchmarks/indicator_parity.py
+"""
+Numerical parity of backtester.indicators against their pandas rolling/ewm
+equivalents, plus streaming update throughput. Exits non-zero on a mismatch.
+
+Run from the repository root:
+    python -m benchmarks.indicator_parity --bars 20000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtester import indicators as ind
+
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+def random_bars(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n_bars)))
+    spread = np.abs(rng.normal(0.0, 0.005, n_bars)) * close
+    return pd.DataFrame(
+        {
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(1_000, 100_000, n_bars).astype(float),
+        }
+    )
+
+
+def pandas_references(bars: pd.DataFrame, period: int) -> dict:
+    close, high, low, volume = bars["close"], bars["high"], bars["low"], bars["volume"]
+    change = close.diff()
+    wilder = dict(alpha=1.0 / period, adjust=False, min_periods=period)
+    rs = (
+        change.clip(lower=0).ewm(**wilder).mean()
+        / (-change.clip(upper=0)).ewm(**wilder).mean()
+    )
+    true_range = pd.concat(
+        [high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1
+    ).max(axis=1)
+    mean = close.rolling(period).mean()
+    std0 = close.rolling(period).std(ddof=0)
+    return {
+        "SMA": mean,
+        "EMA": close.ewm(span=period, adjust=False, min_periods=period).mean(),
+        "RollingStd": close.rolling(period).std(),
+        "RSI": 100.0 - 100.0 / (1.0 + rs),
+        "Bollinger upper": mean + 2.0 * std0,
+        "Bollinger lower": mean - 2.0 * std0,
+        "ATR": true_range.ewm(**wilder).mean(),
+        "RollingMax": close.rolling(period).max(),
+        "RollingMin": close.rolling(period).min(),
+        "VWAP": (close * volume).rolling(period).sum() / volume.rolling(period).sum(),
+    }
+
+
+def streaming_values(bars: pd.DataFrame, period: int) -> dict:
+    makers = {
+        "SMA": lambda: ind.SMA(period),
+        "EMA": lambda: ind.EMA(period),
+        "RollingStd": lambda: ind.RollingStd(period),
+        "RSI": lambda: ind.RSI(period),
+        "Bollinger": lambda: ind.BollingerBands(period, 2.0),
+        "ATR": lambda: ind.ATR(period),
+        "RollingMax": lambda: ind.RollingMax(period),
+        "RollingMin": lambda: ind.RollingMin(period),
+        "VWAP": lambda: ind.VWAP(period),
+    }
+    high, low = bars["high"].tolist(), bars["low"].tolist()
+    close, volume = bars["close"].tolist(), bars["volume"].tolist()
+    results, timings = {}, {}
+    for name, make in makers.items():
+        indicator = make()
+        out = np.empty(len(close))
+        extra = np.empty((len(close), 2))
+        start = time.perf_counter()
+        for i in range(len(close)):
+            if name == "ATR":
+                out[i] = indicator.update(high[i], low[i], close[i])
+            elif name == "VWAP":
+                out[i] = indicator.update(close[i], volume[i])
+            else:
+                out[i] = indicator.update(close[i])
+            if name == "Bollinger":
+                extra[i] = indicator.upper, indicator.lower
+        timings[name] = len(close) / (time.perf_counter() - start)
+        if name == "Bollinger":
+            results["Bollinger upper"] = extra[:, 0]
+            results["Bollinger lower"] = extra[:, 1]
+        else:
+            results[name] = out
+    return results, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bars", type=int, default=20000)
+    parser.add_argument("--period", type=int, default=20)
+    args = parser.parse_args()
+
+    bars = random_bars(args.bars)
+    expected = pandas_references(bars, args.period)
+    actual, timings = streaming_values(bars, args.period)
+
+    failed = False
+    for name, reference in expected.items():
+        reference = reference.to_numpy()
+        ok = np.allclose(actual[name], reference, rtol=RTOL, atol=ATOL, equal_nan=True)
+        max_err = np.nanmax(np.abs(actual[name] - reference))
+        rate = timings[name.split()[0]]
+        print(
+            f"{name:>16}: {'ok' if ok else 'MISMATCH':>8}  max |err| {max_err:.2e}  "
+            f"{rate:,.0f} updates/sec"
+        )
+        failed |= not ok
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# benchmarks/run_suite.py
+"""
+Reproducible end-to-end benchmark suite.
+
+Every case generates deterministic synthetic data (backtester/synthetic.py), writes
+it as CSVs and runs a full backtest through BacktestEngine in a fresh subprocess.
+Each case reports:
+- events/sec for the event loop
+- startup time (imports plus a warm-cache data load)
+- peak RSS
+Cases vary along three axes: bars per symbol, number of symbols and strategy.
+
+Results are written as JSON. Pass --baseline to compare against an earlier results
+file; cases that got slower or bigger than --threshold are flagged and the exit
+status is 1.
+
+Run from the repository root:
+    python -m benchmarks.run_suite --preset quick --output bench_results.json
+    python -m benchmarks.run_suite --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+STRATEGIES = {
+    "dmac": ("strategies.dmac", "DualMovingAverageCrossover"),
+    "rsi": ("strategies.rsi_reversal", "RSIReversal"),
+    "bollinger": ("strategies.bollinger_bands", "BollingerBandReversion"),
+}
+
+
+def _case(axis, symbols, bars, strategy="dmac", calendar="business", gap_prob=0.0):
+    name = f"{axis}/{strategy}-{symbols}x{bars}-{calendar}"
+    if gap_prob:
+        name += f"-gaps{gap_prob:g}"
+    return {
+        "name": name,
+        "symbols": symbols,
+        "bars": bars,
+        "strategy": strategy,
+        "calendar": calendar,
+        "gap_prob": gap_prob,
+    }
+
+
+PRESETS = {
+    "quick": [
+        _case("bars", 1, 10_000),
+        _case("bars", 1, 50_000),
+        _case("symbols", 10, 5_000),
+        _case("symbols", 50, 2_000),
+        _case("strategies", 5, 5_000, "dmac"),
+        _case("strategies", 5, 5_000, "rsi"),
+        _case("strategies", 5, 5_000, "bollinger"),
+        _case("calendars", 10, 5_000, calendar="mixed", gap_prob=0.02),
+    ],
+    "full": [
+        _case("bars", 1, 10_000),
+        _case("bars", 1, 100_000),
+        _case("bars", 1, 1_000_000, calendar="minute"),
+        _case("symbols", 10, 10_000),
+        _case("symbols", 100, 10_000),
+        _case("symbols", 1_000, 1_000),
+        _case("strategies", 20, 10_000, "dmac"),
+        _case("strategies", 20, 10_000, "rsi"),
+        _case("strategies", 20, 10_000, "bollinger"),
+        _case("calendars", 100, 10_000, calendar="mixed", gap_prob=0.02),
+    ],
+}
+
+# Metric -> +1 if higher is better, -1 if lower is better
+METRICS = {"events_per_sec": 1, "startup_s": -1, "peak_rss_mb": -1}
+
+
+def run_case(case: dict, csv_dir: str) -> dict:
+    """Runs one case in this process (called in a fresh subprocess by the suite)."""
+    start = time.perf_counter()
+    import importlib
+    from collections import deque
+
+    from backtester.data import HistoricCSVDataHandler
+    from backtester.engine import BacktestEngine
+    from backtester.execution import SimulatedExecutionHandler
+    from backtester.portfolio import Portfolio
+
+    module, class_name = STRATEGIES[case["strategy"]]
+    strategy_cls = getattr(importlib.import_module(module), class_name)
+    symbols = [f"SYM{k:04d}" for k in range(case["symbols"])]
+    events_queue = deque()
+    data_handler = HistoricCSVDataHandler(events_queue, csv_dir, symbols)
+    startup = time.perf_counter() - start
+
+    strategy = strategy_cls(events_queue, data_handler, symbols)
+    portfolio = Portfolio(events_queue, data_handler, 100000.0, symbols)
+    execution_handler = SimulatedExecutionHandler(events_queue)
+    engine = BacktestEngine(data_handler, strategy, portfolio, execution_handler)
+    start = time.perf_counter()
+    n_events = engine.run()
+    seconds = time.perf_counter() - start
+    portfolio.get_equity_curve()
+
+    try:
+        import resource
+
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        if sys.platform == "darwin":
+            peak_rss_mb /= 1024  # ru_maxrss is in bytes on macOS
+    except ImportError:  # Windows
+        peak_rss_mb = None
+    return {
+        "events": n_events,
+        "seconds": seconds,
+        "events_per_sec": n_events / seconds if seconds else 0.0,
+        "startup_s": startup,
+        "peak_rss_mb": peak_rss_mb,
+    }
+
+
+def _prepare_data(case: dict, root: str, datasets: dict) -> str:
+    from backtester.data import HistoricCSVDataHandler
+    from backtester.synthetic import generate_bar_stores, write_csvs
+
+    key = (case["symbols"], case["bars"], case["calendar"], case["gap_prob"])
+    if key not in datasets:
+        csv_dir = os.path.join(root, f"data{len(datasets)}")
+        stores = generate_bar_stores(
+            case["symbols"],
+            case["bars"],
+            calendar=case["calendar"],
+            gap_prob=case["gap_prob"],
+        )
+        write_csvs(stores, csv_dir)
+        HistoricCSVDataHandler(None, csv_dir, list(stores))  # Warm the binary cache
+        datasets[key] = csv_dir
+    return datasets[key]
+
+
+def _run_in_subprocess(case: dict, csv_dir: str) -> dict:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.run_suite",
+            "--run-case",
+            json.dumps(case),
+            csv_dir,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _metadata() -> dict:
+    import numpy
+    import pandas
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: list, baseline: list, threshold: float) -> list:
+    """Returns a list of regression descriptions for cases present in both runs."""
+    base = {r["name"]: r for r in baseline}
+    regressions = []
+    for result in results:
+        old = base.get(result["name"])
+        if old is None:
+            continue
+        for metric, direction in METRICS.items():
+            new_value, old_value = result.get(metric), old.get(metric)
+            if not new_value or not old_value:
+                continue
+            change = (new_value - old_value) / old_value
+            if direction * change < -threshold:
+                regressions.append(
+                    f"{result['name']}: {metric} {old_value:,.3g} -> {new_value:,.3g} "
+                    f"({change:+.1%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--repeat", type=int, default=3, help="Keep the best of N runs")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument(
+        "--run-case", nargs=2, metavar=("CASE", "CSV_DIR"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case[0]), args.run_case[1])))
+        return
+
+    results = []
+    datasets = {}
+    with tempfile.TemporaryDirectory() as root:
+        for case in PRESETS[args.preset]:
+            csv_dir = _prepare_data(case, root, datasets)
+            runs = [_run_in_subprocess(case, csv_dir) for _ in range(args.repeat)]
+            best = max(runs, key=lambda r: r["events_per_sec"])
+            best["startup_s"] = min(r["startup_s"] for r in runs)
+            results.append(dict(case, **best))
+            rss = f"{best['peak_rss_mb']:.0f} MB" if best["peak_rss_mb"] else "n/a"
+            print(
+                f"{case['name']:<42} {best['events_per_sec']:>12,.0f} events/s  "
+                f"startup {best['startup_s']:.3f}s  peak {rss}"
+            )
+
+    with open(args.output, "w") as f:
+        json.dump({"meta": _metadata(), "results": results}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# strategies/bollinger_bands.py (Bollinger Band mean reversion)
+import numpy as np
+from backtester.strategy import EXIT, LONG, Strategy, dedupe_signals
+from backtester.event import EventType, SignalEvent
+from backtester.indicators import BollingerBands, rolling_mean_std
+
+
+class BollingerBandReversion(Strategy):
+    """
+    Goes long when the close drops below the lower band and exits once it reverts
+    to the middle band.
+    """
+
+    def __init__(
+        self,
+        events_queue,
+        data_handler,
+        symbol_list: list,
+        window=20,
+        num_std=2.0,
+    ):
+        super().__init__(events_queue, data_handler, symbol_list)
+        self.window = window
+        self.num_std = num_std
+        self.bands = {s: BollingerBands(window, num_std) for s in symbol_list}
+        self.signals = {s: "" for s in symbol_list}  # To avoid duplicate signals
+
+    def calculate_signals(self, market_event):
+        if market_event.type == EventType.MARKET:
+            symbol = market_event.symbol
+            close = market_event.close
+            bands = self.bands[symbol]
+            bands.update(close)
+            if not bands.ready:
+                return
+
+            current_signal = ""
+            if close < bands.lower:
+                current_signal = "LONG"  # Stretched below the lower band
+            elif close >= bands.value:
+                current_signal = "EXIT"  # Reverted to the mean
+
+            if current_signal and self.signals[symbol] != current_signal:  # New signal
+                self.events_queue.append(
+                    SignalEvent(
+                        timestamp=market_event.timestamp,
+                        symbol=symbol,
+                        direction=current_signal,
+                    )
+                )
+                self.signals[symbol] = current_signal
+
+    def compute_signals(self, bars) -> np.ndarray:
+        """Whole-array version of calculate_signals() for the vectorized runner."""
+        close = bars.close
+        raw = np.zeros(len(close), dtype=np.int8)
+        if len(close) < self.window:
+            return raw
+        middle, std = rolling_mean_std(close, self.window)  # O(n), any window
+        lower = middle - self.num_std * std
+        ready_close = close[self.window - 1 :]
+        raw[self.window - 1 :] = np.where(
+            ready_close < lower, LONG, np.where(ready_close >= middle, EXIT, 0)
+        )
+        return dedupe_signals(raw)
@@ -0,0 +1,50 @@
+# strategies/cross_sectional_momentum.py (Cross-sectional momentum)
+import numpy as np
+from backtester.strategy import CrossSectionalStrategy
+
+
+class CrossSectionalMomentum(CrossSectionalStrategy):
+    """
+    Every `rebalance_every` timestamps, ranks the universe by return over the last
+    `lookback` timestamps and holds the top_n symbols equally weighted, with
+    `gross` of equity invested in total.
+    """
+
+    def __init__(
+        self,
+        events_queue,
+        data_handler,
+        symbol_list: list,
+        lookback=20,
+        top_n=10,
+        rebalance_every=5,
+        gross=0.95,
+    ):
+        super().__init__(events_queue, data_handler, symbol_list)
+        self.lookback = lookback
+        self.top_n = top_n
+        self.rebalance_every = rebalance_every
+        self.gross = gross
+        # Closes of the last lookback + 1 timestamps, one row per timestamp (ring)
+        self.history = np.full((lookback + 1, len(symbol_list)), np.nan)
+        self._row = 0
+        self._n_batches = 0
+
+    def rebalance(self, cross_section):
+        close = cross_section.close
+        self.history[self._row] = close
+        self._row = (self._row + 1) % len(self.history)  # Now the oldest row
+        self._n_batches += 1
+        if self._n_batches <= self.lookback or self._n_batches % self.rebalance_every:
+            return None
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            momentum = close / self.history[self._row] - 1.0
+        valid = np.isfinite(momentum)
+        weights = np.zeros(len(close))
+        k = min(self.top_n, int(valid.sum()))
+        if k:
+            ranked = np.where(valid, momentum, -np.inf)
+            top = np.argpartition(-ranked, k - 1)[:k]
+            weights[top] = self.gross / k
+        return weights
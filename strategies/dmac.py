@@ -1,7 +1,8 @@
 # strategies/dmac.py (Dual Moving Average Crossover)
-import pandas as pd
-from backtester.strategy import Strategy
-from backtester.event import SignalEvent
+import numpy as np
+from backtester.strategy import EXIT, LONG, Strategy, dedupe_signals
+from backtester.event import EventType, SignalEvent
+from backtester.indicators import SMA, rolling_mean
 
 
 class DualMovingAverageCrossover(Strategy):
@@ -16,76 +17,53 @@ class DualMovingAverageCrossover(Strategy):
         super().__init__(events_queue, data_handler, symbol_list)
         self.short_window = short_window
         self.long_window = long_window
-        # Store recent close prices to calculate MAs
-        self.prices = {s: pd.Series(dtype=float) for s in symbol_list}
+        # Streaming moving averages: O(1) per bar, previous values kept for the cross test
+        self.short_ma = {s: SMA(short_window) for s in symbol_list}
+        self.long_ma = {s: SMA(long_window) for s in symbol_list}
         self.signals = {s: "" for s in symbol_list}  # To avoid duplicate signals
 
     def calculate_signals(self, market_event):
-        if market_event.type == "MARKET":
+        if market_event.type == EventType.MARKET:
             symbol = market_event.symbol
-            new_price = market_event.data["close"]
+            new_price = market_event.close
 
-            # Append new price and keep only necessary length
-            self.prices[symbol] = pd.concat(
-                [
-                    self.prices[symbol],
-                    pd.Series([new_price], index=[market_event.timestamp]),
-                ]
-            )
-            self.prices[symbol] = self.prices[symbol][
-                -self.long_window :
-            ]  # Keep only relevant window
+            short_ma = self.short_ma[symbol]
+            long_ma = self.long_ma[symbol]
+            short_ma.update(new_price)
+            long_ma.update(new_price)
 
-            if len(self.prices[symbol]) >= self.long_window:
-                short_ma = (
-                    self.prices[symbol]
-                    .rolling(window=self.short_window)
-                    .mean()
-                    .iloc[-1]
-                )
-                long_ma = (
-                    self.prices[symbol].rolling(window=self.long_window).mean().iloc[-1]
+            if not long_ma.ready:
+                return
+
+            current_signal = ""
+            if short_ma.value > long_ma.value and short_ma.prev <= long_ma.prev:
+                current_signal = "LONG"  # Buy signal (short MA crosses above long MA)
+            elif short_ma.value < long_ma.value and short_ma.prev >= long_ma.prev:
+                current_signal = (
+                    "EXIT"  # Sell signal (short MA crosses below long MA or exit long)
                 )
 
-                current_signal = ""
-                if (
-                    short_ma > long_ma
-                    and self.prices[symbol]
-                    .iloc[-2]
-                    .rolling(window=self.short_window)
-                    .mean()
-                    <= self.prices[symbol]
-                    .iloc[-2]
-                    .rolling(window=self.long_window)
-                    .mean()
-                ):
-                    current_signal = (
-                        "LONG"  # Buy signal (short MA crosses above long MA)
-                    )
-                elif (
-                    short_ma < long_ma
-                    and self.prices[symbol]
-                    .iloc[-2]
-                    .rolling(window=self.short_window)
-                    .mean()
-                    >= self.prices[symbol]
-                    .iloc[-2]
-                    .rolling(window=self.long_window)
-                    .mean()
-                ):
-                    current_signal = "EXIT"  # Sell signal (short MA crosses below long MA or exit long)
+            if current_signal and self.signals[symbol] != current_signal:  # New signal
+                sig_event = SignalEvent(
+                    timestamp=market_event.timestamp,
+                    symbol=symbol,
+                    direction=current_signal,
+                )
+                self.events_queue.append(sig_event)
+                self.signals[symbol] = current_signal
 
-                if (
-                    current_signal and self.signals[symbol] != current_signal
-                ):  # New signal
-                    sig_event = SignalEvent(
-                        timestamp=market_event.timestamp,
-                        symbol=symbol,
-                        direction=current_signal,
-                    )
-                    self.events_queue.append(sig_event)
-                    self.signals[symbol] = current_signal
-                elif (
-                    not current_signal and self.signals[symbol] == "LONG"
-                ):  # Condition no longer met, but no explicit exit signal from MA cross-down
-                    pass  # Hold, or implement specific exit logic if needed
+    def compute_signals(self, bars) -> np.ndarray:
+        """Whole-array version of calculate_signals() for the vectorized runner."""
+        close = bars.close
+        raw = np.zeros(len(close), dtype=np.int8)
+        if len(close) <= self.long_window:
+            return raw
+        # Align both averages on the bars where the long MA exists
+        short_ma = rolling_mean(close, self.short_window)  # O(n), any window
+        long_ma = rolling_mean(close, self.long_window)
+        short_ma = short_ma[self.long_window - self.short_window :]
+        s, l = short_ma[1:], long_ma[1:]
+        s_prev, l_prev = short_ma[:-1], long_ma[:-1]
+        raw[self.long_window :][(s > l) & (s_prev <= l_prev)] = LONG
+        raw[self.long_window :][(s < l) & (s_prev >= l_prev)] = EXIT
+        return dedupe_signals(raw)
@@ -0,0 +1,49 @@
+# strategies/rsi_reversal.py (RSI mean reversion)
+from backtester.strategy import Strategy
+from backtester.event import EventType, SignalEvent
+from backtester.indicators import RSI
+
+
+class RSIReversal(Strategy):
+    """
+    Goes long when RSI crosses back up through the oversold level and exits when it
+    rises above the overbought level.
+    """
+
+    def __init__(
+        self,
+        events_queue,
+        data_handler,
+        symbol_list: list,
+        period=14,
+        oversold=30.0,
+        overbought=70.0,
+    ):
+        super().__init__(events_queue, data_handler, symbol_list)
+        self.period = period
+        self.oversold = oversold
+        self.overbought = overbought
+        self.rsi = {s: RSI(period) for s in symbol_list}
+        self.signals = {s: "" for s in symbol_list}  # To avoid duplicate signals
+
+    def calculate_signals(self, market_event):
+        if market_event.type == EventType.MARKET:
+            symbol = market_event.symbol
+            rsi = self.rsi[symbol]
+            rsi.update(market_event.close)
+
+            current_signal = ""
+            if rsi.prev < self.oversold <= rsi.value:
+                current_signal = "LONG"  # Recovering from oversold
+            elif rsi.value > self.overbought:
+                current_signal = "EXIT"  # Overbought, take profit
+
+            if current_signal and self.signals[symbol] != current_signal:  # New signal
+                self.events_queue.append(
+                    SignalEvent(
+                        timestamp=market_event.timestamp,
+                        symbol=symbol,
+                        direction=current_signal,
+                    )
+                )
+                self.signals[symbol] = current_signal
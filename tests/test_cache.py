@@ -0,0 +1,106 @@
+# tests/test_cache.py
+import os
+
+import numpy as np
+import pytest
+
+from backtester.cache import COLUMNS, load_bar_store
+from backtester.data import HistoricCSVDataHandler
+
+pytest.importorskip("pandas")  # The CSV parser
+
+HEADER = "Date,Open,High,Low,Close,Adj Close,Volume\n"
+ROWS = [
+    "2020-01-02,100.0,101.0,99.0,100.5,100.5,1000\n",
+    "2020-01-03,100.5,102.0,100.0,101.5,101.5,1200\n",
+    "2020-01-06,101.5,103.0,101.0,102.5,102.5,900\n",
+]
+
+
+class CountingBuild:
+    """HistoricCSVDataHandler's CSV parser, counting how often it runs."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return HistoricCSVDataHandler._read_csv(path)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "AAA_1d.csv"
+    path.write_text(HEADER + "".join(ROWS))
+    return str(path)
+
+
+def load(source, build):
+    return load_bar_store(source, build, os.path.join(os.path.dirname(source), "c"))
+
+
+def entry_path(source, name):
+    return os.path.join(os.path.dirname(source), "c", os.path.basename(source), name)
+
+
+def bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_unchanged_source_is_not_rebuilt(source):
+    build = CountingBuild()
+    first = load(source, build)
+    second = load(source, build)
+    assert build.calls == 1
+    assert not second.close.flags.writeable  # Mapped read-only from the cache
+    np.testing.assert_array_equal(second.close, first.close)
+
+
+def test_size_change_rebuilds(source):
+    build = CountingBuild()
+    load(source, build)
+    with open(source, "a") as f:
+        f.write("2020-01-07,102.5,104.0,102.0,103.5,103.5,800\n")
+    store = load(source, build)
+    assert build.calls == 2
+    assert len(store) == 4
+
+
+def test_touched_source_with_same_content_is_not_rebuilt(source):
+    build = CountingBuild()
+    load(source, build)
+    bump_mtime(source)
+    store = load(source, build)
+    assert build.calls == 1  # Same SHA-1
+    assert len(store) == 3
+    # The entry now records the new mtime, so the next load skips the hash
+    with open(entry_path(source, "meta.json")) as f:
+        assert f'"mtime_ns": {os.stat(source).st_mtime_ns}' in f.read()
+
+
+def test_same_size_content_change_rebuilds(source):
+    build = CountingBuild()
+    load(source, build)
+    with open(source, "w") as f:
+        f.write(HEADER + "".join(ROWS).replace("102.5,102.5", "102.7,102.7"))
+    bump_mtime(source)
+    store = load(source, build)
+    assert build.calls == 2
+    assert store.close[-1] == 102.7
+
+
+@pytest.mark.parametrize("damage", ["missing column", "truncated column", "no meta"])
+def test_partial_entry_rebuilds(source, damage):
+    build = CountingBuild()
+    load(source, build)
+    column = entry_path(source, f"{COLUMNS[-1]}.npy")
+    if damage == "missing column":
+        os.remove(column)
+    elif damage == "truncated column":
+        os.truncate(column, os.path.getsize(column) - 8)
+    else:
+        os.remove(entry_path(source, "meta.json"))
+    store = load(source, build)
+    assert build.calls == 2
+    np.testing.assert_array_equal(store.volume, [1000, 1200, 900])
@@ -0,0 +1,107 @@
+# tests/test_checkpoint.py
+import itertools
+from collections import deque
+
+import numpy as np
+import pytest
+
+from backtester import checkpoint
+from backtester import event as event_module
+from backtester.data import ColumnarDataHandler
+from backtester.engine import BacktestEngine
+from backtester.execution import SimulatedExecutionHandler
+from backtester.portfolio import Portfolio
+from backtester.synthetic import generate_bar_stores
+from strategies.dmac import DualMovingAverageCrossover
+
+
+@pytest.fixture(scope="module")
+def stores():
+    return generate_bar_stores(3, 1500, calendar="mixed")
+
+
+@pytest.fixture(autouse=True)
+def fresh_order_ids(monkeypatch):
+    # Order ids come from a process-wide counter; start every run from the same id
+    monkeypatch.setattr(event_module, "_order_ids", itertools.count(1))
+
+
+def build(stores):
+    symbols = list(stores)
+    events_queue = deque()
+    data_handler = ColumnarDataHandler(events_queue, stores, list(symbols))
+    strategy = DualMovingAverageCrossover(
+        events_queue, data_handler, symbols, short_window=10, long_window=40
+    )
+    # Downsampled, so a pending equity sample is part of the saved state too
+    portfolio = Portfolio(events_queue, data_handler, 100000.0, symbols, record_every=7)
+    execution_handler = SimulatedExecutionHandler(events_queue)
+    engine = BacktestEngine(data_handler, strategy, portfolio, execution_handler)
+    return engine, portfolio
+
+
+def test_resume_mid_stream_is_bit_identical(stores, tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    engine, portfolio = build(stores)
+    # The run is not a multiple of 1000 batches long: the last checkpoint is
+    # taken mid-stream
+    total = engine.run(checkpoint_every=1000, checkpoint_path=path)
+    portfolio.finish()
+    next_id = checkpoint._next_order_id()
+
+    event_module._order_ids = itertools.count(1)  # As in a fresh process
+    resumed, resumed_portfolio = build(stores)
+    n_resumed = resumed.resume(path)
+    resumed_portfolio.finish()
+
+    assert 0 < n_resumed < total
+    assert resumed.events_processed == engine.events_processed
+    for name in ("timestamps",) + resumed_portfolio.equity_recorder.COLUMNS:
+        np.testing.assert_array_equal(
+            resumed_portfolio.equity_recorder.column(name),
+            portfolio.equity_recorder.column(name),
+        )
+    resumed_fills = resumed_portfolio.ledger.columns()
+    for name, column in portfolio.ledger.columns().items():
+        np.testing.assert_array_equal(resumed_fills[name], column)
+    assert len(resumed_fills["order_ids"]) > 10
+    # Order ids continue from the checkpoint rather than restarting at 1
+    assert checkpoint._next_order_id() == next_id
+
+
+def test_restore_keeps_order_ids_ahead_of_the_process(stores, tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    engine, _ = build(stores)
+    engine.run(checkpoint_every=1000, checkpoint_path=path)
+    event_module._order_ids = itertools.count(10**6)  # This process is further on
+    resumed, _ = build(stores)
+    checkpoint.load_checkpoint(resumed, path)
+    assert checkpoint._next_order_id() == 10**6
+
+
+def test_bad_header_raises(stores, tmp_path):
+    engine, _ = build(stores)
+    path = tmp_path / "run.ckpt"
+    engine.checkpoint(str(path))
+    data = path.read_bytes()
+
+    path.write_bytes(b"NOTACKPT" + data[8:])
+    with pytest.raises(ValueError, match="not a backtest checkpoint"):
+        checkpoint.load_checkpoint(build(stores)[0], str(path))
+
+    version = len(checkpoint.MAGIC)
+    path.write_bytes(
+        data[:version]
+        + bytes([checkpoint.CHECKPOINT_VERSION + 1])
+        + data[version + 1 :]
+    )
+    with pytest.raises(ValueError, match="Unsupported checkpoint version"):
+        checkpoint.load_checkpoint(build(stores)[0], str(path))
+
+
+def test_state_from_another_version_raises(stores):
+    engine, _ = build(stores)
+    state = checkpoint.engine_state(engine)
+    state["version"] = checkpoint.CHECKPOINT_VERSION - 1
+    with pytest.raises(ValueError, match="Unsupported checkpoint version"):
+        checkpoint.restore_engine_state(build(stores)[0], state)
@@ -0,0 +1,99 @@
+# tests/test_data.py
+from collections import deque
+
+import numpy as np
+import pytest
+
+from backtester.data import HistoricCSVDataHandler, StreamingCSVDataHandler
+
+pytest.importorskip("pandas")  # Both handlers parse CSVs with pandas
+
+SYMBOLS = ["AAA", "BBB", "CCC"]
+
+
+@pytest.fixture(scope="module")
+def csv_dir(tmp_path_factory):
+    """
+    Three symbols over partly overlapping business days, each missing some of
+    them, long enough (~200 KB per file) that _seek bisects before scanning.
+    """
+    directory = tmp_path_factory.mktemp("csv")
+    rng = np.random.default_rng(0)
+    days = np.arange(np.datetime64("2000-01-03"), np.datetime64("2016-01-01"))
+    days = days[np.is_busday(days)]
+    for k, symbol in enumerate(SYMBOLS):
+        keep = days[200 * k : len(days) - 150 * k]
+        keep = keep[rng.random(len(keep)) > 0.1]
+        close = 50.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, len(keep))))
+        lines = ["Date,Open,High,Low,Close,Adj Close,Volume"]
+        for day, c in zip(keep, close):
+            lines.append(
+                f"{day},{c * 0.99:.4f},{c * 1.01:.4f},{c * 0.98:.4f},{c:.4f},"
+                f"{c:.4f},{int(rng.integers(1_000, 100_000))}"
+            )
+        (directory / f"{symbol}_1d.csv").write_text("\n".join(lines) + "\n")
+    return str(directory)
+
+
+def event_stream(data_handler):
+    events = []
+    while data_handler.update_bars():
+        while data_handler.events_queue:
+            e = data_handler.events_queue.popleft()
+            events.append(
+                (
+                    e.timestamp,
+                    e.symbol,
+                    e.open,
+                    e.high,
+                    e.low,
+                    e.close,
+                    e.adj_close,
+                    e.volume,
+                    e.last_in_batch,
+                )
+            )
+    return events
+
+
+def assert_same_stream(csv_dir, start_date, end_date, chunk_bytes):
+    expected = event_stream(
+        HistoricCSVDataHandler(
+            deque(), csv_dir, list(SYMBOLS), start_date, end_date, use_cache=False
+        )
+    )
+    streaming = StreamingCSVDataHandler(
+        deque(), csv_dir, list(SYMBOLS), start_date, end_date, chunk_bytes
+    )
+    actual = event_stream(streaming)
+    assert actual == expected
+    # Every reader is closed once its file is exhausted or past end_date
+    assert all(reader.file is None for reader in streaming._readers)
+    return actual
+
+
+# 999 bytes is not a multiple of the row length, so chunks end mid-row
+@pytest.mark.parametrize("chunk_bytes", [999, 1 << 20])
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [
+        (None, None),
+        ("2006-07-04", None),  # A holiday: starts on the next bar
+        (None, "2009-12-31"),
+        ("2003-03-15", "2003-04-15"),  # Starts on a weekend
+        ("2001-01-02", "2001-01-02"),  # A single day
+        ("1990-01-01", "1999-01-01"),  # Before every file
+        ("2020-01-01", None),  # After every file
+    ],
+)
+def test_streaming_matches_historic(csv_dir, chunk_bytes, start_date, end_date):
+    events = assert_same_stream(csv_dir, start_date, end_date, chunk_bytes)
+    if start_date is None and end_date is None:
+        assert len(events) > 10_000
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date", [(None, "2000-03-01"), ("2012-05-05", "2012-06-30")]
+)
+def test_streaming_chunks_shorter_than_a_row(csv_dir, start_date, end_date):
+    assert_same_stream(csv_dir, start_date, end_date, chunk_bytes=16)
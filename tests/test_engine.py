@@ -0,0 +1,85 @@
+# tests/test_engine.py
+from collections import deque
+
+import numpy as np
+import pytest
+
+from backtester.data import ColumnarDataHandler
+from backtester.engine import BacktestEngine, MultiStackEngine
+from backtester.event import MarketEventPool
+from backtester.execution import SimulatedExecutionHandler
+from backtester.portfolio import Portfolio
+from backtester.synthetic import generate_bar_stores
+from strategies.dmac import DualMovingAverageCrossover
+
+GRID = [
+    {"short_window": 5, "long_window": 20},
+    {"short_window": 10, "long_window": 40},
+    {"short_window": 20, "long_window": 60},
+]
+
+
+@pytest.fixture(scope="module")
+def stores():
+    # Mixed calendars, so batches differ in size from one timestamp to the next
+    return generate_bar_stores(4, 800, calendar="mixed")
+
+
+def stack(events_queue, data_handler, params):
+    symbols = data_handler.symbol_list
+    return (
+        DualMovingAverageCrossover(events_queue, data_handler, symbols, **params),
+        Portfolio(events_queue, data_handler, 100000.0, symbols),
+        SimulatedExecutionHandler(events_queue),
+    )
+
+
+def run_separate(stores, params) -> Portfolio:
+    events_queue = deque()
+    data_handler = ColumnarDataHandler(events_queue, stores, list(stores))
+    strategy, portfolio, execution_handler = stack(events_queue, data_handler, params)
+    BacktestEngine(data_handler, strategy, portfolio, execution_handler).run()
+    return portfolio
+
+
+def assert_same_run(portfolio, expected):
+    np.testing.assert_array_equal(portfolio.total_equity(), expected.total_equity())
+    fills = portfolio.ledger.columns()
+    assert len(fills["price"]) > 0
+    for name, column in expected.ledger.columns().items():
+        if name != "order_ids":  # Drawn from one process-wide counter
+            np.testing.assert_array_equal(fills[name], column)
+
+
+@pytest.mark.parametrize("pooled", [False, True])
+def test_fanout_matches_separate_runs(stores, pooled):
+    data_handler = ColumnarDataHandler(
+        deque(), stores, list(stores), MarketEventPool() if pooled else None
+    )
+    engine = MultiStackEngine(data_handler)
+    # One stack built by add_strategy, the others prebuilt through add_stack
+    engine.add_strategy("0", DualMovingAverageCrossover, GRID[0])
+    for k, params in enumerate(GRID[1:], 1):
+        engine.add_stack(str(k), *stack(deque(), data_handler, params))
+    n_events = engine.run()
+
+    results = engine.results(equity_curves=False)
+    for k, params in enumerate(GRID):
+        expected = run_separate(stores, params)
+        assert_same_run(engine.stacks[str(k)].portfolio, expected)
+        assert results[str(k)]["total_return"] == pytest.approx(
+            expected.total_equity()[-1] / 100000.0 - 1.0
+        )
+    assert n_events == sum(s.events_processed for s in engine.stacks.values())
+
+
+def test_stack_must_have_its_own_queue(stores):
+    data_handler = ColumnarDataHandler(deque(), stores, list(stores))
+    engine = MultiStackEngine(data_handler)
+    with pytest.raises(ValueError, match="own events queue"):
+        engine.add_stack("shared", *stack(data_handler.events_queue, data_handler, {}))
+    strategy, portfolio, _ = stack(deque(), data_handler, {})
+    with pytest.raises(ValueError, match="different queues"):
+        engine.add_stack(
+            "mixed", strategy, portfolio, SimulatedExecutionHandler(deque())
+        )
@@ -0,0 +1,105 @@
+# tests/test_execution.py
+from collections import deque
+
+import numpy as np
+import pytest
+
+from backtester.event import MarketEvent, OrderEvent
+from backtester.execution import SimulatedExecutionHandler
+
+
+def bar(day, open, high, low, close=None, volume=1_000_000):
+    timestamp = np.datetime64("2020-01-01") + np.timedelta64(day, "D")
+    close = open if close is None else close
+    return MarketEvent(timestamp, "AAA", open, high, low, close, volume)
+
+
+def handler():
+    return SimulatedExecutionHandler(
+        deque(), commission_per_share=0.0, slippage_pct=0.0
+    )
+
+
+def fills(execution_handler):
+    return [
+        (f.direction, f.quantity, f.fill_price) for f in execution_handler.events_queue
+    ]
+
+
+def stop_limit(direction, stop, limit, order_id=1, quantity=100):
+    return OrderEvent(
+        None, "AAA", "STP_LMT", quantity, direction, limit, stop, order_id
+    )
+
+
+def test_buy_stop_limit_triggered_intrabar_fills_at_stop():
+    execution_handler = handler()
+    execution_handler.execute_order(stop_limit("BUY", 105.0, 106.0), None)
+    execution_handler.on_market(bar(0, 100.0, 107.0, 99.0))
+    assert fills(execution_handler) == [("BUY", 100, 105.0)]
+
+
+def test_sell_stop_limit_triggered_intrabar_fills_at_stop():
+    execution_handler = handler()
+    execution_handler.execute_order(stop_limit("SELL", 95.0, 94.0), None)
+    execution_handler.on_market(bar(0, 100.0, 101.0, 93.0))
+    assert fills(execution_handler) == [("SELL", 100, 95.0)]
+
+
+def test_buy_stop_limit_gap_up_fills_at_open_within_limit():
+    execution_handler = handler()
+    execution_handler.execute_order(stop_limit("BUY", 105.0, 110.0), None)
+    execution_handler.on_market(bar(0, 108.0, 109.0, 107.0))
+    assert fills(execution_handler) == [("BUY", 100, 108.0)]
+
+
+def test_buy_stop_limit_gap_above_limit_rests_until_next_bar():
+    execution_handler = handler()
+    execution_handler.execute_order(stop_limit("BUY", 105.0, 106.0), None)
+    # Triggers at the open, 108, above the limit: no fill on the trigger bar even
+    # though the bar later trades down through the limit
+    execution_handler.on_market(bar(0, 108.0, 109.0, 104.0))
+    assert fills(execution_handler) == []
+    # From the next bar on it is a plain limit: a gap below fills at the open
+    execution_handler.on_market(bar(1, 103.0, 104.0, 102.0))
+    assert fills(execution_handler) == [("BUY", 100, 103.0)]
+
+
+def test_stop_limit_trigger_above_limit_does_not_fill_at_earlier_open():
+    execution_handler = handler()
+    execution_handler.execute_order(stop_limit("BUY", 105.0, 104.0), None)
+    execution_handler.on_market(bar(0, 100.0, 107.0, 99.0))
+    assert fills(execution_handler) == []
+    execution_handler.on_market(bar(1, 105.0, 106.0, 103.0))
+    assert fills(execution_handler) == [("BUY", 100, 104.0)]
+
+
+def test_stop_limit_partial_fill_rests_remainder():
+    execution_handler = SimulatedExecutionHandler(
+        deque(), commission_per_share=0.0, slippage_pct=0.0, max_participation=0.5
+    )
+    execution_handler.execute_order(stop_limit("BUY", 105.0, 106.0), None)
+    execution_handler.on_market(bar(0, 100.0, 107.0, 99.0, volume=120))
+    execution_handler.on_market(bar(1, 100.0, 101.0, 99.0, volume=120))
+    assert fills(execution_handler) == [("BUY", 60, 105.0), ("BUY", 40, 100.0)]
+
+
+def test_stale_count_drops_when_cancelled_entries_are_popped():
+    execution_handler = handler()
+    for order_id in range(3):
+        execution_handler.execute_order(
+            OrderEvent(None, "AAA", "LMT", 100, "BUY", 90.0 + order_id, None, order_id),
+            None,
+        )
+    execution_handler.cancel_order(0)
+    assert execution_handler._n_stale["AAA"] == 1
+    # The bar reaches every limit: both live orders fill and the stale one is popped
+    execution_handler.on_market(bar(0, 95.0, 96.0, 85.0))
+    assert execution_handler._n_stale["AAA"] == 0
+    assert len(execution_handler.books["AAA"]) == 0
+
+
+@pytest.mark.parametrize("order_type", ["LMT", "STP", "STP_LMT"])
+def test_missing_price_raises(order_type):
+    with pytest.raises(ValueError):
+        handler().execute_order(OrderEvent(None, "AAA", order_type, 100, "BUY"), None)
@@ -0,0 +1,101 @@
+# tests/test_indicators.py
+import math
+
+import numpy as np
+import pytest
+
+from backtester import indicators as ind
+
+pd = pytest.importorskip("pandas")  # The references are pandas rolling/ewm
+
+from benchmarks.indicator_parity import (
+    ATOL,
+    RTOL,
+    pandas_references,
+    random_bars,
+    streaming_values,
+)
+
+PERIODS = (2, 5, 20)
+
+
+@pytest.fixture(scope="module", params=PERIODS)
+def parity(request):
+    bars = random_bars(3000, seed=request.param)
+    actual, _ = streaming_values(bars, request.param)
+    return actual, pandas_references(bars, request.param)
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "SMA",
+        "EMA",
+        "RollingStd",
+        "RSI",
+        "Bollinger upper",
+        "Bollinger lower",
+        "ATR",
+        "RollingMax",
+        "RollingMin",
+        "VWAP",
+    ],
+)
+def test_matches_pandas(parity, name):
+    actual, expected = parity
+    np.testing.assert_allclose(
+        actual[name], expected[name].to_numpy(), rtol=RTOL, atol=ATOL, equal_nan=True
+    )
+
+
+@pytest.mark.parametrize("ddof", [0, 1])
+def test_rolling_std_period_one(ddof):
+    close = pd.Series([100.0, 101.0, 99.5, 102.0])
+    std = ind.RollingStd(1, ddof=ddof)
+    actual = [std.update(x) for x in close]
+    expected = close.rolling(1).std(ddof=ddof).tolist()
+    np.testing.assert_allclose(actual, expected, equal_nan=True)
+    assert math.isnan(actual[0]) == (ddof == 1)
+
+
+def test_rolling_std_not_ready_is_nan():
+    std = ind.RollingStd(3)
+    assert math.isnan(std.update(1.0)) and math.isnan(std.update(2.0))
+    assert std.update(3.0) == pytest.approx(1.0)
+    assert std.ready
+
+
+@pytest.mark.parametrize("window", [1, 2, 7, 20, 250])
+def test_rolling_mean_std_match_sliding_windows(window):
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    # Prices drifting over four orders of magnitude, as in long synthetic runs
+    rng = np.random.default_rng(window)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.002, 0.02, 5003)))
+    windows = sliding_window_view(close, window)
+    mean, std = ind.rolling_mean_std(close, window)
+    np.testing.assert_allclose(mean, windows.mean(axis=1), rtol=1e-12)
+    np.testing.assert_allclose(ind.rolling_mean(close, window), mean)
+    if window > 2:  # Tiny spreads of two values are all rounding error
+        np.testing.assert_allclose(std, windows.std(axis=1), rtol=1e-9)
+
+
+@pytest.mark.parametrize("period", PERIODS)
+@pytest.mark.parametrize(
+    "name", ["SMA", "RollingStd", "Bollinger upper", "Bollinger lower", "VWAP"]
+)
+def test_window_indicators_recover_after_nan(period, name):
+    bars = random_bars(400, seed=period)
+    # Lone gaps, a run of gaps longer than the window, and a gap right at the
+    # start, each in the close or the volume
+    bars.loc[[0, 50, 53, 131], "close"] = np.nan
+    bars.loc[200 : 200 + 2 * period, "close"] = np.nan
+    bars.loc[[97, 301], "volume"] = np.nan
+    bars.loc[[310], "close"] = np.inf
+    actual, _ = streaming_values(bars, period)
+    expected = pandas_references(bars, period)[name].to_numpy(copy=True)
+    expected[~np.isfinite(expected)] = np.nan  # pandas may give inf or NaN
+    np.testing.assert_allclose(
+        actual[name], expected, rtol=RTOL, atol=ATOL, equal_nan=True
+    )
+    assert np.isfinite(actual[name][-period:]).all()
@@ -0,0 +1,192 @@
+# tests/test_ledger.py
+import math
+from collections import deque
+
+import numpy as np
+import pytest
+
+from backtester.event import FillEvent
+from backtester.ledger import FillLedger, round_trips, trade_stats
+
+T0 = np.datetime64("2020-01-01", "ns")
+
+
+def record(ledger, fills):
+    """fills: (day, symbol, signed quantity, price, commission) in time order."""
+    positions = dict.fromkeys(ledger.symbol_list, 0)
+    columns = ledger.columns()  # Continue from what is already recorded
+    for sid, position in zip(columns["symbol_ids"].tolist(), columns["position"]):
+        positions[ledger.symbol_list[sid]] = int(position)
+    cash = float(columns["cash"][-1]) if len(ledger) else 0.0
+    for day, symbol, quantity, price, commission in fills:
+        fill_event = FillEvent(
+            T0 + np.timedelta64(day, "D"),
+            symbol,
+            abs(quantity),
+            "BUY" if quantity > 0 else "SELL",
+            price,
+            commission,
+        )
+        positions[symbol] += quantity
+        cash -= quantity * price + commission
+        ledger.record(
+            fill_event, ledger.symbol_list.index(symbol), positions[symbol], cash
+        )
+    return ledger
+
+
+def naive_round_trips(columns):
+    """Reference FIFO matching, one share block at a time: [(sid, exit row, pnl)]."""
+    lots = {}
+    trades = []
+    for row in range(len(columns["quantity"])):
+        sid = int(columns["symbol_ids"][row])
+        quantity = int(columns["quantity"][row])
+        price = float(columns["price"][row])
+        per_share = float(columns["commission"][row]) / abs(quantity)
+        book = lots.setdefault(sid, deque())
+        while quantity and book and np.sign(book[0][0]) != np.sign(quantity):
+            lot_quantity, lot_price, lot_per_share = book[0]
+            side = np.sign(lot_quantity)
+            matched = min(abs(lot_quantity), abs(quantity))
+            pnl = side * matched * (price - lot_price)
+            trades.append((sid, row, pnl - matched * (lot_per_share + per_share)))
+            lot_quantity -= side * matched
+            quantity += side * matched
+            if lot_quantity:
+                book[0] = (lot_quantity, lot_price, lot_per_share)
+            else:
+                book.popleft()
+        if quantity:
+            book.append((quantity, price, per_share))
+    return sorted(trades, key=lambda trade: trade[:2])  # Stable: FIFO within a fill
+
+
+def test_fifo_partial_closes_with_per_leg_commission():
+    ledger = record(
+        FillLedger(["A"]),
+        [
+            (0, "A", 100, 10.0, 2.0),  # 0.02 / share
+            (1, "A", 50, 12.0, 0.5),  # 0.01 / share
+            (2, "A", -120, 15.0, 2.4),  # 0.02 / share: closes lot 1 and 20 of lot 2
+            (3, "A", -30, 9.0, 0.9),  # 0.03 / share: closes the rest of lot 2
+        ],
+    )
+    trades = ledger.round_trips()
+    np.testing.assert_array_equal(trades["quantity"], [100, 20, 30])
+    np.testing.assert_array_equal(trades["entry_price"], [10.0, 12.0, 12.0])
+    np.testing.assert_array_equal(trades["exit_price"], [15.0, 15.0, 9.0])
+    np.testing.assert_allclose(trades["commission"], [4.0, 0.6, 1.2])
+    np.testing.assert_allclose(trades["pnl"], [496.0, 59.4, -91.2])
+    np.testing.assert_array_equal(
+        trades["exit_time"], T0 + np.array([2, 2, 3]) * np.timedelta64(1, "D")
+    )
+
+
+def test_fill_that_flips_position_closes_and_opens():
+    ledger = record(
+        FillLedger(["A", "B"]),
+        [
+            (0, "B", 100, 20.0, 1.0),
+            (1, "B", -150, 25.0, 1.5),  # Long 100 -> short 50 in one fill
+            (2, "B", 50, 22.0, 0.5),
+            (3, "A", 10, 5.0, 0.0),  # Still open: not a trade
+        ],
+    )
+    trades = ledger.round_trips()
+    np.testing.assert_array_equal(trades["symbol_ids"], [1, 1])
+    np.testing.assert_array_equal(trades["side"], [1, -1])
+    np.testing.assert_array_equal(trades["quantity"], [100, 50])
+    np.testing.assert_allclose(trades["pnl"], [500.0 - 2.0, 150.0 - 1.0])
+
+
+def test_round_trips_match_naive_fifo_on_random_fills():
+    rng = np.random.default_rng(1)
+    fills = []
+    for day in range(2000):
+        quantity = int(rng.integers(-300, 301)) or 1
+        fills.append(
+            (
+                day,
+                "ABC"[rng.integers(3)],
+                quantity,
+                float(rng.uniform(50, 150)),
+                abs(quantity) * float(rng.uniform(0.0, 0.02)),
+            )
+        )
+    ledger = record(FillLedger(["A", "B", "C"], capacity=4), fills)
+    trades = ledger.round_trips()
+    expected = naive_round_trips(ledger.columns())
+    assert len(trades["pnl"]) == len(expected)
+    np.testing.assert_allclose(trades["pnl"], [pnl for _, _, pnl in expected])
+
+
+def test_trade_stats():
+    ledger = record(
+        FillLedger(["A"]),
+        [
+            (0, "A", 100, 10.0, 1.0),
+            (2, "A", -100, 12.0, 1.0),  # +198
+            (3, "A", 100, 10.0, 1.0),
+            (4, "A", -100, 9.0, 1.0),  # -102
+        ],
+    )
+    stats = ledger.trade_stats(initial_capital=10000.0)
+    assert stats["n_trades"] == 2
+    assert stats["win_rate"] == 0.5
+    assert stats["profit_factor"] == pytest.approx(198.0 / 102.0)
+    assert stats["net_pnl"] == pytest.approx(96.0)
+    assert stats["avg_holding_days"] == 1.5
+    assert stats["total_commission"] == 4.0
+    assert stats["turnover"] == pytest.approx(4100.0 / 10000.0)
+
+
+def test_profit_factor_without_losses():
+    winner = record(
+        FillLedger(["A"]), [(0, "A", 10, 1.0, 0.0), (1, "A", -10, 2.0, 0.0)]
+    )
+    assert math.isinf(winner.trade_stats()["profit_factor"])
+    empty = trade_stats(round_trips(FillLedger(["A"]).columns()))
+    assert empty["n_trades"] == 0 and empty["profit_factor"] == 0.0
+
+
+def sample_ledger():
+    return record(
+        FillLedger(["A", "B"], capacity=2),
+        [(0, "A", 100, 10.0, 1.0), (1, "B", -50, 20.0, 0.5), (2, "A", -100, 11.0, 1.0)],
+    )
+
+
+def assert_same_ledger(a, b):
+    assert a.symbol_list == b.symbol_list
+    for name, column in a.columns().items():
+        np.testing.assert_array_equal(column, b.columns()[name])
+
+
+def test_npz_round_trip(tmp_path):
+    ledger = sample_ledger()
+    path = tmp_path / "ledger.npz"
+    ledger.save(path)
+    loaded = FillLedger.load(path)
+    assert_same_ledger(ledger, loaded)
+    # A loaded ledger keeps recording
+    record(loaded, [(3, "B", 50, 19.0, 0.5)])
+    assert len(loaded) == 4 and len(loaded.round_trips()["pnl"]) == 2
+
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    ledger = sample_ledger()
+    path = tmp_path / "ledger.parquet"
+    ledger.save(path)
+    assert_same_ledger(ledger, FillLedger.load(path))
+
+
+def test_parquet_without_pyarrow_raises(tmp_path):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match="pyarrow"):
+            sample_ledger().save(tmp_path / "ledger.parquet")
+    else:
+        pytest.skip("pyarrow is installed")
@@ -0,0 +1,28 @@
+# tests/test_live.py
+import asyncio
+from collections import deque
+
+import pytest
+
+from backtester.event import OrderEvent
+from backtester.live import AsyncExecutionHandler
+
+
+@pytest.mark.parametrize("ack_latency", [0.0, 0.01])
+def test_rejected_order_raises_at_execute_order(ack_latency):
+    async def send():
+        execution_handler = AsyncExecutionHandler(deque(), ack_latency=ack_latency)
+        with pytest.raises(ValueError, match="needs limit_price"):
+            execution_handler.execute_order(
+                OrderEvent(None, "AAA", "LMT", 100, "BUY", order_id=1), None
+            )
+        assert execution_handler._in_flight == 0  # Nothing was scheduled
+        execution_handler.execute_order(
+            OrderEvent(None, "AAA", "LMT", 100, "BUY", 95.0, order_id=2), None
+        )
+        await execution_handler.drain()
+        return execution_handler
+
+    execution_handler = asyncio.run(send())
+    assert execution_handler.acked == 1
+    assert list(execution_handler.open_orders) == [2]
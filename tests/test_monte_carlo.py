@@ -0,0 +1,82 @@
+# tests/test_monte_carlo.py
+import concurrent.futures
+
+import numpy as np
+import pytest
+
+from backtester import performance
+
+
+def daily_returns(n=500, seed=0):
+    return np.random.default_rng(seed).normal(0.0005, 0.01, n)
+
+
+def test_block_bootstrap_growth_shape_and_blocks():
+    returns = np.arange(1, 104) * 1e-4  # Distinct, so each draw names its index
+    growth = performance.block_bootstrap_growth(
+        returns, 7, block_size=10, rng=np.random.default_rng(1)
+    )
+    assert growth.shape == (103, 7)
+    drawn = np.vstack([growth[:1], growth[1:] / growth[:-1]]) - 1.0
+    index = np.rint(drawn / 1e-4).astype(int) - 1
+    np.testing.assert_allclose(drawn, returns[index])
+    # Within a block the returns are consecutive, wrapping at the end
+    within = np.arange(1, 103) % 10 != 0
+    assert (np.diff(index, axis=0)[within] % 103 == 1).all()
+
+
+@pytest.mark.parametrize("replace", [False, True])
+def test_trade_shuffle_growth_shape(replace):
+    pnl = np.array([120.0, -80.0, 45.0, -30.0, 200.0])
+    growth = performance.trade_shuffle_growth(
+        pnl, 1000.0, 9, replace=replace, rng=np.random.default_rng(2)
+    )
+    assert growth.shape == (5, 9)
+    if not replace:  # Every shuffle ends at the same equity
+        np.testing.assert_allclose(growth[-1], (1000.0 + pnl.sum()) / 1000.0)
+
+
+@pytest.mark.parametrize("kind", ["returns", "trades"])
+def test_seed_gives_same_result_for_any_worker_count(kind):
+    if kind == "returns":
+        run = lambda n_workers: performance.monte_carlo_returns(  # noqa: E731
+            daily_returns(), 500, seed=7, chunk_size=120, n_workers=n_workers
+        )
+    else:
+        pnl = daily_returns(60, seed=3) * 1000.0
+        run = lambda n_workers: performance.monte_carlo_trades(  # noqa: E731
+            pnl, 10_000.0, 500, seed=7, chunk_size=120, n_workers=n_workers
+        )
+    serial, pooled = run(1), run(2)
+    assert set(serial) == {"sharpe", "max_drawdown", "terminal"}
+    for name, values in serial.items():
+        assert values.shape == (500,)
+        np.testing.assert_array_equal(values, pooled[name])
+
+
+def test_single_chunk_runs_in_process(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("one chunk should not start a process pool")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_pool)
+    result = performance.monte_carlo_returns(
+        daily_returns(), 100, seed=1, chunk_size=2_000, n_workers=None
+    )
+    assert len(result["sharpe"]) == 100
+
+
+def test_confidence_intervals():
+    values = np.arange(1001, dtype=np.float64)  # Percentile p is exactly 10 * p
+    intervals = performance.confidence_intervals(
+        {"sharpe": values, "terminal": values / 1000.0}, confidence=0.9
+    )
+    assert intervals["sharpe"] == pytest.approx((50.0, 500.0, 950.0))
+    assert intervals["terminal"] == pytest.approx((0.05, 0.5, 0.95))
+    assert all(type(q) is float for q in intervals["sharpe"])
+
+
+def test_too_few_inputs_raise():
+    with pytest.raises(ValueError):
+        performance.monte_carlo_returns([0.01], 10)
+    with pytest.raises(ValueError):
+        performance.monte_carlo_trades([5.0], 100.0, 10)
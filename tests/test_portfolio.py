@@ -0,0 +1,86 @@
+# tests/test_portfolio.py
+from collections import deque
+
+import numpy as np
+import pytest
+
+from backtester.event import FillEvent
+from backtester.portfolio import EquityRecorder, Portfolio
+
+
+def test_current_positions_is_a_live_read_only_view():
+    portfolio = Portfolio(deque(), None, 100000.0, ["A", "B"])
+    positions = portfolio.current_positions
+    portfolio.update_fill(
+        FillEvent(np.datetime64("2020-01-02", "ns"), "B", 10, "BUY", 50.0, 1.0)
+    )
+    assert dict(positions) == {"A": 0, "B": 10}
+    assert portfolio.current_holdings_value["B"] == 500.0
+    with pytest.raises(TypeError):
+        positions["A"] = 5
+    with pytest.raises(TypeError):
+        portfolio.current_holdings_value["B"] = 0.0
+    with pytest.raises(AttributeError):
+        portfolio.current_positions = {"A": 5}
+    assert portfolio.positions.tolist() == [0, 10]
+
+
+def record_days(recorder, days):
+    for day in days:
+        timestamp = np.datetime64("2020-01-01", "ns") + np.timedelta64(day, "D")
+        recorder.record(timestamp, 1000.0 + day, 500.0, 500.0 + day)
+
+
+def test_reading_the_equity_curve_mid_run_records_nothing():
+    recorder, untouched = EquityRecorder(every=3), EquityRecorder(every=3)
+    record_days(untouched, range(10))
+    for day in range(10):
+        record_days(recorder, [day])
+        size, pending = recorder.size, recorder._pending
+        # The latest sample shows even while it is still pending
+        assert recorder.column()[-1] == 1000.0 + day
+        assert len(recorder.column("timestamps")) == len(recorder)
+        assert (recorder.size, recorder._pending) == (size, pending)
+    recorder.finish()
+    untouched.finish()
+    for name in ("timestamps",) + EquityRecorder.COLUMNS:
+        np.testing.assert_array_equal(recorder.column(name), untouched.column(name))
+    np.testing.assert_array_equal(recorder.column(), [1000, 1003, 1006, 1009])
+
+
+def test_portfolio_equity_includes_the_due_sample_without_recording_it():
+    portfolio = Portfolio(deque(), None, 1000.0, ["A"])
+    portfolio._snapshot_due = np.datetime64("2020-01-02", "ns")
+    assert portfolio.total_equity().tolist() == [1000.0]
+    assert len(portfolio.equity_recorder) == 0
+    portfolio.finish()
+    assert len(portfolio.equity_recorder) == 1
+    assert portfolio.total_equity().tolist() == [1000.0]
+
+
+def test_open_position_count_tracks_fills():
+    portfolio = Portfolio(deque(), None, 100000.0, ["A", "B", "C"])
+    rng = np.random.default_rng(3)
+    for day in range(300):
+        symbol = "ABC"[rng.integers(3)]
+        held = int(portfolio.positions[portfolio.symbol_ids[symbol]])
+        # Mostly close out or flip exactly, so positions keep crossing zero
+        quantity = -held if held and rng.random() < 0.5 else int(rng.integers(-5, 6))
+        if not quantity:
+            continue
+        portfolio.update_fill(
+            FillEvent(
+                np.datetime64("2020-01-01", "ns") + np.timedelta64(day, "D"),
+                symbol,
+                abs(quantity),
+                "BUY" if quantity > 0 else "SELL",
+                float(rng.uniform(90.0, 110.0)),
+                0.0,
+            )
+        )
+        assert portfolio._n_open == np.count_nonzero(portfolio.positions)
+        if not portfolio._n_open:
+            assert portfolio.total_holdings_value == 0.0
+    restored = Portfolio(deque(), None, 100000.0, ["A", "B", "C"])
+    restored.set_state(portfolio.get_state())
+    assert restored._n_open == portfolio._n_open
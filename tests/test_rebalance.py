@@ -0,0 +1,130 @@
+# tests/test_rebalance.py
+from collections import deque
+
+import numpy as np
+import pytest
+
+from backtester.data import ColumnarDataHandler
+from backtester.engine import BacktestEngine
+from backtester.event import EventType, FillEvent, RebalanceEvent
+from backtester.execution import SimulatedExecutionHandler
+from backtester.portfolio import Portfolio
+from backtester.synthetic import generate_bar_stores
+from strategies.cross_sectional_momentum import CrossSectionalMomentum
+
+T0 = np.datetime64("2020-01-02", "ns")
+
+
+def orders(portfolio):
+    sent = [(o.symbol, o.direction, o.quantity) for o in portfolio.events_queue]
+    portfolio.events_queue.clear()
+    return sent
+
+
+def fill_all(portfolio, sent, price_of):
+    for (symbol, direction, quantity), order_id in zip(
+        sent, list(portfolio._pending_orders)
+    ):
+        portfolio.update_fill(
+            FillEvent(T0, symbol, quantity, direction, price_of[symbol], 0.0, order_id)
+        )
+
+
+def test_rebalance_sizes_orders_from_target_weights():
+    portfolio = Portfolio(deque(), None, 100000.0, ["A", "B", "C", "D"])
+    portfolio.last_price[:] = [50.0, 30.0, 7.0, np.nan]  # D has no price yet
+    portfolio.rebalance(RebalanceEvent(T0, [0.5, -0.2, np.nan, 0.3]))
+    # 50,000 / 50 = 1000 A; -20,000 / 30 = -666.7 B truncates toward zero;
+    # C's NaN weight and D's missing price leave them alone
+    sent = orders(portfolio)
+    assert sent == [("A", "BUY", 1000), ("B", "SELL", 666)]
+    assert portfolio.pending.tolist() == [1000, -666, 0, 0]
+
+    # Orders still in flight count: the same targets send nothing new
+    portfolio.rebalance(RebalanceEvent(T0, [0.5, -0.2, np.nan, 0.3]))
+    assert orders(portfolio) == []
+
+    fill_all(portfolio, sent, {"A": 50.0, "B": 30.0})
+    assert portfolio.positions.tolist() == [1000, -666, 0, 0]
+    assert portfolio.pending.tolist() == [0, 0, 0, 0]
+    assert not portfolio._pending_orders
+
+
+def test_symbols_leaving_the_target_set_are_closed():
+    portfolio = Portfolio(deque(), None, 100000.0, ["A", "B", "C"])
+    portfolio.last_price[:] = [50.0, 20.0, 10.0]
+    portfolio.rebalance(RebalanceEvent(T0, [0.4, 0.4, 0.0]))
+    fill_all(portfolio, orders(portfolio), {"A": 50.0, "B": 20.0})
+
+    # B drops out of the target set and C comes in; A is already at target
+    portfolio.last_price[:] = [50.0, 25.0, 10.0]
+    portfolio.rebalance(RebalanceEvent(T0, [0.4, 0.0, 0.4]))
+    equity = portfolio.current_cash + portfolio.total_holdings_value
+    assert equity == pytest.approx(100000.0)  # Marked at the fill prices
+    assert orders(portfolio) == [("B", "SELL", 2000), ("C", "BUY", 4000)]
+
+
+def test_wrong_number_of_weights_raises():
+    portfolio = Portfolio(deque(), None, 100000.0, ["A", "B"])
+    with pytest.raises(ValueError, match="3 weights for 2 symbols"):
+        portfolio.rebalance(RebalanceEvent(T0, [0.1, 0.2, 0.3]))
+
+
+PARAMS = {"lookback": 10, "top_n": 3, "rebalance_every": 4}
+
+
+def run_momentum(stores, symbols):
+    """Runs CrossSectionalMomentum; returns its portfolio and target weights."""
+    events_queue = deque()
+    data_handler = ColumnarDataHandler(events_queue, stores, list(stores))
+    strategy = CrossSectionalMomentum(events_queue, data_handler, symbols, **PARAMS)
+    portfolio = Portfolio(events_queue, data_handler, 100000.0, symbols)
+    engine = BacktestEngine(
+        data_handler, strategy, portfolio, SimulatedExecutionHandler(events_queue)
+    )
+    weights = []
+    engine.subscribe(EventType.REBALANCE, lambda e: weights.append(e.weights))
+    engine.run()
+    portfolio.finish()
+    return strategy, portfolio, np.array(weights)
+
+
+def expected_weights(stores):
+    """Top-n momentum over forward-filled closes, one row per timestamp."""
+    times = np.unique(np.concatenate([s.timestamps for s in stores.values()]))
+    close = np.full((len(times), len(stores)), np.nan)
+    for k, store in enumerate(stores.values()):
+        last = np.searchsorted(store.timestamps, times, "right") - 1  # Latest bar
+        close[last >= 0, k] = store.close[last[last >= 0]]
+    weights = []
+    lookback, top_n = PARAMS["lookback"], PARAMS["top_n"]
+    for n in range(1, len(times) + 1):
+        if n <= lookback or n % PARAMS["rebalance_every"]:
+            continue
+        momentum = close[n - 1] / close[n - 1 - lookback] - 1.0
+        ranked = np.where(np.isfinite(momentum), momentum, -np.inf)
+        row = np.zeros(len(stores))
+        row[np.argsort(-ranked)[:top_n]] = 0.95 / top_n
+        weights.append(row)
+    return np.array(weights)
+
+
+def test_cross_sectional_momentum_vectorized_and_per_event_paths_agree():
+    # Symbols miss some timestamps and keep their last close meanwhile. (Ties in
+    # momentum, e.g. between symbols whose data has ended, could rank either way.)
+    stores = generate_bar_stores(8, 300, gap_prob=0.1)
+    symbols = list(stores)
+    shared, portfolio, weights = run_momentum(stores, symbols)
+    assert not shared._fill_arrays  # Reads the data handler's cross-section
+    np.testing.assert_array_equal(weights, expected_weights(stores))
+    assert len(portfolio.ledger) > 0
+
+    # A different symbol order can't use the shared arrays: filled per event
+    reordered = symbols[::-1]
+    per_event, reordered_portfolio, reordered_weights = run_momentum(stores, reordered)
+    assert per_event._fill_arrays
+    np.testing.assert_array_equal(reordered_weights[:, ::-1], weights)
+    # Same trades, sent in another order: equal up to summation order
+    np.testing.assert_allclose(
+        reordered_portfolio.total_equity(), portfolio.total_equity(), rtol=1e-12
+    )
@@ -0,0 +1,24 @@
+# tests/test_vectorized.py
+import pytest
+
+from backtester.synthetic import generate_bar_stores
+from backtester.vectorized import check_parity
+from strategies.bollinger_bands import BollingerBandReversion
+from strategies.dmac import DualMovingAverageCrossover
+
+pytest.importorskip("pandas")  # Both runners return DataFrames
+
+
+@pytest.mark.parametrize(
+    "strategy_cls, params",
+    [
+        (DualMovingAverageCrossover, {"short_window": 20, "long_window": 50}),
+        (DualMovingAverageCrossover, {"short_window": 50, "long_window": 400}),
+        (BollingerBandReversion, {"window": 20, "num_std": 2.0}),
+        (BollingerBandReversion, {"window": 300, "num_std": 1.5}),
+    ],
+)
+def test_vectorized_matches_event_driven(strategy_cls, params):
+    bar_stores = generate_bar_stores(3, 3000, calendar="mixed", gap_prob=0.01)
+    report = check_parity(strategy_cls, bar_stores, params=params)
+    assert report.ok, str(report)
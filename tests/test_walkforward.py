@@ -0,0 +1,78 @@
+# tests/test_walkforward.py
+from collections import deque
+
+import pytest
+
+from backtester import walkforward
+from backtester.engine import BacktestEngine
+from backtester.synthetic import generate_bar_stores
+from strategies.dmac import DualMovingAverageCrossover
+
+GRID = {"short_window": [5, 10, 20], "long_window": [30, 60]}
+
+
+def test_walk_forward_windows_rolling_and_anchored():
+    assert walkforward.walk_forward_windows(10, 4, 3) == [(0, 4, 7), (3, 7, 10)]
+    assert walkforward.walk_forward_windows(10, 4, 3, anchored=True) == [
+        (0, 4, 7),
+        (0, 7, 10),
+    ]
+
+
+def test_sync_positions_marks_held_and_flat_symbols():
+    strategy = DualMovingAverageCrossover(deque(), None, ["A", "B", "C"])
+    strategy.signals.update(A="EXIT", B="LONG", C="")
+    strategy.sync_positions({"A": 100, "B": 0, "C": 0})
+    assert strategy.signals == {"A": "LONG", "B": "EXIT", "C": "EXIT"}
+    assert strategy.bought == {"A": True, "B": False, "C": False}
+
+
+def test_segments_start_with_strategy_state_matching_positions(monkeypatch):
+    """
+    Every out-of-sample segment starts with the strategy's signal memory agreeing
+    with what the shared portfolio holds or has on order, including right after a
+    parameter switch, so no position is orphaned and no entry suppressed.
+    """
+    starts = []
+
+    class CheckedEngine(BacktestEngine):
+        def run(self, *args, **kwargs):
+            if self.portfolio is not None:  # An out-of-sample segment
+                exposure = self.portfolio.positions + self.portfolio.pending
+                signals = self.strategy.signals
+                starts.append(
+                    {
+                        symbol: (signals[symbol] == "LONG", bool(quantity > 0))
+                        for symbol, quantity in zip(
+                            self.portfolio.symbol_list, exposure.tolist()
+                        )
+                    }
+                )
+            return super().run(*args, **kwargs)
+
+    monkeypatch.setattr(walkforward, "BacktestEngine", CheckedEngine)
+    report = walkforward.walk_forward(
+        DualMovingAverageCrossover,
+        GRID,
+        generate_bar_stores(3, 2000),
+        train_bars=400,
+        test_bars=200,
+        warmup_bars=60,
+        n_workers=1,
+    )
+    assert len({str(w["params"]) for w in report.windows}) > 1  # Params do switch
+    assert len(starts) == len(report.windows)
+    for start in starts:
+        for symbol, (long_signal, held) in start.items():
+            assert long_signal == held, symbol
+
+
+def test_too_short_history_raises():
+    with pytest.raises(ValueError):
+        walkforward.walk_forward(
+            DualMovingAverageCrossover,
+            GRID,
+            generate_bar_stores(1, 100),
+            train_bars=400,
+            n_workers=1,
+        )